@@ -1,7 +1,14 @@
-from django.contrib import admin
+import json
+
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.admin.views.main import ERROR_FLAG, IGNORED_PARAMS, PAGE_VAR, SEARCH_VAR
 from django.contrib.auth.models import User
-from .models import Restaurant, UserProfile, Category, MenuItem, SiteSettings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+from .models import Restaurant, UserProfile, Category, MenuItem, SiteSettings, ImageOptimizationJob
+from .tenant_archive import clone_restaurant
 
 # UserProfile을 UserAdmin 페이지에 인라인으로 추가
 class UserProfileInline(admin.StackedInline):
@@ -17,20 +24,86 @@ class UserAdmin(BaseUserAdmin):
 admin.site.unregister(User)
 admin.site.register(User, UserAdmin)
 
+class EstimatedCountPaginator(Paginator):
+    """
+    큰 테이블의 변경 목록용 페이지네이터
+    PostgreSQL 에서는 플래너의 예상 행 수(EXPLAIN)를 쓰고, 예상이 ESTIMATE_THRESHOLD 이하일 때만 정확한 COUNT(*)
+    (다른 DB 는 기존처럼 COUNT(*))
+    검색/필터가 걸린 목록은 예상이 실제보다 훨씬 작을 수 있어 (뒤쪽 페이지로 갈 수 없게 됨)
+    use_estimate = False 로 정확한 COUNT(*) 사용 (EstimatedCountMixin.get_paginator)
+    """
+    ESTIMATE_THRESHOLD = 10000
+    use_estimate = True
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if self.use_estimate and connections[queryset.db].vendor == 'postgresql':
+            estimate = self._estimate(queryset)
+            if estimate is not None and estimate > self.ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def _estimate(queryset):
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        try:
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError:
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountMixin:
+    # 변경 목록: 필터 결과 외에 전체 건수 COUNT(*) 를 따로 하지 않고, 큰 테이블은 예상 건수 사용
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        paginator = super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+        # 예상 건수는 검색/필터가 없는 (테넌트 전체) 목록에만
+        paginator.use_estimate = not self._is_filtered(request)
+        return paginator
+
+    @staticmethod
+    def _is_filtered(request):
+        if request.GET.get(SEARCH_VAR, '').strip():
+            return True
+        return any(key not in IGNORED_PARAMS and key not in (PAGE_VAR, ERROR_FLAG) for key in request.GET)
+
+
 # 공통 믹스인: 레스토랑별 데이터 격리
-class RestaurantFilterMixin:
+class RestaurantFilterMixin(EstimatedCountMixin):
+
+    def get_restaurant(self, request):
+        """
+        일반 관리자의 레스토랑 (요청당 한 번만 조회해서 request 에 보관)
+        superuser 이거나 연결된 레스토랑이 없으면 None
+        """
+        if not hasattr(request, '_admin_restaurant'):
+            request._admin_restaurant = None if request.user.is_superuser else (
+                Restaurant.objects.filter(managers__user=request.user).first()
+            )
+        return request._admin_restaurant
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        if hasattr(request.user, 'profile') and request.user.profile.restaurant:
-            return qs.filter(restaurant=request.user.profile.restaurant)
+        restaurant = self.get_restaurant(request)
+        if restaurant is not None:
+            return qs.filter(restaurant=restaurant)
         return qs.none()
 
     def save_model(self, request, obj, form, change):
         if not request.user.is_superuser:
-            if hasattr(request.user, 'profile') and request.user.profile.restaurant:
-                obj.restaurant = request.user.profile.restaurant
+            restaurant = self.get_restaurant(request)
+            if restaurant is not None:
+                obj.restaurant = restaurant
         super().save_model(request, obj, form, change)
 
     def get_list_filter(self, request):
@@ -47,37 +120,93 @@ class RestaurantFilterMixin:
                 del form.base_fields['restaurant']
         return form
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # 카테고리 선택지는 관리자의 레스토랑 것만 (autocomplete 검색은 CategoryAdmin.get_queryset 이 제한)
+        if db_field.related_model is Category and not request.user.is_superuser:
+            restaurant = self.get_restaurant(request)
+            kwargs["queryset"] = (
+                Category.objects.filter(restaurant=restaurant) if restaurant is not None else Category.objects.none()
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class TenantCategoryListFilter(admin.RelatedFieldListFilter):
+    """
+    카테고리 목록 필터: 한 레스토랑의 카테고리만 (상위 카테고리 이름까지 쿼리 1회)
+    superuser 는 레스토랑 필터를 먼저 골라야 카테고리가 나옴 (전체 테넌트의 카테고리를 나열하지 않음)
+    """
+
+    def field_choices(self, field, request, model_admin):
+        restaurant = model_admin.get_restaurant(request)
+        if restaurant is None:
+            restaurant_id = request.GET.get('restaurant__id__exact')
+            if not (restaurant_id or '').isdigit():
+                return []
+        else:
+            restaurant_id = restaurant.pk
+        categories = Category.objects.filter(restaurant_id=restaurant_id).select_related('parent')
+        return [(category.pk, str(category)) for category in categories]
+
+
 # Restaurant 모델 등록 (Superuser 전용)
 @admin.register(Restaurant)
 class RestaurantAdmin(admin.ModelAdmin):
     list_display = ('name', 'slug', 'created_at')
     search_fields = ('name', 'slug')
     
+    actions = ['clone_selected']
+
     def has_module_permission(self, request):
         # 일반 유저는 Restaurant 모델 관리 메뉴 자체를 안 보이게 설정
         return request.user.is_superuser
 
+    @admin.action(description="선택한 레스토랑 복제 (설정/카테고리/메뉴)")
+    def clone_selected(self, request, queryset):
+        if not request.user.is_superuser:
+            return
+        for source in queryset:
+            # slug 는 '<원본>-copy', 이미 있으면 '<원본>-copy-2' ... (복제 후 수정)
+            base = f"{source.slug}-copy"[:45]
+            slug, n = base, 1
+            while Restaurant.objects.filter(slug=slug).exists():
+                n += 1
+                slug = f"{base}-{n}"
+            try:
+                restaurant, counts = clone_restaurant(source, slug, name=f"{source.name} (복사본)"[:100])
+            except ValueError as e:
+                self.message_user(request, f"'{source.slug}' 복제 실패: {e}", messages.ERROR)
+                continue
+            self.message_user(
+                request,
+                f"'{source.slug}' -> '{restaurant.slug}': 카테고리 {counts['menu.category']}개, "
+                f"메뉴 {counts['menu.menuitem']}개 복제",
+                messages.SUCCESS,
+            )
+
 # 기존 모델들도 Admin에 등록
 @admin.register(Category)
 class CategoryAdmin(RestaurantFilterMixin, admin.ModelAdmin):
     list_display = ('name', 'restaurant', 'priority')
     list_filter = ('restaurant',) # Superuser에게만 보임 (Mixin 처리)
+    # 행 선택 체크박스의 라벨(__str__)이 상위 카테고리 이름을 씀
+    list_select_related = ('restaurant', 'parent')
+    # MenuItemAdmin 의 카테고리 autocomplete 검색 대상
+    search_fields = ('name', 'name_en')
+    autocomplete_fields = ('restaurant', 'parent')
 
 @admin.register(MenuItem)
 class MenuItemAdmin(RestaurantFilterMixin, admin.ModelAdmin):
     list_display = ('name', 'restaurant', 'category', 'price', 'is_available')
-    list_filter = ('restaurant', 'category', 'is_available')
+    list_filter = ('restaurant', ('category', TenantCategoryListFilter), 'is_available')
     search_fields = ('name', 'description')
-    
-    def formfield_for_foreignkey(self, db_field, request, **kwargs):
-        if db_field.name == "category" and not request.user.is_superuser:
-            if hasattr(request.user, 'profile') and request.user.profile.restaurant:
-                kwargs["queryset"] = Category.objects.filter(restaurant=request.user.profile.restaurant)
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+    # category 표시(__str__)가 상위 카테고리 이름을 쓰므로 category__parent 까지
+    list_select_related = ('restaurant', 'category__parent')
+    autocomplete_fields = ('restaurant', 'category')
 
 @admin.register(SiteSettings)
 class SiteSettingsAdmin(RestaurantFilterMixin, admin.ModelAdmin):
     list_display = ('restaurant', 'created_at')
+    list_select_related = ('restaurant',)
     fieldsets = (
         ('기본 설정', {
             'fields': ('restaurant', 'logo_image', 'intro_image', 'intro_video', 'loading_video_2', 'show_manual_card', 'side_image')
@@ -119,7 +248,24 @@ class SiteSettingsAdmin(RestaurantFilterMixin, admin.ModelAdmin):
     def has_add_permission(self, request):
         # 이미 설정이 있다면 추가 불가능하게 (1:1 관계처럼 유지)
         if not request.user.is_superuser:
-            if hasattr(request.user, 'profile') and request.user.profile.restaurant:
-                if SiteSettings.objects.filter(restaurant=request.user.profile.restaurant).exists():
-                    return False
+            restaurant = self.get_restaurant(request)
+            if restaurant is not None and SiteSettings.objects.filter(restaurant=restaurant).exists():
+                return False
         return super().has_add_permission(request)
+
+# 이미지 최적화 작업 현황 (Superuser 전용, 조회만 가능)
+@admin.register(ImageOptimizationJob)
+class ImageOptimizationJobAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ('model', 'object_id', 'field_name', 'status', 'attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'model')
+    readonly_fields = [f.name for f in ImageOptimizationJob._meta.fields]
+
+    def has_module_permission(self, request):
+        return request.user.is_superuser
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
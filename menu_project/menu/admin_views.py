@@ -1,10 +1,23 @@
+import json
+import math
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import authenticate, login
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse
+from django.db.models import Count, FloatField, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.views.decorators.http import require_POST
+from .menu_batch import apply_operations
 from .models import Category, MenuItem, UserProfile, Restaurant
 
+# 대시보드 메뉴 목록 한 페이지 크기
+DASHBOARD_PAGE_SIZE = 50
+# 미분류 메뉴는 맨 뒤에 (카테고리 우선순위 대신 사용)
+UNCATEGORIZED_PRIORITY = 1e9
+
 def check_restaurant_permission(user, restaurant_slug):
     """
     유저가 해당 레스토랑의 관리자 권한이 있는지 확인
@@ -45,19 +58,140 @@ def admin_login(request, restaurant_slug=None):
         
     return render(request, 'admin/login.html')
 
+def _encode_cursor(menu):
+    """다음 페이지 시작 위치 (정렬 키 값을 그대로 담은 문자열)"""
+    key = [menu.category_priority, menu.priority, menu.name, menu.pk]
+    return urlsafe_base64_encode(json.dumps(key, ensure_ascii=False).encode('utf-8'))
+
+
+def _decode_cursor(value):
+    """잘못된 값(변조, 잘린 URL)이면 None -> 첫 페이지"""
+    try:
+        category_priority, priority, name, pk = json.loads(urlsafe_base64_decode(value))
+        cursor = float(category_priority), float(priority), str(name), int(pk)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    # inf/nan 이나 BIGINT 범위를 넘는 id 는 DB 에서 오류가 나므로 거름
+    if not (math.isfinite(cursor[0]) and math.isfinite(cursor[1]) and 0 <= cursor[3] < 2 ** 63):
+        return None
+    return cursor
+
+
+def _after(cursor):
+    """(카테고리 우선순위, 우선순위, 이름, id) 가 cursor 보다 뒤인 행 (keyset 페이지네이션)"""
+    category_priority, priority, name, pk = cursor
+    return (
+        Q(category_priority__gt=category_priority)
+        | Q(category_priority=category_priority, priority__gt=priority)
+        | Q(category_priority=category_priority, priority=priority, name__gt=name)
+        | Q(category_priority=category_priority, priority=priority, name=name, pk__gt=pk)
+    )
+
+
 @login_required
 def admin_dashboard(request, restaurant_slug=None):
+    """
+    관리자 대시보드
+    - 카테고리: 메뉴 수는 annotate(Count) 로 한 번에, 상위 카테고리는 select_related
+    - 메뉴: 카테고리(하위 포함)/판매 상태/검색어로 서버에서 거르고 DASHBOARD_PAGE_SIZE 건씩
+      keyset 페이지네이션 (?after=<cursor>, OFFSET 없이 정렬 키 다음부터 읽음)
+    """
     # 권한 체크
     if not check_restaurant_permission(request.user, restaurant_slug):
         return HttpResponseForbidden("이 매장에 대한 관리 권한이 없습니다.")
 
-    categories = Category.objects.filter(restaurant=request.restaurant).order_by('priority', 'name')
-    menu_items = MenuItem.objects.filter(restaurant=request.restaurant).order_by('category__priority', 'priority', 'name')
+    categories = list(
+        Category.objects.filter(restaurant=request.restaurant)
+        .select_related('parent')
+        .annotate(item_count=Count('menu_items'))
+        .order_by('priority', 'name')
+    )
+
+    menu_items = (
+        MenuItem.objects.filter(restaurant=request.restaurant)
+        .select_related('category')
+        .only(
+            'id', 'name', 'name_en', 'price', 'priority', 'is_available',
+            'menu_image', 'image_variants', 'category__id', 'category__name',
+        )
+        .annotate(category_priority=Coalesce(
+            'category__priority', Value(UNCATEGORIZED_PRIORITY), output_field=FloatField(),
+        ))
+    )
+
+    # --- 서버 측 필터 ---
+    selected_category = None
+    category_id = request.GET.get('category', '')
+    if category_id == 'none':
+        menu_items = menu_items.filter(category__isnull=True)
+    elif category_id.isdigit():
+        selected_category = next((c for c in categories if c.pk == int(category_id)), None)
+        if selected_category is not None:
+            # 하위 카테고리의 메뉴까지 (path 접두사 인덱스)
+            menu_items = menu_items.filter(category__path__startswith=selected_category.path)
+
+    available = request.GET.get('available', '')
+    if available in ('1', '0'):
+        menu_items = menu_items.filter(is_available=available == '1')
+
+    query = request.GET.get('q', '').strip()
+    if query:
+        menu_items = menu_items.filter(
+            Q(name__icontains=query) | Q(name_en__icontains=query) | Q(description__icontains=query)
+        )
+
+    menu_total = menu_items.count()
+
+    # --- keyset 페이지네이션 ---
+    cursor = _decode_cursor(request.GET.get('after', ''))
+    page = menu_items
+    if cursor is not None:
+        page = page.filter(_after(cursor))
+    page = list(page.order_by('category_priority', 'priority', 'name', 'pk')[:DASHBOARD_PAGE_SIZE + 1])
+
+    next_query = None
+    if len(page) > DASHBOARD_PAGE_SIZE:
+        page = page[:DASHBOARD_PAGE_SIZE]
+        params = request.GET.copy()
+        params['after'] = _encode_cursor(page[-1])
+        next_query = params.urlencode()
+    first_query = None
+    if cursor is not None:
+        params = request.GET.copy()
+        params.pop('after', None)
+        first_query = params.urlencode()
+
     return render(request, 'admin/dashboard.html', {
         'categories': categories,
-        'menu_items': menu_items
+        'menu_items': page,
+        'menu_total': menu_total,
+        'selected_category': selected_category,
+        'category_filter': category_id,
+        'available_filter': available,
+        'query': query,
+        'next_query': next_query,
+        'first_query': first_query,
     })
 
+@login_required
+@require_POST
+def menu_batch(request, restaurant_slug=None):
+    """
+    메뉴 일괄 작업 (JSON): {"operations": [{"op": "reorder", "id": 1, "before": 7}, ...]}
+    작업 형식은 menu_batch.py 참고, 전부 적용되거나 하나도 적용되지 않음
+    """
+    if not check_restaurant_permission(request.user, restaurant_slug):
+        return JsonResponse({'error': "권한이 없습니다."}, status=403)
+
+    try:
+        payload = json.loads(request.body or b'{}')
+        if not isinstance(payload, dict):
+            raise ValueError("요청 형식이 올바르지 않습니다.")
+        result = apply_operations(request.restaurant, payload.get('operations'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(result)
+
 @login_required
 def add_category(request, restaurant_slug=None):
     if not check_restaurant_permission(request.user, restaurant_slug):
@@ -0,0 +1,149 @@
+"""
+업로드 폰트 서브셋 (WOFF2)
+
+- 레스토랑마다 텍스트 역할(theme.TEXT_ROLES)별 폰트를 그 역할에 실제로 쓰인 글자만 남긴 WOFF2 로 변환
+  (한글 폰트 수 MB -> 수십 KB)
+- 결과는 SiteSettings.font_subsets 에 기록: {역할: {'src': 원본 폰트, 'name': 서브셋 파일, 'chars': 포함된 글자}}
+- 생성은 이미지 최적화와 같은 작업 큐(ImageOptimizationJob, field_name='<역할>_font')에서 처리
+- 폰트 업로드 시, 그리고 메뉴/카테고리 텍스트에 서브셋에 없는 글자가 생기면 다시 예약
+- 서브셋이 준비되기 전에는 theme.py 가 원본 폰트를 그대로 사용
+"""
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+
+# 역할 -> (텍스트가 있는 모델, 필드)
+TEXT_SOURCES = {
+    'category_name': ('menu.Category', 'name'),
+    'category_name_en': ('menu.Category', 'name_en'),
+    'menu_name': ('menu.MenuItem', 'name'),
+    'menu_name_en': ('menu.MenuItem', 'name_en'),
+    'menu_price': ('menu.MenuItem', 'price'),
+    'menu_description': ('menu.MenuItem', 'description'),
+    'menu_notes': ('menu.MenuItem', 'notes'),
+}
+
+# 템플릿에 고정된 문구 (menu_main.html 메뉴판 설명서 카드)
+TEMPLATE_TEXT = {
+    'category_name': '메뉴판 설명서',
+    'category_name_en': 'Menu Guide',
+}
+
+# 항상 포함: 출력 가능한 ASCII 전체 + 자주 쓰는 기호 (가격, 구분자)
+BASE_CHARS = ''.join(chr(c) for c in range(0x20, 0x7f)) + '₩·•…※~'
+
+FONT_FIELDS = tuple(f'{role}_font' for role in TEXT_SOURCES)
+
+
+def role_text(restaurant_id, role):
+    """역할에 쓰이는 레스토랑의 모든 글자 (정렬된 문자열)"""
+    model_label, field = TEXT_SOURCES[role]
+    Model = apps.get_model(model_label)
+    chars = set(BASE_CHARS) | set(TEMPLATE_TEXT.get(role, ''))
+    for value in Model.objects.filter(restaurant_id=restaurant_id).values_list(field, flat=True).iterator():
+        if value:
+            chars.update(value)
+    chars.discard('\n')
+    chars.discard('\r')
+    return ''.join(sorted(chars))
+
+
+def subset_woff2(font_file, text):
+    """font_file 에서 text 의 글자만 남긴 WOFF2 바이트"""
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+    options.hinting = False
+
+    font = TTFont(font_file, lazy=False)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+
+    output = BytesIO()
+    font.flavor = 'woff2'
+    font.save(output)
+    return output.getvalue()
+
+
+def build_subset(storage, font_name, text):
+    """서브셋을 저장하고 font_subsets 항목 반환"""
+    with storage.open(font_name, 'rb') as f:
+        data = subset_woff2(f, text)
+    name = storage.save(f'fonts/subsets/{font_name.rsplit("/", 1)[-1].rsplit(".", 1)[0]}.woff2', ContentFile(data))
+    return {'src': font_name, 'name': name, 'chars': text, 'size': len(data)}
+
+
+def current_subset(site_settings, role):
+    """현재 폰트 파일의 서브셋 항목 (없거나 예전 폰트의 것이면 None)"""
+    field_file = getattr(site_settings, f'{role}_font')
+    entry = (site_settings.font_subsets or {}).get(role)
+    if not field_file or not entry or entry.get('src') != field_file.name:
+        return None
+    return entry
+
+
+def subset_names(font_subsets):
+    """font_subsets 값에 기록된 서브셋 파일 이름 (media_refs 참조 수 계산용)"""
+    return {entry['name'] for entry in (font_subsets or {}).values() if entry.get('name')}
+
+
+def _schedule(site_settings, role, text):
+    """text 에 서브셋에 없는 글자가 있으면 역할의 서브셋 재생성 예약"""
+    field_file = getattr(site_settings, f'{role}_font')
+    if not field_file:
+        return
+    entry = current_subset(site_settings, role)
+    if entry is not None and not set(text) - set(entry['chars']) - {'\n', '\r'}:
+        return
+    # 이미 대기 중이면 그 작업이 최신 텍스트로 만듦, 이 폰트로 실패한 적이 있으면 다시 시도하지 않음
+    ImageOptimizationJob = apps.get_model('menu', 'ImageOptimizationJob')
+    if ImageOptimizationJob.objects.filter(
+        model='menu.sitesettings', object_id=site_settings.pk, field_name=f'{role}_font',
+        source_name=field_file.name,
+        status__in=[ImageOptimizationJob.PENDING, ImageOptimizationJob.FAILED],
+    ).exists():
+        return
+    ImageOptimizationJob.enqueue(site_settings, f'{role}_font')
+
+
+def _site_settings(restaurant_id, roles):
+    SiteSettings = apps.get_model('menu', 'SiteSettings')
+    return SiteSettings.objects.filter(restaurant_id=restaurant_id).only(
+        'id', 'restaurant_id', 'font_subsets', *(f'{role}_font' for role in roles),
+    ).first()
+
+
+def schedule_for_text(instance):
+    """
+    메뉴/카테고리 저장 시: 서브셋에 없는 글자가 생긴 역할만 다시 생성 예약
+    (글자가 줄어드는 변경은 다음 재생성 때 반영)
+    """
+    label = f'{instance._meta.app_label}.{instance._meta.object_name}'
+    roles = [role for role, (model_label, _) in TEXT_SOURCES.items() if model_label == label]
+    if not roles or instance.restaurant_id is None:
+        return
+    site_settings = _site_settings(instance.restaurant_id, roles)
+    if site_settings is None:
+        return
+    for role in roles:
+        _schedule(site_settings, role, getattr(instance, TEXT_SOURCES[role][1]) or '')
+
+
+def schedule_for_restaurant(restaurant_id):
+    """
+    bulk_create/bulk_update 등 시그널 없이 텍스트를 바꾼 뒤 호출 (import_csv)
+    레스토랑 전체 텍스트를 기준으로 필요한 역할만 예약
+    """
+    site_settings = _site_settings(restaurant_id, TEXT_SOURCES)
+    if site_settings is None:
+        return
+    for role in TEXT_SOURCES:
+        if getattr(site_settings, f'{role}_font'):
+            _schedule(site_settings, role, role_text(restaurant_id, role))
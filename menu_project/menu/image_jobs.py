@@ -0,0 +1,223 @@
+"""
+이미지 최적화 작업 실행 (ImageOptimizationJob)
+
+- 원본 파일을 읽어 utils.encode_optimized 로 인코딩한 뒤 새 파일로 저장
+- RESPONSIVE_FIELDS 는 너비별 AVIF/WebP/원본 포맷 파생본도 저장하고 image_variants 에 기록 (srcset)
+- SiteSettings 의 폰트 필드 작업은 WOFF2 서브셋을 만들어 font_subsets 에 기록 (fonts.py)
+- 모델 필드는 "아직 원본 파일을 가리키는 경우에만" 한 번의 UPDATE 로 교체 (그 사이 새로 업로드됐으면 버림)
+- 교체 후 save(update_fields=...) 로 post_save 신호를 보내 메뉴 스냅샷/테넌트/테마 해시를 갱신
+"""
+import posixpath
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import fonts, media_refs
+from .models import ImageOptimizationJob
+from .utils import encode_optimized, encode_variants, file_sha256, strip_random_suffix
+
+# 재시도 대기 시간 (초) = RETRY_BASE_SECONDS * 2 ** (시도 횟수 - 1)
+RETRY_BASE_SECONDS = 30
+
+
+def _claim(job):
+    """대기 중인 작업을 처리 중으로 표시 (다른 워커가 먼저 가져갔으면 False)"""
+    now = timezone.now()
+    claimed = ImageOptimizationJob.objects.filter(pk=job.pk, status=ImageOptimizationJob.PENDING).update(
+        status=ImageOptimizationJob.RUNNING,
+        attempts=job.attempts + 1,
+        locked_at=now,
+        updated_at=now,
+    )
+    if claimed:
+        job.status = ImageOptimizationJob.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+    return bool(claimed)
+
+
+def _finish(job, result_name='', note=''):
+    job.status = ImageOptimizationJob.DONE
+    job.result_name = result_name
+    job.last_error = note
+    job.locked_at = None
+    job.save(update_fields=['status', 'result_name', 'last_error', 'locked_at', 'updated_at'])
+
+
+def _retry(job, error):
+    if job.attempts >= ImageOptimizationJob.MAX_ATTEMPTS:
+        job.status = ImageOptimizationJob.FAILED
+    else:
+        job.status = ImageOptimizationJob.PENDING
+        job.run_after = timezone.now() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+    job.last_error = f"{type(error).__name__}: {error}"
+    job.locked_at = None
+    job.save(update_fields=['status', 'run_after', 'last_error', 'locked_at', 'updated_at'])
+
+
+def run_job(job):
+    """
+    작업 하나 실행. 최적화 파일로 교체했으면 True
+    """
+    if not _claim(job):
+        return False
+
+    Model = apps.get_model(job.model)
+    instance = Model.objects.filter(pk=job.object_id).first()
+    field_file = getattr(instance, job.field_name, None) if instance is not None else None
+    if not field_file or field_file.name != job.source_name:
+        # 객체가 삭제됐거나 그 사이 다른 파일이 업로드됨 (새 업로드는 자기 작업이 따로 있음)
+        _finish(job, note='skipped: source changed')
+        return False
+
+    if job.field_name in fonts.FONT_FIELDS:
+        return _run_font_job(job, Model, instance, field_file)
+
+    max_width, quality = Model.IMAGE_PRESETS[job.field_name]
+    try:
+        result = optimize_file(
+            field_file.storage, job.source_name, max_width, quality,
+            responsive=job.field_name in Model.RESPONSIVE_FIELDS,
+        )
+    except Exception as e:
+        _retry(job, e)
+        return False
+
+    if not swap_optimized(Model, instance, job.field_name, job.source_name, result, field_file.storage):
+        _finish(job, note='skipped: source changed')
+        return False
+
+    # 캐시 무효화 신호 + SiteSettings 테마 해시 재계산 (파일이 이미 저장되어 있으므로 다시 예약되지 않음)
+    instance = Model.objects.get(pk=job.object_id)
+    instance.save(update_fields=[job.field_name])
+
+    _finish(job, result_name=result['name'])
+    return True
+
+
+def _run_font_job(job, Model, instance, field_file):
+    """폰트 서브셋 생성 (레스토랑의 현재 메뉴 텍스트 기준)"""
+    role = job.field_name[:-len('_font')]
+    storage = field_file.storage
+    try:
+        entry = fonts.build_subset(storage, job.source_name, fonts.role_text(instance.restaurant_id, role))
+    except Exception as e:
+        _retry(job, e)
+        return False
+
+    old = fonts.subset_names({role: (instance.font_subsets or {}).get(role, {})})
+    with transaction.atomic():
+        swapped = Model.objects.filter(pk=instance.pk, **{job.field_name: job.source_name}).update(
+            font_subsets={**(instance.font_subsets or {}), role: entry},
+        )
+    if not swapped:
+        if entry['name'] not in old:
+            media_refs.discard(storage, entry['name'])
+        _finish(job, note='skipped: source changed')
+        return False
+
+    if entry['name'] not in old:
+        media_refs.retain(entry['name'])
+        for name in old:
+            media_refs.release(name)
+            media_refs.discard(storage, name)
+
+    # 테마 해시(@font-face URL) 재계산 + 캐시 무효화 신호
+    Model.objects.get(pk=instance.pk).save(update_fields=['font_subsets'])
+    _finish(job, result_name=entry['name'])
+    return True
+
+
+def optimize_file(storage, source_name, max_width, quality, responsive=False):
+    """
+    저장된 이미지 파일 하나를 최적화하여 새 파일(과 파생본)로 저장. DB 는 건드리지 않음
+    반환: {'name', 'sha256', 'preset', 'variants', 'before', 'after'} (before/after: 바이트)
+    """
+    with storage.open(source_name, 'rb') as source:
+        before = source.size
+        optimized = encode_optimized(source, max_width=max_width, quality=quality)
+    optimized_hash = file_sha256(optimized)
+    # 이전 저장에서 붙은 무작위 접미사는 떼고 저장 (이름이 계속 길어지지 않도록)
+    target = posixpath.join(
+        posixpath.dirname(source_name),
+        posixpath.basename(strip_random_suffix(optimized.name)),
+    )
+    new_name = storage.save(target, optimized)
+    return {
+        'name': new_name,
+        'sha256': optimized_hash,
+        'preset': [max_width, quality],
+        'variants': _save_variants(storage, optimized, new_name, quality) if responsive else None,
+        'before': before,
+        'after': optimized.size,
+    }
+
+
+def swap_optimized(Model, instance, field_name, source_name, result, storage):
+    """
+    필드가 아직 source_name 을 가리킬 때만 최적화 결과로 교체 (compare-and-swap)
+    내용 해시/프리셋/파생본을 함께 기록하고 파일 참조 수를 맞춤
+    queryset.update 이므로 캐시 무효화 신호는 호출한 쪽에서 처리
+    """
+    new_name, variants = result['name'], result['variants']
+    hashes = dict(instance.image_hashes or {})
+    hashes[field_name] = {**hashes.get(field_name, {}), 'sha256': result['sha256'], 'preset': result['preset']}
+    changes = {field_name: new_name, 'image_hashes': hashes}
+    old_variants = media_refs.variant_names({field_name: (instance.image_variants or {}).get(field_name, {})})
+    if variants is not None:
+        changes['image_variants'] = {**(instance.image_variants or {}), field_name: variants}
+    with transaction.atomic():
+        swapped = Model.objects.filter(pk=instance.pk, **{field_name: source_name}).update(**changes)
+    new_variants = media_refs.variant_names({field_name: variants}) if variants else set()
+    if not swapped:
+        for name in {new_name, *new_variants} - {source_name}:
+            media_refs.discard(storage, name)
+        return False
+
+    if new_name != source_name:
+        media_refs.retain(new_name)
+        media_refs.release(source_name)
+        media_refs.discard(storage, source_name)
+    if variants is not None:
+        for name in new_variants - old_variants:
+            media_refs.retain(name)
+        for name in old_variants - new_variants:
+            media_refs.release(name)
+            media_refs.discard(storage, name)
+    return True
+
+
+def _save_variants(storage, optimized, name, quality):
+    """너비별 파생본 저장 -> image_variants 항목"""
+    width, height, source_format, encoded = encode_variants(
+        optimized,
+        getattr(settings, 'IMAGE_VARIANT_WIDTHS', (160, 320, 640, 1200)),
+        quality=quality,
+        formats=getattr(settings, 'IMAGE_VARIANT_FORMATS', ('avif', 'webp')),
+    )
+    sets = {source_format: [[width, name]]}
+    for key, w, content in encoded:
+        target = posixpath.join(posixpath.dirname(name), 'variants', posixpath.basename(content.name))
+        sets.setdefault(key, []).append([w, storage.save(target, content)])
+    for items in sets.values():
+        items.sort()
+    return {'src': name, 'w': width, 'h': height, 'sets': sets}
+
+
+def requeue_stale(timeout_seconds):
+    """워커가 죽어서 처리 중으로 남은 작업을 다시 대기 상태로"""
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    return ImageOptimizationJob.objects.filter(
+        status=ImageOptimizationJob.RUNNING, locked_at__lt=cutoff,
+    ).update(status=ImageOptimizationJob.PENDING, locked_at=None)
+
+
+def due_jobs(limit):
+    return list(
+        ImageOptimizationJob.objects.filter(
+            status=ImageOptimizationJob.PENDING, run_after__lte=timezone.now(),
+        ).order_by('run_after', 'id')[:limit]
+    )
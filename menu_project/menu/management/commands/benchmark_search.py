@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from menu.models import Restaurant
+from menu.search_backends import BACKENDS, get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Compares search backends (memory / database full-text / icontains) on a restaurant\'s menu.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='*', help='Search terms to benchmark (default: a few sample terms).')
+        parser.add_argument('--restaurant', required=True, help='Restaurant slug to search in.')
+        parser.add_argument(
+            '--backends',
+            default='icontains,database,memory',
+            help='Comma separated backend names (memory, database, postgres, sqlite_fts, icontains).'
+        )
+        parser.add_argument('--repeat', type=int, default=50, help='Runs per query and backend.')
+
+    def handle(self, *args, **options):
+        try:
+            restaurant = Restaurant.objects.get(slug=options['restaurant'])
+        except Restaurant.DoesNotExist:
+            raise CommandError(f"Restaurant '{options['restaurant']}' not found.")
+
+        queries = options['queries'] or ['위스', '위스키', 'ㅇㅅㅋ', 'whisky', '하이볼', 'glenfidich']
+        names = [name.strip() for name in options['backends'].split(',') if name.strip()]
+        for name in names:
+            if name not in BACKENDS and name != 'database':
+                raise CommandError(f"Unknown backend '{name}'.")
+
+        self.stdout.write(f"{'backend':<12} {'query':<14} {'avg ms':>8} {'p95 ms':>8} {'queries':>8} {'hits':>5}")
+        for name in names:
+            backend = get_search_backend(name)
+            for query in queries:
+                # 첫 실행(인덱스 생성 등)은 측정에서 제외
+                backend.search_menu_items(restaurant, query)
+
+                timings = []
+                with CaptureQueriesContext(connection) as ctx:
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        results = backend.search_menu_items(restaurant, query)
+                        timings.append((time.perf_counter() - start) * 1000)
+
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                per_run = len(ctx.captured_queries) / options['repeat']
+                self.stdout.write(
+                    f"{name:<12} {query:<14} {statistics.mean(timings):>8.3f} {p95:>8.3f} {per_run:>8.1f} {len(results):>5}"
+                )
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from menu.models import Restaurant
+from menu.tenant_archive import clone_restaurant
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates a new restaurant as a copy of an existing one (site settings, category tree and menu items). '
+        'Media files are shared, not copied.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', type=str, help='Slug of the restaurant to copy, e.g. standard')
+        parser.add_argument('slug', type=str, help='Slug (subdomain) of the new restaurant.')
+        parser.add_argument('--name', type=str, help='Name of the new restaurant. Defaults to the source name.')
+
+    def handle(self, *args, **options):
+        source = Restaurant.objects.filter(slug=options['source']).first()
+        if source is None:
+            raise CommandError(f"Restaurant '{options['source']}' not found.")
+
+        started = time.monotonic()
+        try:
+            restaurant, counts = clone_restaurant(source, options['slug'], name=options['name'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Cloned '{source.slug}' to '{restaurant.slug}' (id {restaurant.pk}) in {elapsed:.2f}s: "
+            f"{counts['menu.sitesettings']} site settings, {counts['menu.category']} categories, "
+            f"{counts['menu.menuitem']} menu items."
+        ))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from menu.models import Restaurant
+from menu.tenant_archive import export_restaurant
+
+
+class Command(BaseCommand):
+    help = (
+        'Exports one restaurant (settings, category tree, menu items and referenced media) '
+        'to a streaming tar archive (.tar or .tar.gz) for backup or moving between installations.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('restaurant', type=str, help='Slug of the restaurant to export.')
+        parser.add_argument('output', type=str, help='Archive path, e.g. bid.tar.gz')
+        parser.add_argument(
+            '--no-media', action='store_true',
+            help='Do not include media files (only when importing into an installation that already has them).'
+        )
+
+    def handle(self, *args, **options):
+        restaurant = Restaurant.objects.filter(slug=options['restaurant']).first()
+        if restaurant is None:
+            raise CommandError(f"Restaurant '{options['restaurant']}' not found.")
+
+        started = time.monotonic()
+        stats = export_restaurant(restaurant, options['output'], include_media=not options['no_media'])
+        elapsed = time.monotonic() - started
+
+        for name in stats['missing']:
+            self.stdout.write(self.style.WARNING(f"Missing media file skipped: {name}"))
+        counts = stats['counts']
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported '{restaurant.slug}' to {options['output']} in {elapsed:.1f}s: "
+            f"{counts['menu.sitesettings']} site settings, {counts['menu.category']} categories, "
+            f"{counts['menu.menuitem']} menu items, "
+            f"{stats['media_files']} media file(s) ({stats['media_bytes'] / 1024:.1f} KB)."
+        ))
@@ -0,0 +1,252 @@
+"""
+테이블별 QR 코드 일괄 생성
+
+- 레스토랑 x 테이블 번호마다 {base_url}/{slug}/?table=N QR 을 menu/qr.py 의 렌더러로 생성
+- 렌더링은 프로세스 풀에서 병렬로 수행하고, 결과는 QR 디스크 캐시(QR_CACHE_DIR)에 저장
+- 인쇄용 시트(PNG/PDF) 또는 ZIP 으로 묶어서 출력
+- 출력 폴더의 qr-manifest.json 에 파일별 서명을 기록하여 바뀐 것만 다시 씀
+- 같은 입력이면 항상 같은 바이트가 나옴 (ZIP 타임스탬프 고정, PDF 메타데이터 없음)
+"""
+import hashlib
+import json
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image, ImageDraw, ImageFont
+
+# 워커 프로세스가 이 모듈을 다시 import 하므로 (spawn/forkserver) 모델은 handle() 안에서 import
+from menu import qr
+
+# A4 300dpi
+SHEET_SIZE = (2480, 3508)
+SHEET_MARGIN = 120
+LABEL_HEIGHT = 110
+MANIFEST_NAME = 'qr-manifest.json'
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+def _render_to_cache(job):
+    """
+    워커 프로세스: QR PNG 를 렌더링하여 디스크 캐시에 저장 (로고 디코딩은 프로세스별로 재사용)
+    (키, bytes) 반환 - 디스크 캐시 쓰기가 실패해도 (읽기 전용 등) 출력은 만들 수 있음
+    """
+    menu_url, logo = job
+    return qr.get_qr_image(menu_url, logo, 'png')
+
+
+def parse_tables(value):
+    """'1-20,25,30-32' -> [1, ..., 20, 25, 30, 31, 32]"""
+    tables = set()
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = (int(x) for x in part.split('-', 1))
+                tables.update(range(start, end + 1))
+            else:
+                tables.add(int(part))
+        except ValueError:
+            raise CommandError(f"Invalid table range: '{part}'")
+    if not tables or min(tables) < 1:
+        raise CommandError("Table numbers must be positive integers.")
+    return sorted(tables)
+
+
+def table_url(base_url, slug, table):
+    return f"{base_url.rstrip('/')}/{slug}/?table={table}"
+
+
+class Command(BaseCommand):
+    help = 'Generates per-table QR codes for restaurants as printable PNG/PDF sheets or a ZIP archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--restaurant', action='append', dest='restaurants', default=[],
+            help='Restaurant slug (repeatable). Defaults to all restaurants.'
+        )
+        parser.add_argument('--tables', default='1-20', help='Table numbers, e.g. "1-20,25,30-32".')
+        parser.add_argument('--base-url', required=True, help='Public site URL, e.g. "https://menu.example.com".')
+        parser.add_argument('--output', default='table_qr', help='Output directory.')
+        parser.add_argument('--format', choices=['pdf', 'png', 'zip'], default='pdf', help='Output format.')
+        parser.add_argument('--columns', type=int, default=3, help='QR codes per sheet row.')
+        parser.add_argument('--rows', type=int, default=4, help='QR code rows per sheet.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Render processes.')
+
+    def handle(self, *args, **options):
+        from menu.models import Restaurant
+
+        tables = parse_tables(options['tables'])
+        output = options['output']
+        base_url = options['base_url']
+        if options['columns'] < 1 or options['rows'] < 1:
+            raise CommandError("--columns and --rows must be at least 1.")
+
+        restaurants = Restaurant.objects.prefetch_related('site_settings').order_by('slug')
+        if options['restaurants']:
+            restaurants = restaurants.filter(slug__in=options['restaurants'])
+            missing = set(options['restaurants']) - {r.slug for r in restaurants}
+            if missing:
+                raise CommandError(f"Unknown restaurant slug(s): {', '.join(sorted(missing))}")
+        restaurants = list(restaurants)
+
+        # 1. 테이블별 (URL, 로고, 키) 계산 - 로고 해시는 파일당 한 번만 읽음
+        plan = []
+        jobs = {}
+        self._sources = {}
+        for restaurant in restaurants:
+            site_settings = next(iter(restaurant.site_settings.all()), None)
+            logo = qr.logo_path(site_settings)
+            entries = []
+            for table in tables:
+                url = table_url(base_url, restaurant.slug, table)
+                key = qr.qr_key(url, logo)
+                entries.append((table, key))
+                self._sources[key] = (url, logo)
+                if not os.path.exists(qr.cache_path(key, 'png')):
+                    jobs[key] = (url, logo)
+            plan.append((restaurant, entries))
+
+        # 2. 캐시에 없는 QR 만 병렬 렌더링
+        total = len(restaurants) * len(tables)
+        self.stdout.write(self.style.NOTICE(
+            f"{total} QR code(s) for {len(restaurants)} restaurant(s), {len(jobs)} to render, "
+            f"{total - len(jobs)} up to date."
+        ))
+        self._images = {}
+        if jobs:
+            if options['workers'] > 1 and len(jobs) > 1:
+                with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+                    self._images.update(pool.map(_render_to_cache, jobs.values(), chunksize=8))
+            else:
+                self._images.update(_render_to_cache(job) for job in jobs.values())
+
+        # 3. 출력 파일 작성 (서명이 같으면 건너뜀)
+        os.makedirs(output, exist_ok=True)
+        manifest_path = os.path.join(output, MANIFEST_NAME)
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        written = skipped = 0
+        for restaurant, entries in plan:
+            for name, signature, build in self._outputs(restaurant, entries, options):
+                path = os.path.join(output, name)
+                if manifest.get(name) == signature and os.path.exists(path):
+                    skipped += 1
+                    continue
+                os.makedirs(os.path.dirname(path) or output, exist_ok=True)
+                tmp_path = f'{path}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(build())
+                os.replace(tmp_path, path)
+                manifest[name] = signature
+                written += 1
+
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} file(s), {skipped} already up to date, in {os.path.abspath(output)}"
+        ))
+
+    def _outputs(self, restaurant, entries, options):
+        """(출력 파일명, 서명, 내용 생성 함수) 목록"""
+        fmt = options['format']
+        per_sheet = options['columns'] * options['rows']
+        layout = (options['columns'], options['rows'])
+        slug = restaurant.slug
+
+        def signature(*parts):
+            return hashlib.sha256(json.dumps([fmt, layout, *parts]).encode('utf-8')).hexdigest()[:16]
+
+        sheets = [entries[i:i + per_sheet] for i in range(0, len(entries), per_sheet)]
+
+        if fmt == 'pdf':
+            yield (
+                f'{slug}.pdf',
+                signature(entries),
+                lambda: self._pdf([self._sheet(restaurant, sheet, options) for sheet in sheets]),
+            )
+        elif fmt == 'png':
+            for table, key in entries:
+                yield f'{slug}/table-{table:03d}.png', key, lambda key=key: self._qr_png(key)
+            for number, sheet in enumerate(sheets, 1):
+                yield (
+                    f'{slug}/sheet-{number:02d}.png',
+                    signature(sheet),
+                    lambda sheet=sheet: _png(self._sheet(restaurant, sheet, options)),
+                )
+        else:
+            yield f'{slug}.zip', signature(entries), lambda: self._zip(restaurant, entries, sheets, options)
+
+    def _qr_png(self, key):
+        """QR PNG bytes (이번에 렌더링한 것, 없으면 디스크 캐시 -> 다시 렌더링 순서)"""
+        data = self._images.get(key)
+        if data is None:
+            url, logo = self._sources[key]
+            _, data = qr.get_qr_image(url, logo, 'png')
+            self._images[key] = data
+        return data
+
+    def _sheet(self, restaurant, entries, options):
+        """A4 한 장에 columns x rows 로 QR 과 테이블 번호 배치"""
+        columns, rows = options['columns'], options['rows']
+        sheet = Image.new('RGB', SHEET_SIZE, 'white')
+        draw = ImageDraw.Draw(sheet)
+        font = ImageFont.load_default(size=LABEL_HEIGHT // 2)
+
+        cell_width = (SHEET_SIZE[0] - SHEET_MARGIN * 2) // columns
+        cell_height = (SHEET_SIZE[1] - SHEET_MARGIN * 2) // rows
+        qr_size = min(cell_width, cell_height - LABEL_HEIGHT) - 40
+
+        for index, (table, key) in enumerate(entries):
+            x = SHEET_MARGIN + (index % columns) * cell_width
+            y = SHEET_MARGIN + (index // columns) * cell_height
+            with Image.open(BytesIO(self._qr_png(key))) as code:
+                # QR 모듈 경계가 흐려지지 않도록 NEAREST 로 확대/축소
+                code = code.convert('RGB').resize((qr_size, qr_size), Image.Resampling.NEAREST)
+            sheet.paste(code, (x + (cell_width - qr_size) // 2, y))
+            draw.text(
+                (x + cell_width // 2, y + qr_size + LABEL_HEIGHT // 2),
+                # Pillow 기본 폰트에는 한글이 없으므로 가게 이름 대신 slug 표시
+                f"{restaurant.slug.upper()}  TABLE {table}",
+                fill='black', font=font, anchor='mm',
+            )
+            # 재단선
+            draw.rectangle([x, y - 20, x + cell_width - 1, y + cell_height - 21], outline='#cccccc', width=2)
+        return sheet
+
+    def _pdf(self, sheets):
+        buffer = BytesIO()
+        # 생성 시각을 기록하지 않아야 같은 입력에서 같은 PDF 가 나옴
+        sheets[0].save(
+            buffer, format='PDF', save_all=True, append_images=sheets[1:], resolution=300,
+            creationDate=None, modDate=None,
+        )
+        return buffer.getvalue()
+
+    def _zip(self, restaurant, entries, sheets, options):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            def add(name, data):
+                # 고정된 시각으로 기록하여 같은 입력이면 같은 ZIP 이 나오도록
+                archive.writestr(zipfile.ZipInfo(name, date_time=ZIP_DATE), data, zipfile.ZIP_DEFLATED)
+
+            for table, key in entries:
+                add(f'table-{table:03d}.png', self._qr_png(key))
+            for number, sheet in enumerate(sheets, 1):
+                add(f'sheet-{number:02d}.png', _png(self._sheet(restaurant, sheet, options)))
+        return buffer.getvalue()
+
+
+def _png(image):
+    buffer = BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
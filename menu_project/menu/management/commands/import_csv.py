@@ -1,96 +1,279 @@
 import csv
-from django.core.management.base import BaseCommand
-from menu.models import Category, MenuItem
+import hashlib
 import os
 
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from menu import fonts, snapshot
+from menu.models import Category, MenuItem, Restaurant
+
+BATCH_SIZE = 500
+
+
+def row_hash(name_en, price, description):
+    """--sync 비교용 메뉴 내용 해시 (None 과 빈 문자열은 같게 취급)"""
+    values = [(value or '').strip() for value in (name_en, price, description)]
+    return hashlib.sha1('\x1f'.join(values).encode('utf-8')).hexdigest()
+
+
 class Command(BaseCommand):
-    help = 'Imports or updates menu items for a specific category from a CSV file.'
+    help = (
+        'Imports menu items from a CSV file (대분류, 소분류, 영문명, 한글명, 가격, 설명) for one restaurant. '
+        'Existing items under each imported parent category are replaced, in a single transaction '
+        '(or, with --sync, updated in place).'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument('csv_file_path', type=str, help='The path to the CSV file to import.')
+        parser.add_argument(
+            '--restaurant',
+            type=str,
+            help='Restaurant slug to import into. May be omitted when there is only one restaurant.'
+        )
         parser.add_argument(
             '--category',
             type=str,
-            help='Specify the parent category to update (e.g., "위스키"). This will delete all existing items in that parent category before importing.'
+            action='append',
+            dest='categories',
+            default=[],
+            help='Parent category to update (e.g., "위스키"), repeatable. Defaults to every parent category in the file. '
+                 'All existing items in these parent categories are deleted before importing.'
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Apply only the differences instead of delete-and-recreate: insert new rows, update changed ones '
+                 '(keeping their ids) and mark items missing from the file as unavailable.'
         )
+        parser.add_argument('--dry-run', action='store_true', help='With --sync, print the changes without applying them.')
 
     def handle(self, *args, **options):
         csv_file_path = options['csv_file_path']
-        target_parent_category_name = options['category']
-
-        if not target_parent_category_name:
-            self.stdout.write(self.style.ERROR("Please specify a parent category to update using the --category option."))
-            self.stdout.write(self.style.WARNING("Example: python manage.py import_csv path/to/data.csv --category \"위스키\""))
-            return
 
         if not os.path.exists(csv_file_path):
             self.stdout.write(self.style.ERROR(f"File not found at: {csv_file_path}"))
             return
 
-        # --- Deletion Step ---
-        self.stdout.write(self.style.WARNING(f"Preparing to delete all existing menu items under the parent category '{target_parent_category_name}'..."))
-        try:
-            parent_category = Category.objects.get(name=target_parent_category_name, parent=None)
-            # Get all child categories of the parent
-            child_categories = parent_category.sub_categories.all()
-            # Delete all menu items within those child categories
-            items_to_delete = MenuItem.objects.filter(category__in=child_categories)
-            count = items_to_delete.count()
-            if count > 0:
-                items_to_delete.delete()
-                self.stdout.write(self.style.SUCCESS(f"Successfully deleted {count} old menu item(s) from '{target_parent_category_name}'."))
-            else:
-                self.stdout.write(self.style.NOTICE(f"No existing menu items found for '{target_parent_category_name}' to delete."))
-        except Category.DoesNotExist:
-            self.stdout.write(self.style.NOTICE(f"Parent category '{target_parent_category_name}' not found. No items will be deleted. New items will be created under it."))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"An error occurred during deletion: {e}"))
+        if options['dry_run'] and not options['sync']:
+            self.stdout.write(self.style.ERROR("--dry-run is only supported together with --sync."))
+            return
+
+        restaurant = self._restaurant(options['restaurant'])
+        if restaurant is None:
+            return
+
+        rows, parent_names = self._read_rows(csv_file_path, set(options['categories']))
+        if options['categories']:
+            parent_names = list(dict.fromkeys(options['categories']))
+        if not parent_names:
+            self.stdout.write(self.style.WARNING("No rows to import."))
+            return
+
+        self.stdout.write(self.style.NOTICE(
+            f"Importing {len(rows)} row(s) into '{restaurant.slug}' for: {', '.join(parent_names)}"
+        ))
+
+        if options['sync']:
+            with transaction.atomic():
+                self._sync(restaurant, rows, parent_names, options['dry_run'])
+            return
+
+        with transaction.atomic():
+            categories = self._categories(restaurant)
+
+            # --- 삭제: 대상 대분류 아래의 기존 메뉴 ---
+            parents = [categories[(None, name)] for name in parent_names if (None, name) in categories]
+            deleted, _ = MenuItem.objects.filter(
+                restaurant=restaurant, category__parent__in=parents,
+            ).delete() if parents else (0, {})
+            if deleted:
+                self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} old menu item(s)."))
+
+            new_categories = self._create_categories(restaurant, rows, categories)
+
+            # --- 메뉴 생성 (같은 소분류의 같은 이름은 뒤의 행으로 덮어씀) ---
+            items = {}
+            duplicates = 0
+            for row in rows:
+                category = categories[(categories[(None, row['parent'])].pk, row['category'])]
+                key = (category.pk, row['name'])
+                if key in items:
+                    duplicates += 1
+                items[key] = self._new_item(restaurant, category, row)
+            MenuItem.objects.bulk_create(list(items.values()), batch_size=BATCH_SIZE)
+
+            self._on_commit(restaurant)
+
+        self.stdout.write(self.style.SUCCESS(f"Import for '{restaurant.slug}' complete."))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created: {len(items)} items ({duplicates} duplicate row(s) overwritten). "
+            f"New categories: {new_categories}."
+        ))
+
+    def _sync(self, restaurant, rows, parent_names, dry_run):
+        """
+        차등 동기화: 현재 메뉴와 비교해 바뀐 행만 반영 (pk 유지)
+        - 파일에만 있는 메뉴 -> 추가
+        - 내용 해시가 다르거나 판매 중지된 메뉴 -> 수정 (+ 판매 재개)
+        - 파일에 없는 메뉴 -> 삭제하지 않고 판매 중지(is_available=False)
+        비교와 반영은 호출자의 트랜잭션 안에서 (비교 후 바뀐 행을 덮어쓰지 않도록)
+        """
+        # 같은 (대분류, 소분류, 메뉴명)은 뒤의 행이 이김
+        desired = {(row['parent'], row['category'], row['name']): row for row in rows}
+
+        current = MenuItem.objects.filter(
+            restaurant=restaurant,
+            category__parent__parent__isnull=True,
+            category__parent__name__in=parent_names,
+        ).values_list(
+            'pk', 'category__parent__name', 'category__name', 'name',
+            'name_en', 'price', 'description', 'is_available',
+        ).order_by('pk')
+
+        matched = {}
+        to_update = []
+        to_deactivate = []
+        for pk, parent_name, category_name, name, name_en, price, description, is_available in current.iterator():
+            key = (parent_name, category_name, name)
+            row = desired.get(key)
+            if row is None or key in matched:
+                # 파일에서 빠졌거나 같은 이름의 중복 메뉴
+                if is_available:
+                    to_deactivate.append(pk)
+                continue
+            matched[key] = pk
+            if not is_available or row_hash(name_en, price, description) != row['hash']:
+                to_update.append((pk, row))
+        to_insert = [row for key, row in desired.items() if key not in matched]
+
+        verb = 'Would' if dry_run else 'Will'
+        self.stdout.write(self.style.NOTICE(
+            f"{verb} insert {len(to_insert)}, update {len(to_update)}, deactivate {len(to_deactivate)} item(s); "
+            f"{len(matched) - len(to_update)} unchanged."
+        ))
+        if dry_run:
+            for pk, row in to_update[:20]:
+                self.stdout.write(f"  ~ #{pk} {row['parent']} / {row['category']} / {row['name']}")
+            for row in to_insert[:20]:
+                self.stdout.write(f"  + {row['parent']} / {row['category']} / {row['name']}")
             return
-        
-        # --- Import Step ---
-        self.stdout.write(self.style.NOTICE(f"Starting to import items for '{target_parent_category_name}' from {csv_file_path}..."))
+        if not (to_insert or to_update or to_deactivate):
+            self.stdout.write(self.style.SUCCESS(f"Sync for '{restaurant.slug}': nothing to change."))
+            return
+
+        now = timezone.now()
+        new_categories = 0
+        if to_insert:
+            categories = self._categories(restaurant)
+            new_categories = self._create_categories(restaurant, to_insert, categories)
+            MenuItem.objects.bulk_create([
+                self._new_item(restaurant, categories[(categories[(None, row['parent'])].pk, row['category'])], row)
+                for row in to_insert
+            ], batch_size=BATCH_SIZE)
+
+        # bulk_update / update 는 auto_now 를 채우지 않으므로 updated_at 직접 지정
+        MenuItem.objects.bulk_update([
+            MenuItem(
+                pk=pk, name_en=row['name_en'], price=row['price'], description=row['description'],
+                is_available=True, updated_at=now,
+            )
+            for pk, row in to_update
+        ], ['name_en', 'price', 'description', 'is_available', 'updated_at'], batch_size=BATCH_SIZE)
+
+        for start in range(0, len(to_deactivate), BATCH_SIZE):
+            MenuItem.objects.filter(pk__in=to_deactivate[start:start + BATCH_SIZE]).update(
+                is_available=False, updated_at=now,
+            )
+
+        self._on_commit(restaurant)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sync for '{restaurant.slug}' complete. Inserted: {len(to_insert)}, updated: {len(to_update)}, "
+            f"deactivated: {len(to_deactivate)}. New categories: {new_categories}."
+        ))
+
+    def _categories(self, restaurant):
+        """기존 카테고리를 한 번에 읽어 (부모 id, 이름) -> 카테고리"""
+        return {
+            (c.parent_id, c.name): c
+            for c in Category.objects.filter(restaurant=restaurant).only('id', 'parent_id', 'name')
+        }
+
+    def _create_categories(self, restaurant, rows, categories):
+        """rows 에 필요한 없는 카테고리를 대분류 -> 소분류 순서로 bulk_create (categories 갱신) -> 생성 수"""
+        new_parents = [
+            Category(restaurant=restaurant, name=name, parent=None)
+            for name in dict.fromkeys(row['parent'] for row in rows) if (None, name) not in categories
+        ]
+        Category.objects.bulk_create(new_parents, batch_size=BATCH_SIZE)
+        for c in new_parents:
+            categories[(None, c.name)] = c
+
+        new_children = {}
+        for row in rows:
+            parent = categories[(None, row['parent'])]
+            key = (parent.pk, row['category'])
+            if key not in categories and key not in new_children:
+                new_children[key] = Category(restaurant=restaurant, name=row['category'], parent=parent)
+        Category.objects.bulk_create(list(new_children.values()), batch_size=BATCH_SIZE)
+        categories.update(new_children)
+        if new_parents or new_children:
+            # bulk_create 는 save() 를 거치지 않으므로 경로/깊이/하위 개수 재계산
+            Category.rebuild_tree(restaurant)
+        return len(new_parents) + len(new_children)
+
+    def _new_item(self, restaurant, category, row):
+        return MenuItem(
+            restaurant=restaurant,
+            category=category,
+            name=row['name'],
+            name_en=row['name_en'],
+            price=row['price'],
+            description=row['description'],
+        )
+
+    def _on_commit(self, restaurant):
+        # bulk_create/update 는 시그널이 없으므로 캐시 무효화 / 폰트 서브셋 예약을 직접
+        transaction.on_commit(lambda: snapshot.invalidate(restaurant.pk))
+        transaction.on_commit(lambda: fonts.schedule_for_restaurant(restaurant.pk))
+
+    def _restaurant(self, slug):
+        if slug:
+            restaurant = Restaurant.objects.filter(slug=slug).first()
+            if restaurant is None:
+                self.stdout.write(self.style.ERROR(f"Restaurant '{slug}' not found."))
+            return restaurant
+
+        restaurants = list(Restaurant.objects.all()[:2])
+        if len(restaurants) == 1:
+            return restaurants[0]
+        self.stdout.write(self.style.ERROR("Please specify the restaurant using the --restaurant option."))
+        self.stdout.write(self.style.WARNING("Example: python manage.py import_csv path/to/data.csv --restaurant bid"))
+        return None
+
+    def _read_rows(self, csv_file_path, only):
+        """파일을 한 번 읽어 유효한 행과 등장한 대분류 목록(순서 유지) 반환"""
+        rows = []
+        parent_names = {}
         with open(csv_file_path, mode='r', encoding='utf-8-sig') as file:
-            reader = csv.DictReader(file, delimiter=',')
-            
-            items_created = 0
-            items_updated = 0
-
-            for row in reader:
-                parent_category_name = row.get('대분류', '').strip()
-
-                # Process only the rows that match the target parent category
-                if parent_category_name == target_parent_category_name:
-                    category_name = row.get('소분류', '').strip()
-                    item_name_en = row.get('영문명', '').strip()
-                    item_name_ko = row.get('한글명', '').strip()
-                    item_price = row.get('가격', '').strip()
-                    item_description = row.get('설명', '').strip()
-
-                    if not all([category_name, item_name_ko, item_price]):
-                        self.stdout.write(self.style.WARNING(f"Skipping row due to missing data: {row}"))
-                        continue
-
-                    # Get or create parent category
-                    parent_cat, _ = Category.objects.get_or_create(name=parent_category_name, parent=None)
-
-                    # Get or create child category
-                    child_cat, _ = Category.objects.get_or_create(name=category_name, parent=parent_cat)
-
-                    # Create or update menu item
-                    menu_item, created = MenuItem.objects.update_or_create(
-                        name=item_name_ko,
-                        category=child_cat,
-                        defaults={
-                            'name_en': item_name_en,
-                            'price': item_price,
-                            'description': item_description,
-                        }
-                    )
-
-                    if created:
-                        items_created += 1
-                    else:
-                        items_updated += 1
-        
-        self.stdout.write(self.style.SUCCESS(f"Import for '{target_parent_category_name}' complete."))
-        self.stdout.write(self.style.SUCCESS(f"Created: {items_created} new items. Updated: {items_updated} existing items."))
+            for row in csv.DictReader(file, delimiter=','):
+                parent_name = (row.get('대분류') or '').strip()
+                if not parent_name or (only and parent_name not in only):
+                    continue
+                parsed = {
+                    'parent': parent_name,
+                    'category': (row.get('소분류') or '').strip(),
+                    'name_en': (row.get('영문명') or '').strip(),
+                    'name': (row.get('한글명') or '').strip(),
+                    'price': (row.get('가격') or '').strip(),
+                    'description': (row.get('설명') or '').strip(),
+                }
+                if not all([parsed['category'], parsed['name'], parsed['price']]):
+                    self.stdout.write(self.style.WARNING(f"Skipping row due to missing data: {row}"))
+                    continue
+                parent_names[parent_name] = True
+                parsed['hash'] = row_hash(parsed['name_en'], parsed['price'], parsed['description'])
+                rows.append(parsed)
+        return rows, list(parent_names)
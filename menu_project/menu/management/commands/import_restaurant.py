@@ -0,0 +1,34 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from menu.tenant_archive import import_restaurant
+
+
+class Command(BaseCommand):
+    help = 'Imports a restaurant archive written by export_restaurant as a new restaurant.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive', type=str, help='Archive path (.tar or .tar.gz).')
+        parser.add_argument('--slug', type=str, help='Slug for the new restaurant. Defaults to the exported slug.')
+        parser.add_argument('--name', type=str, help='Name for the new restaurant. Defaults to the exported name.')
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['archive']):
+            raise CommandError(f"File not found at: {options['archive']}")
+
+        started = time.monotonic()
+        try:
+            restaurant, stats = import_restaurant(options['archive'], slug=options['slug'], name=options['name'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        counts = stats['counts']
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported '{restaurant.slug}' (id {restaurant.pk}) in {elapsed:.1f}s: "
+            f"{counts['menu.sitesettings']} site settings, {counts['menu.category']} categories, "
+            f"{counts['menu.menuitem']} menu items, "
+            f"{stats['media_files']} media file(s) ({stats['media_bytes'] / 1024:.1f} KB)."
+        ))
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from menu import media_refs
+
+
+class Command(BaseCommand):
+    help = 'Deletes content-addressed media files that are no longer referenced (MediaBlob refcount 0).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Recount references from every file field before collecting.'
+        )
+        parser.add_argument(
+            '--grace-hours', type=float, default=media_refs.DEFAULT_GRACE.total_seconds() / 3600,
+            help='Only delete files unreferenced for at least this many hours.'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting.')
+
+    def handle(self, *args, **options):
+        if options['grace_hours'] < 0:
+            raise CommandError("--grace-hours must not be negative.")
+
+        if options['rebuild']:
+            counts = media_refs.rebuild()
+            self.stdout.write(self.style.NOTICE(
+                f"Recounted {sum(counts.values())} reference(s) to {len(counts)} file(s)."
+            ))
+
+        removed, freed = media_refs.collect(timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+        verb = 'Would remove' if options['dry_run'] else 'Removed'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {removed} file(s), {freed / 1024:.1f} KB freed."))
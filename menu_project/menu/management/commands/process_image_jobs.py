@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from menu.image_jobs import due_jobs, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = 'Runs queued image optimization jobs (ImageOptimizationJob) until stopped, or once with --once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process the jobs that are due and exit.')
+        parser.add_argument('--batch', type=int, default=20, help='Jobs fetched per poll.')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds to wait when the queue is empty.')
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help='Seconds after which a running job is considered abandoned and requeued.'
+        )
+
+    def handle(self, *args, **options):
+        optimized = skipped = 0
+        try:
+            while True:
+                requeued = requeue_stale(options['stale_after'])
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f"Requeued {requeued} abandoned job(s)."))
+
+                jobs = due_jobs(options['batch'])
+                for job in jobs:
+                    if run_job(job):
+                        optimized += 1
+                        self.stdout.write(f"Optimized {job.model}#{job.object_id}.{job.field_name} -> {job.result_name}")
+                    else:
+                        skipped += 1
+                        if job.last_error:
+                            self.stdout.write(self.style.NOTICE(
+                                f"{job.model}#{job.object_id}.{job.field_name}: {job.status} ({job.last_error})"
+                            ))
+
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Interrupted."))
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {optimized} optimized, {skipped} skipped or retried."))
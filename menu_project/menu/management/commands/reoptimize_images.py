@@ -0,0 +1,221 @@
+"""
+저장된 이미지 일괄 재최적화 (IMAGE_PRESETS / 파생본 설정 변경 후)
+
+- 모든 레스토랑의 SiteSettings / Category / MenuItem 이미지 필드를 프로세스 풀에서 다시 인코딩
+  (JPEG 는 draft 모드로 축소 디코딩 + reduce() 후 최종 리샘플링, utils.encode_optimized)
+- 결과는 --batch 건씩 한 트랜잭션으로 DB 에 반영 (image_jobs.swap_optimized, 그 사이 바뀐 필드는 건너뜀)
+- 배치마다 체크포인트 파일에 모델별 마지막 pk 를 기록하여 중단 후 같은 명령으로 이어서 실행
+- 이미 현재 프리셋으로 최적화된 이미지(image_hashes 의 preset)는 --force 가 아니면 건너뜀
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from menu import snapshot
+from menu.image_jobs import optimize_file, swap_optimized
+from menu.models import Category, MenuItem, Restaurant, SiteSettings
+
+MODELS = (SiteSettings, Category, MenuItem)
+
+
+def _reoptimize(task):
+    """워커 프로세스: 파일 하나 최적화 (DB 는 사용하지 않음)"""
+    source_name, max_width, quality, responsive = task
+    try:
+        return optimize_file(default_storage, source_name, max_width, quality, responsive), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _needs_work(instance, field_name, force):
+    name = getattr(instance, field_name).name
+    if not name:
+        return False
+    if force:
+        return True
+    preset = list(type(instance).IMAGE_PRESETS[field_name])
+    if (instance.image_hashes or {}).get(field_name, {}).get('preset') != preset:
+        return True
+    if field_name in type(instance).RESPONSIVE_FIELDS:
+        return (instance.image_variants or {}).get(field_name, {}).get('src') != name
+    return False
+
+
+class Command(BaseCommand):
+    help = 'Re-encodes stored images with the current presets on a process pool, resumably.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--restaurant', action='append', dest='restaurants', default=[],
+            help='Restaurant slug (repeatable). Defaults to all restaurants.'
+        )
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Encoding processes.')
+        parser.add_argument('--batch', type=int, default=50, help='Rows per worker batch and DB transaction.')
+        parser.add_argument(
+            '--checkpoint', default='reoptimize-checkpoint.json',
+            help='Progress file used to resume after an interruption.'
+        )
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint.')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Re-encode images already optimized with the current preset.'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch'] < 1 or options['workers'] < 1:
+            raise CommandError("--batch and --workers must be at least 1.")
+
+        restaurant_ids = None
+        if options['restaurants']:
+            restaurants = Restaurant.objects.filter(slug__in=options['restaurants'])
+            missing = set(options['restaurants']) - {r.slug for r in restaurants}
+            if missing:
+                raise CommandError(f"Unknown restaurant slug(s): {', '.join(sorted(missing))}")
+            restaurant_ids = [r.pk for r in restaurants]
+
+        checkpoint_path = options['checkpoint']
+        signature = self._signature(options)
+        done = self._load_checkpoint(checkpoint_path, signature, options['restart'])
+
+        # 워커 프로세스로 DB 연결이 복제되지 않도록
+        connections.close_all()
+        # 워커는 spawn/forkserver 에서 이 모듈(모델 import 포함)을 다시 읽으므로 먼저 django.setup()
+        pool = (
+            ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup)
+            if options['workers'] > 1 else None
+        )
+
+        started = time.monotonic()
+        stats = {'processed': 0, 'replaced': 0, 'failed': 0, 'before': 0, 'after': 0}
+        try:
+            for Model in MODELS:
+                label = Model._meta.label_lower
+                queryset = Model.objects.filter(pk__gt=done.get(label, 0)).only(
+                    'pk', 'restaurant_id', 'image_hashes', 'image_variants', *Model.IMAGE_PRESETS,
+                ).order_by('pk')
+                if restaurant_ids is not None:
+                    queryset = queryset.filter(restaurant_id__in=restaurant_ids)
+
+                batch = []
+                for instance in queryset.iterator(chunk_size=options['batch']):
+                    batch.append(instance)
+                    if len(batch) >= options['batch']:
+                        if self._run_batch(Model, batch, pool, options, stats):
+                            self._report(stats, started)
+                        done[label] = batch[-1].pk
+                        self._save_checkpoint(checkpoint_path, signature, done)
+                        batch = []
+                if batch:
+                    if self._run_batch(Model, batch, pool, options, stats):
+                        self._report(stats, started)
+                    done[label] = batch[-1].pk
+                    self._save_checkpoint(checkpoint_path, signature, done)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                f"Interrupted. Run the same command again to resume from {checkpoint_path}."
+            ))
+            return
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        elapsed = time.monotonic() - started
+        saved = stats['before'] - stats['after']
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {stats['processed']} image(s) in {elapsed:.1f}s "
+            f"({stats['processed'] / elapsed if elapsed else 0:.1f} images/s), "
+            f"{stats['replaced']} replaced, {stats['failed']} failed, {saved / 1024:.1f} KB saved."
+        ))
+
+    def _run_batch(self, Model, instances, pool, options, stats):
+        """배치 하나 처리 -> 처리한 이미지 수"""
+        work = [
+            (instance, field_name)
+            for instance in instances
+            for field_name in Model.IMAGE_PRESETS
+            if _needs_work(instance, field_name, options['force'])
+        ]
+        if not work:
+            return 0
+
+        tasks = [
+            (getattr(instance, field_name).name, *Model.IMAGE_PRESETS[field_name], field_name in Model.RESPONSIVE_FIELDS)
+            for instance, field_name in work
+        ]
+        results = pool.map(_reoptimize, tasks) if pool is not None else map(_reoptimize, tasks)
+
+        changed = {}
+        with transaction.atomic():
+            for (instance, field_name), (result, error) in zip(work, results):
+                stats['processed'] += 1
+                source_name = getattr(instance, field_name).name
+                if error:
+                    stats['failed'] += 1
+                    self.stdout.write(self.style.NOTICE(f"{Model._meta.label_lower}#{instance.pk}.{field_name}: {error}"))
+                    continue
+                if swap_optimized(Model, instance, field_name, source_name, result, default_storage):
+                    stats['replaced'] += 1
+                    stats['before'] += result['before']
+                    stats['after'] += result['after']
+                    # 같은 행의 다음 필드가 방금 기록한 해시/파생본을 덮어쓰지 않도록
+                    instance.refresh_from_db(fields=['image_hashes', 'image_variants'])
+                    changed.setdefault(instance.pk, (instance, set()))[1].add(field_name)
+
+        # queryset.update 는 시그널이 없으므로 캐시 무효화
+        if Model is SiteSettings:
+            # 테마 해시(사이드 이미지 URL) 재계산 + 테넌트 캐시 무효화는 save() 에서
+            for pk, (instance, fields) in changed.items():
+                SiteSettings.objects.get(pk=pk).save(update_fields=sorted(fields))
+        else:
+            for restaurant_id in {instance.restaurant_id for instance, _ in changed.values()}:
+                snapshot.invalidate(restaurant_id)
+        return len(work)
+
+    def _report(self, stats, started):
+        elapsed = time.monotonic() - started
+        rate = stats['processed'] / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{stats['processed']} processed ({rate:.1f} images/s), {stats['replaced']} replaced, "
+            f"{(stats['before'] - stats['after']) / 1024:.1f} KB saved"
+        )
+
+    def _signature(self, options):
+        """프리셋/파생본 설정이나 대상이 바뀌면 체크포인트를 버리기 위한 서명"""
+        config = [
+            {Model._meta.label_lower: Model.IMAGE_PRESETS for Model in MODELS},
+            list(getattr(settings, 'IMAGE_VARIANT_WIDTHS', ())),
+            list(getattr(settings, 'IMAGE_VARIANT_FORMATS', ())),
+            sorted(options['restaurants']),
+            options['force'],
+        ]
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def _load_checkpoint(self, path, signature, restart):
+        if restart or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('signature') != signature:
+            self.stdout.write(self.style.WARNING("Checkpoint was written with different settings; starting over."))
+            return {}
+        self.stdout.write(self.style.NOTICE(f"Resuming from {path}: {data['done']}"))
+        return data['done']
+
+    def _save_checkpoint(self, path, signature, done):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': signature, 'done': done}, f, sort_keys=True)
+        os.replace(tmp_path, path)
@@ -0,0 +1,251 @@
+"""
+내용 주소 미디어 파일(storage.py)의 참조 수 관리
+
+- 모델 인스턴스가 DB 에서 읽힐 때의 파일 이름을 기억해 두고 (post_init),
+  저장 시 바뀐 필드만 새 파일 +1 / 이전 파일 -1 (post_save), 삭제 시 모두 -1 (post_delete)
+- JSON 필드에 기록된 파일(반응형 파생본 image_variants, 폰트 서브셋 font_subsets)도 같은 방식으로 계산
+- queryset.update 로 파일 필드를 바꾸는 곳(image_jobs.py)은 retain/release 를 직접 호출
+- 참조 수가 0 이 되어도 바로 지우지 않음: 같은 내용이 곧 다시 업로드될 수 있으므로
+  manage.py media_gc 가 유예 시간이 지난 것만 삭제
+"""
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db.models import F, FileField
+from django.utils import timezone
+
+from .fonts import subset_names
+from .storage import is_content_addressed
+
+# 참조 수가 0 이 된 뒤 실제로 지우기까지의 유예 시간
+DEFAULT_GRACE = timedelta(hours=24)
+
+_file_fields = {}
+
+
+def file_fields(model):
+    fields = _file_fields.get(model)
+    if fields is None:
+        fields = _file_fields[model] = tuple(
+            f for f in model._meta.concrete_fields if isinstance(f, FileField)
+        )
+    return fields
+
+
+def _name(value):
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else (value.name or '')
+
+
+def variant_names(variants):
+    """image_variants 값에 기록된 파생본 파일 이름"""
+    names = set()
+    for entry in (variants or {}).values():
+        for items in entry.get('sets', {}).values():
+            names.update(name for _, name in items if name != entry.get('src'))
+    return names
+
+
+# 파일 이름이 기록되는 JSON 필드 -> 이름 추출 함수
+JSON_REFERENCES = {
+    'image_variants': variant_names,
+    'font_subsets': subset_names,
+}
+
+
+def _json_names(instance):
+    """JSON 필드별 참조 파일 이름 (지연 로딩된 필드는 제외)"""
+    return {
+        field: names(instance.__dict__[field])
+        for field, names in JSON_REFERENCES.items()
+        if field in instance.__dict__
+    }
+
+
+def remember(instance):
+    """DB 에 저장된 상태의 파일 이름 기록 (지연 로딩된 필드는 제외)"""
+    if instance.pk is None:
+        instance._media_names = {}
+        instance._media_json = {}
+        return
+    instance._media_names = {
+        f.attname: _name(instance.__dict__[f.attname])
+        for f in file_fields(type(instance))
+        if f.attname in instance.__dict__
+    }
+    instance._media_json = _json_names(instance)
+
+
+def retain(name):
+    if not is_content_addressed(name):
+        return
+    MediaBlob = apps.get_model('menu', 'MediaBlob')
+    updated = MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1, updated_at=timezone.now())
+    if not updated:
+        try:
+            size = default_storage.size(name)
+        except OSError:
+            size = 0
+        blob, created = MediaBlob.objects.get_or_create(name=name, defaults={'size': size, 'refcount': 1})
+        if not created:
+            MediaBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') + 1, updated_at=timezone.now())
+
+
+def retain_counts(counts):
+    """
+    여러 파일의 참조 수를 한 번에 증가 (bulk_create 로 만든 객체용, tenant_archive.py)
+    counts: {파일 이름: 증가량}
+    """
+    MediaBlob = apps.get_model('menu', 'MediaBlob')
+    names = [name for name in counts if is_content_addressed(name)]
+    now = timezone.now()
+    for start in range(0, len(names), 500):
+        chunk = names[start:start + 500]
+        existing = set(MediaBlob.objects.filter(name__in=chunk).values_list('name', flat=True))
+        by_count = {}
+        for name in existing:
+            by_count.setdefault(counts[name], []).append(name)
+        for count, group in by_count.items():
+            MediaBlob.objects.filter(name__in=group).update(refcount=F('refcount') + count, updated_at=now)
+
+        missing = []
+        for name in chunk:
+            if name in existing:
+                continue
+            try:
+                size = default_storage.size(name)
+            except OSError:
+                size = 0
+            missing.append(MediaBlob(name=name, size=size, refcount=counts[name]))
+        MediaBlob.objects.bulk_create(missing, ignore_conflicts=True)
+
+
+def release(name):
+    if not is_content_addressed(name):
+        return
+    MediaBlob = apps.get_model('menu', 'MediaBlob')
+    MediaBlob.objects.filter(name=name, refcount__gt=0).update(
+        refcount=F('refcount') - 1, updated_at=timezone.now(),
+    )
+
+
+def update_references(instance, created, update_fields=None):
+    """post_save: 바뀐 파일 필드의 참조 수 갱신"""
+    loaded = {} if created else getattr(instance, '_media_names', {})
+    for field in file_fields(type(instance)):
+        if update_fields is not None and field.name not in update_fields:
+            continue
+        if not created and field.attname not in loaded:
+            # 지연 로딩(defer)된 필드: 이전 값을 모르므로 건드리지 않음
+            continue
+        old = loaded.get(field.attname, '')
+        current = _name(instance.__dict__.get(field.attname))
+        if current != old:
+            retain(current)
+            release(old)
+
+    loaded_json = {} if created else getattr(instance, '_media_json', {})
+    for field, current in _json_names(instance).items():
+        if update_fields is not None and field not in update_fields:
+            continue
+        if not created and field not in loaded_json:
+            continue
+        old = loaded_json.get(field, set())
+        for name in current - old:
+            retain(name)
+        for name in old - current:
+            release(name)
+    remember(instance)
+
+
+def release_all(instance):
+    """post_delete: 인스턴스가 참조하던 파일 모두 -1"""
+    loaded = getattr(instance, '_media_names', {})
+    for field in file_fields(type(instance)):
+        release(loaded.get(field.attname, _name(instance.__dict__.get(field.attname))))
+    loaded_json = {**_json_names(instance), **getattr(instance, '_media_json', {})}
+    for names in loaded_json.values():
+        for name in names:
+            release(name)
+
+
+def is_referenced(name):
+    """파일 필드 중 하나라도 name 을 가리키는지 (기존 이름 파일 정리 전 확인용, 전체 테이블 검색)"""
+    return any(
+        model.objects.filter(**{field.attname: name}).exists()
+        for model in apps.get_app_config('menu').get_models()
+        for field in file_fields(model)
+    )
+
+
+def discard(storage, name):
+    """
+    저장했지만 쓰이지 않게 된 파일 정리
+    내용 주소 파일은 다른 객체와 공유될 수 있으므로 기록만 남기고 media_gc 에 맡김
+    """
+    if not name:
+        return
+    if not is_content_addressed(name):
+        storage.delete(name)
+        return
+    MediaBlob = apps.get_model('menu', 'MediaBlob')
+    if not MediaBlob.objects.filter(name=name).update(updated_at=timezone.now()):
+        try:
+            size = storage.size(name)
+        except OSError:
+            size = 0
+        MediaBlob.objects.get_or_create(name=name, defaults={'size': size, 'refcount': 0})
+
+
+def rebuild():
+    """
+    모든 파일 필드를 훑어 참조 수를 다시 계산 (media_gc --rebuild)
+    반환: {파일 이름: 참조 수}
+    """
+    MediaBlob = apps.get_model('menu', 'MediaBlob')
+    counts = {}
+    for model in apps.get_app_config('menu').get_models():
+        for field in file_fields(model):
+            for name in model.objects.exclude(**{field.attname: ''}).exclude(
+                **{f'{field.attname}__isnull': True}
+            ).values_list(field.attname, flat=True).iterator():
+                if is_content_addressed(name):
+                    counts[name] = counts.get(name, 0) + 1
+        for field, names in JSON_REFERENCES.items():
+            if not any(f.name == field for f in model._meta.concrete_fields):
+                continue
+            for value in model.objects.values_list(field, flat=True).iterator():
+                for name in names(value):
+                    if is_content_addressed(name):
+                        counts[name] = counts.get(name, 0) + 1
+
+    MediaBlob.objects.exclude(name__in=list(counts)).update(refcount=0)
+    for name, count in counts.items():
+        updated = MediaBlob.objects.filter(name=name).update(refcount=count)
+        if not updated and default_storage.exists(name):
+            MediaBlob.objects.create(name=name, size=default_storage.size(name), refcount=count)
+    return counts
+
+
+def collect(grace, dry_run=False):
+    """
+    참조 수가 0 이고 grace(timedelta) 이상 지난 파일 삭제
+    반환: (삭제한 파일 수, 확보한 바이트)
+    """
+    MediaBlob = apps.get_model('menu', 'MediaBlob')
+    cutoff = timezone.now() - grace
+    removed = freed = 0
+    for blob in MediaBlob.objects.filter(refcount__lte=0, updated_at__lt=cutoff).iterator():
+        if dry_run:
+            removed += 1
+            freed += blob.size
+            continue
+        # 검사와 삭제 사이에 다시 참조된 경우는 지우지 않음
+        if MediaBlob.objects.filter(pk=blob.pk, refcount__lte=0).delete()[0]:
+            default_storage.delete(blob.name)
+            removed += 1
+            freed += blob.size
+    return removed, freed
+
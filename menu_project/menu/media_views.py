@@ -0,0 +1,153 @@
+"""
+업로드 미디어 파일 서빙 (/media/<path>)
+
+- 강한 ETag / Last-Modified 와 조건부 요청(304)
+- HTTP Range (단일 구간) 지원: iOS 의 동영상 재생/탐색은 206 응답이 필요
+- 내용 해시 이름(storage.is_content_addressed)은 1년 immutable 캐시, 기존 파일은 MEDIA_CACHE_MAX_AGE
+- MEDIA_ACCEL_MODE 가 'nginx' / 'sendfile' 이면 파일 전송은 웹 서버에 맡기고 헤더만 응답
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .storage import is_content_addressed
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def _etag(name, stat):
+    if is_content_addressed(name):
+        # 이름이 곧 내용 해시
+        return f'"{posixpath.splitext(posixpath.basename(name))[0]}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """
+    'bytes=0-499' -> (0, 499)
+    형식이 다르거나 여러 구간이면 None (전체 응답), 범위를 벗어나면 ValueError (416)
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    start, end = match.groups()
+    if start == '':
+        # 'bytes=-500': 마지막 500 바이트
+        length = int(end)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _file_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    modified = parse_http_date_safe(value)
+    return modified is not None and int(mtime) <= modified
+
+
+@require_safe
+def serve_media(request, path):
+    name = posixpath.normpath(path).lstrip('/')
+    if name.startswith('..') or name == '.':
+        raise Http404("파일을 찾을 수 없습니다.")
+    try:
+        full_path = default_storage.path(name)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404("파일을 찾을 수 없습니다.")
+    if not os.path.isfile(full_path):
+        raise Http404("파일을 찾을 수 없습니다.")
+
+    etag = _etag(name, stat)
+    last_modified = http_date(stat.st_mtime)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': last_modified,
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': (
+            'public, max-age=31536000, immutable' if is_content_addressed(name)
+            else f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}"
+        ),
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(name)
+    content_type = content_type or 'application/octet-stream'
+
+    mode = getattr(settings, 'MEDIA_ACCEL_MODE', '')
+    if mode:
+        # 웹 서버가 파일을 보냄 (Range 도 웹 서버가 처리)
+        response = HttpResponse(content_type=content_type)
+        if mode == 'nginx':
+            prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+        else:
+            response['X-Sendfile'] = full_path
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    size = stat.st_size
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            for header, value in headers.items():
+                response[header] = value
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _file_range(full_path, start, end - start + 1), status=206, content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    if encoding:
+        response['Content-Encoding'] = encoding
+    for header, value in headers.items():
+        response[header] = value
+    return response
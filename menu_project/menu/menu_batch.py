@@ -0,0 +1,221 @@
+"""
+관리자 대시보드 일괄 작업 (admin_views.menu_batch, JSON)
+
+- 여러 작업을 한 번에 받아 메모리에서 적용한 뒤 bulk_update 한 번으로 저장 (한 트랜잭션)
+  save() 를 거치지 않으므로 이미지 최적화/폰트 예약/캐시 무효화는 필요한 것만 직접 처리
+- 작업 (id 는 메뉴 id):
+    {"op": "priority", "id": 1, "priority": 2.5}
+    {"op": "reorder", "id": 1, "before": 7}   (또는 "after": 7) 7번 메뉴 앞/뒤로 이동 (드래그 앤 드롭)
+    {"op": "available", "id": 1, "value": false}   (value 가 없으면 반전)
+    {"op": "price", "id": 1, "price": "16,000"}
+    {"op": "category", "id": 1, "category": 12}   (null 이면 미분류)
+- 순서 변경은 앞뒤 메뉴 우선순위의 중간값(FloatField)을 주므로 보통 한 행만 바뀜
+  간격이 PRIORITY_EPSILON 보다 좁아지면 그 카테고리의 우선순위를 1, 2, 3 ... 으로 다시 매김
+"""
+import math
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import fonts, snapshot
+from .models import Category, MenuItem
+
+MAX_OPERATIONS = 500
+PRIORITY_EPSILON = 1e-6
+
+# 불러오는 필드 (bulk_update 대상이 지연 로딩되어 행마다 다시 읽지 않도록)
+LOAD_FIELDS = ('id', 'restaurant_id', 'category_id', 'name', 'priority', 'is_available', 'price', 'updated_at')
+
+
+def _sort_key(item):
+    return (item.priority, item.name, item.pk)
+
+
+class Batch:
+    def __init__(self, restaurant, item_ids, category_ids):
+        self.restaurant = restaurant
+        self.items = {
+            item.pk: item
+            for item in MenuItem.objects.select_for_update().filter(
+                restaurant=restaurant, pk__in=item_ids,
+            ).only(*LOAD_FIELDS)
+        }
+        self.categories = set(
+            Category.objects.filter(restaurant=restaurant, pk__in=category_ids).values_list('pk', flat=True)
+        )
+        self.changed = {}
+        self.siblings = {}
+        self.rebalanced = set()
+
+    def item(self, pk):
+        item = self.items.get(pk)
+        if item is None:
+            raise ValueError(f"메뉴를 찾을 수 없습니다: {pk}")
+        return item
+
+    def set(self, item, field, value):
+        if getattr(item, field) != value:
+            setattr(item, field, value)
+            self.changed.setdefault(item.pk, set()).add(field)
+
+    def siblings_of(self, category_id):
+        """카테고리의 메뉴 목록 (우선순위, 이름 순, 이미 불러온 객체는 재사용)"""
+        siblings = self.siblings.get(category_id)
+        if siblings is None:
+            siblings = []
+            for item in MenuItem.objects.select_for_update().filter(
+                restaurant=self.restaurant, category_id=category_id,
+            ).only(*LOAD_FIELDS):
+                siblings.append(self.items.setdefault(item.pk, item))
+            # 이 배치에서 이미 다른 카테고리로 옮긴 메뉴는 제외, 옮겨 온 메뉴는 포함
+            siblings = [item for item in siblings if item.category_id == category_id]
+            loaded = {item.pk for item in siblings}
+            siblings += [
+                item for item in self.items.values()
+                if item.category_id == category_id and item.pk not in loaded
+            ]
+            siblings.sort(key=_sort_key)
+            self.siblings[category_id] = siblings
+        return siblings
+
+    def move_category(self, item, category_id):
+        if item.category_id == category_id:
+            return
+        old = self.siblings.get(item.category_id)
+        if old is not None and item in old:
+            old.remove(item)
+        self.set(item, 'category_id', category_id)
+        new = self.siblings.get(category_id)
+        if new is not None:
+            new.append(item)
+            new.sort(key=_sort_key)
+
+    def reorder(self, item, target, before):
+        """item 을 target 바로 앞(before)/뒤로 (target 의 카테고리로 옮김)"""
+        if item is target:
+            return
+        self.move_category(item, target.category_id)
+        siblings = self.siblings_of(target.category_id)
+        if item in siblings:
+            siblings.remove(item)
+
+        priority = self._between(siblings, target, before)
+        if priority is None:
+            self._rebalance(target.category_id, siblings)
+            priority = self._between(siblings, target, before)
+        self.set(item, 'priority', priority)
+        siblings.append(item)
+        siblings.sort(key=_sort_key)
+
+    def _between(self, siblings, target, before):
+        index = siblings.index(target)
+        if before:
+            prev_item, next_item = (siblings[index - 1] if index > 0 else None), target
+        else:
+            prev_item, next_item = target, (siblings[index + 1] if index + 1 < len(siblings) else None)
+        if prev_item is None:
+            return next_item.priority - 1.0
+        if next_item is None:
+            return prev_item.priority + 1.0
+        if next_item.priority - prev_item.priority < PRIORITY_EPSILON:
+            return None
+        return (prev_item.priority + next_item.priority) / 2
+
+    def _rebalance(self, category_id, siblings):
+        """현재 순서를 유지하며 우선순위를 1, 2, 3 ... 으로"""
+        for position, sibling in enumerate(siblings, start=1):
+            self.set(sibling, 'priority', float(position))
+        self.rebalanced.add(category_id)
+
+    def save(self):
+        if not self.changed:
+            return 0
+        now = timezone.now()
+        instances = [self.items[pk] for pk in self.changed]
+        fields = set().union(*self.changed.values())
+        for instance in instances:
+            instance.updated_at = now
+        MenuItem.objects.bulk_update(instances, sorted(fields | {'updated_at'}), batch_size=500)
+        return len(instances)
+
+
+def _number(value, name):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 값이 올바르지 않습니다: {value!r}")
+    if not math.isfinite(number):
+        raise ValueError(f"{name} 값이 올바르지 않습니다: {value!r}")
+    return number
+
+
+def _pk(value, name='id'):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} 값이 올바르지 않습니다: {value!r}")
+    return value
+
+
+def apply_operations(restaurant, operations):
+    """
+    작업 목록을 한 트랜잭션으로 적용 (하나라도 잘못되면 아무것도 바꾸지 않음, ValueError)
+    반환: {'updated': 바뀐 메뉴 수, 'rebalanced': 우선순위를 다시 매긴 카테고리 수}
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations 목록이 필요합니다.")
+    if len(operations) > MAX_OPERATIONS:
+        raise ValueError(f"한 번에 최대 {MAX_OPERATIONS}개까지 처리할 수 있습니다.")
+
+    item_ids, category_ids = set(), set()
+    for op in operations:
+        if not isinstance(op, dict):
+            raise ValueError("작업 형식이 올바르지 않습니다.")
+        item_ids.add(_pk(op.get('id')))
+        for key in ('before', 'after'):
+            if op.get(key) is not None:
+                item_ids.add(_pk(op[key], key))
+        if op.get('op') == 'category' and op.get('category') is not None:
+            category_ids.add(_pk(op['category'], 'category'))
+
+    with transaction.atomic():
+        batch = Batch(restaurant, item_ids, category_ids)
+        price_changed = False
+        for op in operations:
+            kind = op.get('op')
+            item = batch.item(op['id'])
+            if kind == 'priority':
+                batch.set(item, 'priority', _number(op.get('priority'), 'priority'))
+                if item.category_id in batch.siblings:
+                    batch.siblings[item.category_id].sort(key=_sort_key)
+            elif kind == 'reorder':
+                before = op.get('before') is not None
+                target_pk = op['before'] if before else op.get('after')
+                if target_pk is None:
+                    raise ValueError("reorder 에는 before 또는 after 가 필요합니다.")
+                batch.reorder(item, batch.item(target_pk), before)
+            elif kind == 'available':
+                value = op.get('value', not item.is_available)
+                if not isinstance(value, bool):
+                    raise ValueError(f"value 값이 올바르지 않습니다: {value!r}")
+                batch.set(item, 'is_available', value)
+            elif kind == 'price':
+                price = op.get('price')
+                if not isinstance(price, str) or not price.strip():
+                    raise ValueError(f"price 값이 올바르지 않습니다: {price!r}")
+                batch.set(item, 'price', price.strip())
+                price_changed = True
+            elif kind == 'category':
+                category_id = op.get('category')
+                if category_id is not None and category_id not in batch.categories:
+                    raise ValueError(f"카테고리를 찾을 수 없습니다: {category_id}")
+                batch.move_category(item, category_id)
+            else:
+                raise ValueError(f"알 수 없는 작업입니다: {kind!r}")
+
+        updated = batch.save()
+        if updated:
+            # bulk_update 는 시그널이 없으므로 캐시 무효화 (가격에 새 글자가 있으면 폰트 서브셋도)
+            restaurant_id = restaurant.pk
+            transaction.on_commit(lambda: snapshot.invalidate(restaurant_id))
+            if price_changed:
+                transaction.on_commit(lambda: fonts.schedule_for_restaurant(restaurant_id))
+    return {'updated': updated, 'rebalanced': len(batch.rebalanced)}
@@ -1,6 +1,30 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.middleware.gzip import GZipMiddleware
 from django.utils.deprecation import MiddlewareMixin
-from .models import Restaurant
+from .tenants import get_tenant
+
+# 이미 압축된 형식: 다시 gzip 해도 줄지 않고 CPU 만 사용
+INCOMPRESSIBLE_TYPES = (
+    'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif',
+    'video/', 'audio/', 'font/woff', 'application/zip', 'application/pdf',
+)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware 에서 이미 압축된 미디어와 Range 를 지원하는 응답(Accept-Ranges, 206)은 제외
+    (Range 응답을 압축하면 Content-Range 와 바이트가 어긋나고, ETag 도 약한 ETag 로 바뀜.
+     전체 응답만 압축하면 이후 Range 요청이 압축 전 바이트 오프셋을 다른 ETag 로 받게 됨)
+    """
+    def process_response(self, request, response):
+        if (
+            response.status_code == 206
+            or response.has_header('Accept-Ranges')
+            or response.get('Content-Type', '').startswith(INCOMPRESSIBLE_TYPES)
+        ):
+            return response
+        return super().process_response(request, response)
+
 
 class RestaurantMiddleware(MiddlewareMixin):
     def process_view(self, request, view_func, view_args, view_kwargs):
@@ -10,13 +34,19 @@ class RestaurantMiddleware(MiddlewareMixin):
         # 시스템 경로나 정적 파일 등은 처리하지 않음 (성능 최적화)
         if request.path.startswith(('/static/', '/media/', '/admin/', '/favicon.ico')):
             request.restaurant = None
+            request.site_settings = None
             return None
         
         if slug:
-            # 해당 슬러그의 Restaurant 객체를 찾아서 request에 저장
-            # 없으면 404 에러 발생 (get_object_or_404)
-            request.restaurant = get_object_or_404(Restaurant, slug=slug)
+            # 해당 슬러그의 Restaurant/SiteSettings 를 캐시에서 찾아서 request에 저장
+            # 없으면 404 에러 발생 (존재하지 않는 slug 도 잠시 캐시되어 DB를 치지 않음)
+            tenant = get_tenant(slug)
+            if tenant is None:
+                raise Http404("매장을 찾을 수 없습니다.")
+            request.restaurant = tenant.restaurant
+            request.site_settings = tenant.site_settings
         else:
             request.restaurant = None
+            request.site_settings = None
             
         return None
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:43
+
+from django.db import migrations, models
+
+
+def build_tree(apps, schema_editor):
+    Category = apps.get_model('menu', 'Category')
+    categories = {c.pk: c for c in Category.objects.all()}
+
+    counts = {}
+    for c in categories.values():
+        if c.parent_id:
+            counts[c.parent_id] = counts.get(c.parent_id, 0) + 1
+
+    def compute(c, seen=()):
+        parent = categories.get(c.parent_id)
+        if parent is None or c.pk in seen:
+            return f"{c.pk}/", 0
+        parent_path, parent_depth = compute(parent, seen + (c.pk,))
+        return f"{parent_path}{c.pk}/", parent_depth + 1
+
+    for c in categories.values():
+        c.path, c.depth = compute(c)
+        c.child_count = counts.get(c.pk, 0)
+    Category.objects.bulk_update(categories.values(), ['path', 'depth', 'child_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0030_alter_menuitem_description_alter_menuitem_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='child_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='하위 카테고리 수'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='깊이'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255, verbose_name='경로'),
+        ),
+        migrations.RunPython(build_tree, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:45
+
+from django.db import migrations, models
+
+# 기존 행의 theme_hash 는 비워 두고 첫 렌더링 시 계산 (SiteSettings.refresh_theme_hash)
+# - 앱 코드(menu.theme)를 임포트하면 theme.py 가 바뀔 때 마이그레이션 결과도 달라짐
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0031_category_tree_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sitesettings',
+            name='theme_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16, verbose_name='테마 해시'),
+        ),
+    ]
@@ -0,0 +1,124 @@
+# 검색 백엔드(search_backends.py)용 DB 인덱스
+# - PostgreSQL: pg_trgm GIN 인덱스 + search_vector 생성 컬럼(tsvector) + GIN 인덱스
+# - SQLite: FTS5 trigram 가상 테이블 + 동기화 트리거
+#
+# pg_trgm 확장이 아직 없으면 TrigramExtension 이 CREATE EXTENSION 을 실행함
+# PostgreSQL 13+ 에서는 데이터베이스에 CREATE 권한이 있는 역할이면 되고 (trusted extension),
+# 그 이전 버전이나 권한이 없는 앱 계정이면 superuser 가 먼저 실행해야 함:
+#     psql -d <DB_NAME> -c 'CREATE EXTENSION IF NOT EXISTS pg_trgm'
+# (이미 설치되어 있으면 권한 없이 통과, 다른 DB 에서는 아무것도 하지 않음)
+#
+# SQL 은 이 시점의 것으로 고정 (search_backends.py 가 바뀌어도 마이그레이션 결과는 그대로)
+
+from django.contrib.postgres import operations
+from django.db import DatabaseError, migrations
+
+
+class TrigramExtension(operations.TrigramExtension):
+    """
+    되돌릴 때 pg_trgm 확장은 남겨 둠
+    (다른 앱/인덱스가 쓰고 있을 수 있고, Django 기본 구현은 SQLite 에서도 pg_extension 을 조회함)
+    """
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
+
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS menu_menuitem_name_trgm ON menu_menuitem USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS menu_menuitem_name_en_trgm ON menu_menuitem USING gin (name_en gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS menu_menuitem_description_trgm ON menu_menuitem USING gin (description gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS menu_category_name_trgm ON menu_category USING gin (name gin_trgm_ops)",
+    """
+    ALTER TABLE menu_menuitem ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(name_en, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS menu_menuitem_search_vector ON menu_menuitem USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS menu_menuitem_search_vector",
+    "ALTER TABLE menu_menuitem DROP COLUMN IF EXISTS search_vector",
+    "DROP INDEX IF EXISTS menu_category_name_trgm",
+    "DROP INDEX IF EXISTS menu_menuitem_description_trgm",
+    "DROP INDEX IF EXISTS menu_menuitem_name_en_trgm",
+    "DROP INDEX IF EXISTS menu_menuitem_name_trgm",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS menu_menuitem_fts USING fts5(
+        name, name_en, description,
+        content='menu_menuitem', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_menuitem_fts_ai AFTER INSERT ON menu_menuitem BEGIN
+        INSERT INTO menu_menuitem_fts(rowid, name, name_en, description)
+        VALUES (new.id, new.name, new.name_en, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_menuitem_fts_ad AFTER DELETE ON menu_menuitem BEGIN
+        INSERT INTO menu_menuitem_fts(menu_menuitem_fts, rowid, name, name_en, description)
+        VALUES ('delete', old.id, old.name, old.name_en, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_menuitem_fts_au AFTER UPDATE OF name, name_en, description ON menu_menuitem BEGIN
+        INSERT INTO menu_menuitem_fts(menu_menuitem_fts, rowid, name, name_en, description)
+        VALUES ('delete', old.id, old.name, old.name_en, old.description);
+        INSERT INTO menu_menuitem_fts(rowid, name, name_en, description)
+        VALUES (new.id, new.name, new.name_en, new.description);
+    END
+    """,
+    "INSERT INTO menu_menuitem_fts(menu_menuitem_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS menu_menuitem_fts_au",
+    "DROP TRIGGER IF EXISTS menu_menuitem_fts_ad",
+    "DROP TRIGGER IF EXISTS menu_menuitem_fts_ai",
+    "DROP TABLE IF EXISTS menu_menuitem_fts",
+]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+    elif vendor == 'sqlite':
+        try:
+            _run(schema_editor, SQLITE_FORWARD)
+        except DatabaseError:
+            # FTS5/trigram 을 지원하지 않는 SQLite 빌드 (검색은 icontains 로 대체됨)
+            _run(schema_editor, SQLITE_REVERSE)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_REVERSE)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0032_sitesettings_theme_hash'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0033_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageOptimizationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='모델')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='객체 ID')),
+                ('field_name', models.CharField(max_length=50, verbose_name='필드')),
+                ('source_name', models.CharField(max_length=255, verbose_name='원본 파일')),
+                ('result_name', models.CharField(blank=True, default='', max_length=255, verbose_name='최적화 파일')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '처리 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 예정 시각')),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '이미지 최적화 작업',
+                'verbose_name_plural': '이미지 최적화 작업',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='menu_imgjob_queue_idx')],
+            },
+        ),
+    ]
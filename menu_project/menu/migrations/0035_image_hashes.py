@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0034_image_optimization_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='image_hashes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='이미지 해시'),
+        ),
+        migrations.AddField(
+            model_name='menuitem',
+            name='image_hashes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='이미지 해시'),
+        ),
+        migrations.AddField(
+            model_name='sitesettings',
+            name='image_hashes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='이미지 해시'),
+        ),
+    ]
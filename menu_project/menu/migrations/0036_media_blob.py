@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0035_image_hashes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='파일')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='크기')),
+                ('refcount', models.IntegerField(default=0, verbose_name='참조 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '미디어 파일',
+                'verbose_name_plural': '미디어 파일',
+                'indexes': [models.Index(fields=['refcount', 'updated_at'], name='menu_mediablob_gc_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0036_media_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='이미지 파생본'),
+        ),
+        migrations.AddField(
+            model_name='menuitem',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='이미지 파생본'),
+        ),
+        migrations.AddField(
+            model_name='sitesettings',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='이미지 파생본'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0037_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sitesettings',
+            name='font_subsets',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='폰트 서브셋'),
+        ),
+    ]
@@ -1,10 +1,17 @@
 # menu/models.py
 
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.exceptions import ValidationError
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Greatest, Substr
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .utils import optimize_image
+from django.utils import timezone
+from .fonts import FONT_FIELDS
+from .theme import compile_theme, theme_hash
+from .utils import file_sha256
 
 class Restaurant(models.Model):
     """
@@ -33,7 +40,70 @@ def create_restaurant_settings(sender, instance, created, **kwargs):
     if created:
         SiteSettings.objects.create(restaurant=instance)
 
-class SiteSettings(models.Model):
+class OptimizedImagesMixin:
+    """
+    업로드된 이미지는 원본 그대로 저장하고, 최적화는 ImageOptimizationJob 으로 예약
+    IMAGE_PRESETS = {필드명: (최대 너비, JPEG 품질)}
+    image_hashes = {필드명: {'source': 업로드 원본 해시, 'sha256': 현재 파일 해시}}
+    (같은 이미지를 다시 올리면 새 파일을 만들지 않고 기존 파일을 그대로 사용)
+    RESPONSIVE_FIELDS 의 필드는 최적화 작업에서 너비별 AVIF/WebP 파생본도 생성
+    image_variants = {필드명: {'src': 원본 파일, 'w': 너비, 'h': 높이, 'sets': {포맷: [[너비, 파일], ...]}}}
+    (템플릿에서는 {% responsive_image %} 태그로 srcset 출력)
+    """
+    IMAGE_PRESETS = {}
+    RESPONSIVE_FIELDS = ()
+
+    def _new_image_uploads(self):
+        """
+        이번 save() 에서 새로 업로드된 (아직 저장되지 않은) 이미지 필드
+        가격 수정 등 이미지를 건드리지 않은 저장은 파일을 읽지도 않음
+        """
+        uploads = []
+        stored = None
+        for name in self.IMAGE_PRESETS:
+            field_file = getattr(self, name)
+            if not field_file or getattr(field_file, '_committed', True):
+                continue
+
+            digest = file_sha256(field_file)
+            if self.pk is not None:
+                if stored is None:
+                    stored = type(self).objects.filter(pk=self.pk).values(*self.IMAGE_PRESETS, 'image_hashes').first() or {}
+                previous = stored.get(name)
+                if previous and self._is_same_image(field_file.storage, previous, (stored.get('image_hashes') or {}).get(name), digest):
+                    # 같은 이미지를 다시 올린 경우: 저장된 (최적화된) 파일 유지
+                    setattr(self, name, previous)
+                    continue
+
+            hashes = (stored or {}).get('image_hashes') or self.image_hashes or {}
+            self.image_hashes = {**hashes, name: {'source': digest}}
+            # 이전 이미지의 파생본은 더 이상 쓰지 않음 (최적화 작업이 새로 만듦)
+            self.image_variants = {k: v for k, v in (self.image_variants or {}).items() if k != name}
+            uploads.append(name)
+        return uploads
+
+    @staticmethod
+    def _is_same_image(storage, stored_name, entry, digest):
+        if not storage.exists(stored_name):
+            return False
+        if entry:
+            return digest in (entry.get('source'), entry.get('sha256'))
+        # 해시 기록이 없는 기존 파일은 저장된 파일 내용과 비교
+        with storage.open(stored_name, 'rb') as f:
+            return file_sha256(f) == digest
+
+    def _queue_image_optimization(self, field_names):
+        for name in field_names:
+            ImageOptimizationJob.enqueue(self, name)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        # 다시 읽은 파일 이름을 참조 수 계산 기준으로 (media_refs.py)
+        from .media_refs import remember
+        remember(self)
+
+
+class SiteSettings(OptimizedImagesMixin, models.Model):
     """
     사이트 설정 모델 - 인트로 이미지 등을 관리
     """
@@ -148,6 +218,15 @@ class SiteSettings(models.Model):
     category_name_en_bold = models.BooleanField(default=False, verbose_name="카테고리명(영문) 볼드")
     category_name_en_italic = models.BooleanField(default=False, verbose_name="카테고리명(영문) 이탤릭")
     
+    # 컴파일된 테마 스타일시트의 내용 해시 (save() 시 자동 계산, /<slug>/theme/<hash>.css)
+    theme_hash = models.CharField(max_length=16, blank=True, default='', editable=False, verbose_name="테마 해시")
+    # 이미지 필드별 내용 해시 (OptimizedImagesMixin 참고)
+    image_hashes = models.JSONField(default=dict, blank=True, editable=False, verbose_name="이미지 해시")
+    # 반응형 이미지 파생본 (srcset, OptimizedImagesMixin 참고)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="이미지 파생본")
+    # 텍스트 역할별 WOFF2 폰트 서브셋 (menu/fonts.py)
+    font_subsets = models.JSONField(default=dict, blank=True, editable=False, verbose_name="폰트 서브셋")
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -158,16 +237,55 @@ class SiteSettings(models.Model):
     def __str__(self):
         return f"사이트 설정 - {self.created_at.strftime('%Y-%m-%d')}"
     
+    IMAGE_PRESETS = {
+        'logo_image': (192, 90),
+        'intro_image': (1200, 85),
+        'side_image': (800, 85),
+    }
+    RESPONSIVE_FIELDS = ('intro_image',)
+
     def save(self, *args, **kwargs):
-        if self.logo_image:
-            self.logo_image = optimize_image(self.logo_image, max_width=192, quality=90)
-        if self.intro_image:
-            self.intro_image = optimize_image(self.intro_image, max_width=1200, quality=85)
-        if self.side_image:
-            self.side_image = optimize_image(self.side_image, max_width=800, quality=85)
+        uploads = self._new_image_uploads() + self._new_font_uploads()
         super().save(*args, **kwargs)
 
-class Category(models.Model):
+        # 업로드된 파일의 최종 이름(URL)이 정해진 뒤에 테마 해시 계산
+        if self.refresh_theme_hash():
+            super().save(update_fields=['theme_hash'])
+
+        # 이미지 최적화 + 폰트 서브셋 생성 예약
+        self._queue_image_optimization(uploads)
+
+    def refresh_theme_hash(self):
+        """
+        현재 설정으로 테마 해시를 다시 계산, 바뀌었으면 True (저장은 호출한 쪽에서)
+        """
+        new_hash = theme_hash(compile_theme(self))
+        if new_hash == self.theme_hash:
+            return False
+        self.theme_hash = new_hash
+        return True
+
+    def _new_font_uploads(self):
+        """
+        새로 업로드된 폰트 필드 (서브셋 생성 예약 대상)
+        바뀌었거나 지워진 폰트의 서브셋 기록은 제거
+        """
+        uploads = []
+        for name in FONT_FIELDS:
+            field_file = getattr(self, name)
+            if field_file and not getattr(field_file, '_committed', True):
+                uploads.append(name)
+
+        subsets = self.font_subsets or {}
+        kept = {
+            role: entry for role, entry in subsets.items()
+            if f'{role}_font' not in uploads and getattr(self, f'{role}_font')
+        }
+        if kept != subsets:
+            self.font_subsets = kept
+        return uploads
+
+class Category(OptimizedImagesMixin, models.Model):
     """
     메뉴 카테고리 모델. 부모-자식 관계를 통해 계층 구조를 지원합니다.
     (예: 음료 > 커피 > 아이스 아메리카노)
@@ -197,12 +315,24 @@ class Category(models.Model):
         null=True,
         verbose_name="카테고리 이미지"
     )
+    # 이미지 필드별 내용 해시 (OptimizedImagesMixin 참고)
+    image_hashes = models.JSONField(default=dict, blank=True, editable=False, verbose_name="이미지 해시")
+    # 반응형 이미지 파생본 (srcset, OptimizedImagesMixin 참고)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="이미지 파생본")
     # 사이드 이미지 숨김 여부
     hide_side_image = models.BooleanField(
         default=False,
         verbose_name="사이드 이미지 숨기기",
         help_text="체크하면 이 카테고리에서 배경 이미지가 뒤로 숨겨집니다"
     )
+    # 트리 구조 (materialized path) - save()/삭제 시 자동으로 유지됨
+    # path: 최상위부터 자기 자신까지의 id 목록 (예: "3/17/42/")
+    path = models.CharField(max_length=255, blank=True, default='', db_index=True, editable=False, verbose_name="경로")
+    depth = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="깊이")
+    child_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="하위 카테고리 수")
+
+    # save() 에서 직접 관리하는 트리 필드 (일반 저장 시 덮어쓰지 않음)
+    TREE_FIELDS = ('path', 'depth', 'child_count')
 
     class Meta:
         verbose_name = "메뉴 카테고리"
@@ -215,12 +345,147 @@ class Category(models.Model):
             return f"{self.parent.name} > {self.name}"
         return self.name
     
+    def clean(self):
+        super().clean()
+        if self.pk and self.parent_id:
+            if self.parent_id == self.pk or str(self.pk) in self.parent.path.split('/'):
+                raise ValidationError({'parent': "자기 자신이나 하위 카테고리를 부모로 지정할 수 없습니다."})
+
+    IMAGE_PRESETS = {
+        'category_image': (600, 80),
+    }
+    RESPONSIVE_FIELDS = ('category_image',)
+
     def save(self, *args, **kwargs):
-        if self.category_image:
-            self.category_image = optimize_image(self.category_image, max_width=600, quality=80)
+        uploads = self._new_image_uploads()
+
+        update_fields = kwargs.get('update_fields')
+        is_new = self._state.adding
+        track_parent = is_new or update_fields is None or 'parent' in update_fields
+
+        stored = None
+        if not is_new:
+            # 오래된 인스턴스로 저장할 때 트리 필드가 덮어써지지 않도록 제외
+            if update_fields is None:
+                kwargs['update_fields'] = [
+                    f.name for f in self._meta.concrete_fields
+                    if not f.primary_key and f.name not in self.TREE_FIELDS
+                ]
+            if track_parent:
+                stored = Category.objects.filter(pk=self.pk).values('parent_id', 'path', 'depth').first()
+
+        moved = track_parent and (stored is None or stored['parent_id'] != self.parent_id)
+        if moved and stored and stored['path'] and self.parent_id:
+            parent_path = Category.objects.filter(pk=self.parent_id).values_list('path', flat=True).first() or ''
+            if parent_path.startswith(stored['path']):
+                raise ValueError("자기 자신이나 하위 카테고리를 부모로 지정할 수 없습니다.")
+
         super().save(*args, **kwargs)
 
-class MenuItem(models.Model):
+        if moved:
+            self._move(stored)
+
+        self._queue_image_optimization(uploads)
+
+    def _move(self, stored):
+        """부모가 바뀌었거나 새로 생성된 경우 경로/깊이/하위 개수 갱신"""
+        parent = None
+        if self.parent_id:
+            parent = Category.objects.filter(pk=self.parent_id).values('path', 'depth').first()
+        new_path = f"{parent['path'] if parent else ''}{self.pk}/"
+        new_depth = parent['depth'] + 1 if parent else 0
+
+        Category.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+
+        if stored:
+            old_path = stored['path']
+            if old_path and old_path != new_path:
+                # 하위 트리 전체의 경로 접두사와 깊이를 한 번에 변경
+                Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(new_path), Substr('path', len(old_path) + 1), output_field=models.CharField()),
+                    depth=F('depth') + (new_depth - stored['depth']),
+                )
+            if stored['parent_id']:
+                Category.objects.filter(pk=stored['parent_id']).update(
+                    child_count=Greatest(F('child_count') - 1, 0)
+                )
+        if self.parent_id:
+            Category.objects.filter(pk=self.parent_id).update(child_count=F('child_count') + 1)
+
+        self.path, self.depth = new_path, new_depth
+
+    # --- 트리 API ---
+
+    @property
+    def ancestor_ids(self):
+        """최상위부터 부모까지의 id 목록 (자기 자신 제외)"""
+        return [int(pk) for pk in self.path.split('/') if pk][:-1]
+
+    @property
+    def is_leaf(self):
+        return self.child_count == 0
+
+    @property
+    def has_children(self):
+        return self.child_count > 0
+
+    def get_ancestors(self, include_self=False):
+        """최상위 -> 부모 순서의 조상 카테고리 목록 (쿼리 1회)"""
+        ancestors = sorted(Category.objects.filter(pk__in=self.ancestor_ids), key=lambda c: c.depth)
+        if include_self:
+            ancestors.append(self)
+        return ancestors
+
+    def get_descendants(self, include_self=False):
+        """모든 하위 카테고리 queryset (path 접두사 인덱스 사용)"""
+        if not self.path:
+            return Category.objects.none()
+        qs = Category.objects.filter(path__startswith=self.path)
+        if not include_self:
+            qs = qs.exclude(pk=self.pk)
+        return qs
+
+    @classmethod
+    def rebuild_tree(cls, restaurant=None):
+        """
+        경로/깊이/하위 개수를 parent 관계로부터 다시 계산
+        (bulk_create 등 save()를 거치지 않은 변경 후 사용)
+        """
+        qs = cls.objects.all()
+        if restaurant is not None:
+            qs = qs.filter(restaurant=restaurant)
+        categories = {c.pk: c for c in qs.only('id', 'parent_id', *cls.TREE_FIELDS)}
+
+        counts = {}
+        for c in categories.values():
+            if c.parent_id:
+                counts[c.parent_id] = counts.get(c.parent_id, 0) + 1
+
+        def compute(c, seen=()):
+            parent = categories.get(c.parent_id)
+            if parent is None or c.pk in seen:
+                return f"{c.pk}/", 0
+            parent_path, parent_depth = compute(parent, seen + (c.pk,))
+            return f"{parent_path}{c.pk}/", parent_depth + 1
+
+        changed = []
+        for c in categories.values():
+            path, depth = compute(c)
+            child_count = counts.get(c.pk, 0)
+            if (c.path, c.depth, c.child_count) != (path, depth, child_count):
+                c.path, c.depth, c.child_count = path, depth, child_count
+                changed.append(c)
+        cls.objects.bulk_update(changed, list(cls.TREE_FIELDS), batch_size=500)
+        return len(changed)
+
+@receiver(post_delete, sender=Category)
+def decrement_parent_child_count(sender, instance, **kwargs):
+    if instance.parent_id:
+        Category.objects.filter(pk=instance.parent_id).update(
+            child_count=Greatest(F('child_count') - 1, 0)
+        )
+
+class MenuItem(OptimizedImagesMixin, models.Model):
     """
     개별 메뉴 항목에 대한 모델
     """
@@ -258,6 +523,10 @@ class MenuItem(models.Model):
         null=True,
         verbose_name="메뉴 이미지"
     )
+    # 이미지 필드별 내용 해시 (OptimizedImagesMixin 참고)
+    image_hashes = models.JSONField(default=dict, blank=True, editable=False, verbose_name="이미지 해시")
+    # 반응형 이미지 파생본 (srcset, OptimizedImagesMixin 참고)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="이미지 파생본")
 
     # 7. 우선순위
     priority = models.FloatField(
@@ -280,8 +549,102 @@ class MenuItem(models.Model):
     def __str__(self):
         return self.name
     
+    IMAGE_PRESETS = {
+        'menu_image': (800, 80),
+    }
+    RESPONSIVE_FIELDS = ('menu_image',)
+
     def save(self, *args, **kwargs):
-        if self.menu_image:
-            self.menu_image = optimize_image(self.menu_image, max_width=800, quality=80)
+        uploads = self._new_image_uploads()
         super().save(*args, **kwargs)
-    
\ No newline at end of file
+        self._queue_image_optimization(uploads)
+
+
+class ImageOptimizationJob(models.Model):
+    """
+    이미지 최적화 작업 큐 (폰트 서브셋 생성도 같은 큐 사용, menu/fonts.py)
+    - 관리자 업로드 요청은 원본을 저장하고 바로 응답, 최적화는 manage.py process_image_jobs 가 처리
+    - 실패하면 지수 백오프로 재시도 (MAX_ATTEMPTS 회)
+    - settings.IMAGE_OPTIMIZATION_MODE = 'sync' 이면 저장 직후 같은 프로세스에서 실행 (테스트용)
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, '대기'),
+        (RUNNING, '처리 중'),
+        (DONE, '완료'),
+        (FAILED, '실패'),
+    ]
+    MAX_ATTEMPTS = 5
+
+    model = models.CharField(max_length=100, verbose_name="모델")  # 'menu.menuitem'
+    object_id = models.PositiveBigIntegerField(verbose_name="객체 ID")
+    field_name = models.CharField(max_length=50, verbose_name="필드")
+    # 예약 시점의 파일 이름 (처리 전에 다른 파일로 바뀌었으면 교체하지 않음)
+    source_name = models.CharField(max_length=255, verbose_name="원본 파일")
+    result_name = models.CharField(max_length=255, blank=True, default='', verbose_name="최적화 파일")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="상태")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="시도 횟수")
+    last_error = models.TextField(blank=True, default='', verbose_name="마지막 오류")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="실행 예정 시각")
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "이미지 최적화 작업"
+        verbose_name_plural = "이미지 최적화 작업"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='menu_imgjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}#{self.object_id}.{self.field_name} ({self.get_status_display()})"
+
+    @classmethod
+    def enqueue(cls, instance, field_name):
+        """instance 의 이미지 필드 최적화 예약 (같은 필드의 대기 중인 작업은 대체)"""
+        model = instance._meta.label_lower
+        cls.objects.filter(
+            model=model, object_id=instance.pk, field_name=field_name, status=cls.PENDING,
+        ).delete()
+        job = cls.objects.create(
+            model=model,
+            object_id=instance.pk,
+            field_name=field_name,
+            source_name=getattr(instance, field_name).name,
+        )
+        if getattr(settings, 'IMAGE_OPTIMIZATION_MODE', 'queue') == 'sync':
+            from .image_jobs import run_job
+            if run_job(job):
+                # 필드가 최적화 파일로 바뀌었으므로 호출한 쪽 인스턴스도 맞춰 줌
+                instance.refresh_from_db()
+        return job
+
+
+class MediaBlob(models.Model):
+    """
+    내용 해시 이름으로 저장된 미디어 파일과 참조 수 (storage.py, media_refs.py)
+    참조 수가 0 이 된 파일은 manage.py media_gc 가 유예 시간 후 삭제
+    """
+    name = models.CharField(max_length=255, unique=True, verbose_name="파일")
+    size = models.PositiveBigIntegerField(default=0, verbose_name="크기")
+    refcount = models.IntegerField(default=0, verbose_name="참조 수")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "미디어 파일"
+        verbose_name_plural = "미디어 파일"
+        indexes = [
+            models.Index(fields=['refcount', 'updated_at'], name='menu_mediablob_gc_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
+
@@ -0,0 +1,273 @@
+"""
+메뉴 QR 코드 이미지 생성/캐시
+
+- (메뉴 URL, 로고 내용 해시, 스타일 설정) 으로 만든 키로 PNG/SVG 를 메모리와 디스크에 캐시
+- 키가 파일명/URL 에 들어가므로 브라우저에서 영구 캐시 (immutable)
+- 로고나 접속 host 가 바뀌면 키가 바뀌어 새로 생성됨
+- 로고는 파일 경로로 받음 (모델 객체 없이 generate_table_qr 의 워커 프로세스에서도 사용)
+"""
+import base64
+import hashlib
+import os
+from io import BytesIO
+
+import qrcode
+from django.conf import settings
+from PIL import Image, ImageDraw
+from qrcode.image.styledpil import StyledPilImage
+from qrcode.image.styles.moduledrawers import CircleModuleDrawer
+
+# 스타일 설정 (바꾸면 키가 바뀌어 기존 캐시는 자동으로 버려짐)
+BOX_SIZE = 10
+BORDER = 4
+LOGO_RATIO = 0.25
+STYLE_VERSION = 'circle-v1'
+
+FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+# 메모리 캐시 최대 항목 수 (키, 포맷) -> bytes
+MAX_MEMORY_ENTRIES = 128
+
+_images = {}
+# 로고 경로 -> ((크기, 수정 시각), 내용 해시)
+_logo_hashes = {}
+# 로고 경로 -> ((크기, 수정 시각), 디코딩된 이미지)
+_logo_images = {}
+
+
+def _cache_dir():
+    return getattr(settings, 'QR_CACHE_DIR', os.path.join(settings.BASE_DIR, 'cache', 'qr'))
+
+
+def logo_path(site_settings):
+    """SiteSettings 의 로고 파일 경로 (없거나 로컬 파일이 아니면 None)"""
+    if site_settings is None or not site_settings.logo_image:
+        return None
+    try:
+        return site_settings.logo_image.path
+    except (NotImplementedError, ValueError):
+        return None
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def logo_hash(path):
+    """로고 파일 내용 해시 (파일 크기/수정 시각이 같으면 다시 읽지 않음)"""
+    if path is None:
+        return ''
+    signature = _signature(path)
+    if signature is None:
+        return ''
+
+    cached = _logo_hashes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    _logo_hashes[path] = (signature, digest.hexdigest())
+    return _logo_hashes[path][1]
+
+
+def qr_key(menu_url, logo=None):
+    """QR 이미지 캐시 키 (URL + 로고 내용 + 스타일)"""
+    source = '\n'.join([menu_url, logo_hash(logo), STYLE_VERSION, str(BOX_SIZE), str(BORDER)])
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+
+def _make_qr(menu_url):
+    # 로고 삽입을 위해 Error Correction H 사용
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        box_size=BOX_SIZE,
+        border=BORDER,
+    )
+    qr.add_data(menu_url)
+    qr.make(fit=True)
+    return qr
+
+
+def load_logo(path):
+    """
+    디코딩된 로고 이미지 (파일이 바뀌지 않았으면 이전 디코딩 결과 재사용)
+    반환된 이미지는 공유되므로 수정하지 말 것 (resize/convert 는 새 이미지를 만듦)
+    """
+    if path is None:
+        return None
+    signature = _signature(path)
+    if signature is None:
+        return None
+
+    cached = _logo_images.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        with Image.open(path) as logo:
+            logo.load()
+            image = logo.copy()
+    except Exception:
+        image = None
+    _logo_images[path] = (signature, image)
+    return image
+
+
+def _eye_positions(matrix_size):
+    return [
+        (0, 0),                 # 좌상단
+        (0, matrix_size - 7),   # 우상단
+        (matrix_size - 7, 0),   # 좌하단
+    ]
+
+
+def _logo_box(qr):
+    """로고가 덮는 영역 (모듈 단위 시작 위치, 크기) - StyledPilImage 와 같은 계산"""
+    total = (len(qr.modules) + BORDER * 2) * BOX_SIZE
+    logo_width_ish = int(total * LOGO_RATIO)
+    offset = int((int(total / 2) - int(logo_width_ish / 2)) / BOX_SIZE)
+    return offset, total // BOX_SIZE - offset * 2
+
+
+def render_png(menu_url, logo=None):
+    qr = _make_qr(menu_url)
+
+    # 스타일이 적용된 이미지 생성 (데이터 점은 원형 도트 적용)
+    img = qr.make_image(
+        image_factory=StyledPilImage,
+        module_drawer=CircleModuleDrawer(),
+        eye_drawer=CircleModuleDrawer(),  # 임시로 아무 도트나 찍어둠 (어차피 아래에서 덮어씀)
+        embedded_image=load_logo(logo),
+        embedded_image_ratio=LOGO_RATIO,
+    )
+
+    # PIL 이미지로 변환 (직접 그리기 위함)
+    img_pil = img.convert("RGB")
+    draw = ImageDraw.Draw(img_pil)
+
+    # 강제 원형 렌더링 (Force-Draw Circle Eyes)
+    for r, c in _eye_positions(len(qr.modules)):
+        # 픽셀 좌표 계산 (border와 box_size 반영)
+        x = (c + BORDER) * BOX_SIZE
+        y = (r + BORDER) * BOX_SIZE
+        width = 7 * BOX_SIZE
+
+        # 눈 영역을 배경색(흰색)으로 먼저 깨끗이 비움
+        draw.rectangle([x, y, x + width, y + width], fill="white")
+        # 외곽 원형 고리
+        draw.ellipse([x, y, x + width, y + width], outline="black", width=BOX_SIZE)
+        # 내부 원형 점 (3x3 영역)
+        dot_margin = 2 * BOX_SIZE
+        draw.ellipse([x + dot_margin, y + dot_margin, x + width - dot_margin, y + width - dot_margin], fill="black")
+
+    buffer = BytesIO()
+    img_pil.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def render_svg(menu_url, logo=None):
+    """
+    PNG 와 같은 모양의 SVG (모듈 단위 좌표, 데이터 점은 하나의 path)
+    로고는 덮이는 영역 크기로 줄인 PNG 를 data URI 로 삽입
+    """
+    qr = _make_qr(menu_url)
+    matrix_size = len(qr.modules)
+    size = matrix_size + BORDER * 2
+
+    logo = load_logo(logo)
+    logo_offset, logo_width = _logo_box(qr)
+
+    def in_eye(r, c):
+        return any(er <= r < er + 7 and ec <= c < ec + 7 for er, ec in _eye_positions(matrix_size))
+
+    def under_logo(r, c):
+        start = logo_offset - BORDER
+        return logo is not None and start <= r < start + logo_width and start <= c < start + logo_width
+
+    # 데이터 점: 길이 0 선분 + 둥근 끝(stroke-linecap) = 지름 1 원, 상대 좌표로 이어서 기록
+    dots = []
+    x, y = 0, 0.5
+    for r, row in enumerate(qr.modules):
+        for c, dark in enumerate(row):
+            if dark and not in_eye(r, c) and not under_logo(r, c):
+                cx, cy = c + BORDER + 0.5, r + BORDER + 0.5
+                dots.append(f'm{cx - x:g} {cy - y:g}h0')
+                x, y = cx, cy
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}">',
+        f'<rect width="{size}" height="{size}" fill="#fff"/>',
+        f'<path d="M0 .5{"".join(dots)}" stroke="#000" stroke-linecap="round"/>',
+    ]
+    for r, c in _eye_positions(matrix_size):
+        cx = c + BORDER + 3.5
+        cy = r + BORDER + 3.5
+        parts.append(f'<circle cx="{cx}" cy="{cy}" r="3" fill="none" stroke="#000" stroke-width="1"/>')
+        parts.append(f'<circle cx="{cx}" cy="{cy}" r="1.5"/>')
+
+    if logo is not None:
+        pixels = logo_width * BOX_SIZE
+        logo = logo.convert('RGBA').resize((pixels, pixels), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        logo.save(buffer, format='PNG', optimize=True)
+        data = base64.b64encode(buffer.getvalue()).decode()
+        parts.append(
+            f'<image x="{logo_offset}" y="{logo_offset}" width="{logo_width}" height="{logo_width}" '
+            f'href="data:image/png;base64,{data}"/>'
+        )
+
+    parts.append('</svg>')
+    return ''.join(parts).encode('utf-8')
+
+
+RENDERERS = {
+    'png': render_png,
+    'svg': render_svg,
+}
+
+
+def cache_path(key, fmt='png'):
+    return os.path.join(_cache_dir(), f'{key}.{fmt}')
+
+
+def get_qr_image(menu_url, logo=None, fmt='png'):
+    """
+    (키, 이미지 bytes) 반환 (logo 는 로고 파일 경로)
+    메모리 -> 디스크 -> 새로 생성 순서로 조회
+    """
+    key = qr_key(menu_url, logo)
+    data = _images.get((key, fmt))
+    if data is not None:
+        return key, data
+
+    path = cache_path(key, fmt)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        data = RENDERERS[fmt](menu_url, logo)
+        try:
+            os.makedirs(_cache_dir(), exist_ok=True)
+            # 다른 워커가 읽는 도중 반쯤 쓰인 파일을 보지 않도록 임시 파일 후 교체
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # 디스크 캐시는 선택 사항 (읽기 전용 파일시스템 등)
+            pass
+
+    if len(_images) >= MAX_MEMORY_ENTRIES:
+        _images.clear()
+    _images[(key, fmt)] = data
+    return key, data
@@ -0,0 +1,226 @@
+"""
+검색 백엔드
+
+search_api / search_redirect_view 는 get_search_backend() 를 통해 검색함
+settings.MENU_SEARCH_BACKEND 로 선택:
+- 'memory'     : 프로세스 메모리 인덱스 (search_index.py, 기본값)
+- 'database'   : DB 종류에 맞는 전문 검색 (PostgreSQL -> 'postgres', SQLite -> 'sqlite_fts')
+- 'postgres'   : pg_trgm GIN 인덱스 + search_vector(tsvector) 컬럼, 순위 정렬
+- 'sqlite_fts' : FTS5 가상 테이블 (트리거로 동기화, trigram 토크나이저)
+- 'icontains'  : 기존 LIKE '%q%' 검색 (비교/대체용)
+인덱스와 컬럼은 migrations/0033_search_indexes.py 에서 생성
+"""
+from django.conf import settings
+from django.db import connection, DatabaseError
+from django.db.models import Q
+
+from .models import Category, MenuItem
+from .search_index import get_search_index
+
+FTS_TABLE = 'menu_menuitem_fts'
+
+SQLITE_FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+        name, name_en, description,
+        content='menu_menuitem', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON menu_menuitem BEGIN
+        INSERT INTO {table}(rowid, name, name_en, description)
+        VALUES (new.id, new.name, new.name_en, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON menu_menuitem BEGIN
+        INSERT INTO {table}({table}, rowid, name, name_en, description)
+        VALUES ('delete', old.id, old.name, old.name_en, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF name, name_en, description ON menu_menuitem BEGIN
+        INSERT INTO {table}({table}, rowid, name, name_en, description)
+        VALUES ('delete', old.id, old.name, old.name_en, old.description);
+        INSERT INTO {table}(rowid, name, name_en, description)
+        VALUES (new.id, new.name, new.name_en, new.description);
+    END
+    """,
+    "INSERT INTO {table}({table}) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS {table}_au",
+    "DROP TRIGGER IF EXISTS {table}_ad",
+    "DROP TRIGGER IF EXISTS {table}_ai",
+    "DROP TABLE IF EXISTS {table}",
+]
+
+
+def _execute_sqlite(conn, statements):
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql.replace('{table}', FTS_TABLE))
+
+
+def ensure_sqlite_fts(conn=None):
+    """
+    SQLite FTS5 테이블/트리거 생성 후 내용 재색인
+    (SQLite 는 ALTER 시 테이블을 다시 만들며 트리거가 사라지므로 post_migrate 에서도 호출)
+    FTS5/trigram 을 지원하지 않는 빌드면 False (검색은 icontains 로 대체됨)
+    """
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return False
+    try:
+        _execute_sqlite(conn, SQLITE_FTS_SQL)
+    except DatabaseError:
+        drop_sqlite_fts(conn)
+        return False
+    return True
+
+
+def drop_sqlite_fts(conn=None):
+    _execute_sqlite(conn or connection, SQLITE_FTS_DROP_SQL)
+
+
+
+def _in_order(queryset, ids):
+    """id 목록 순서대로 객체 반환 (쿼리 1회)"""
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+class IcontainsSearchBackend:
+    """기존 방식: 인덱스를 쓰지 못하는 icontains 검색"""
+
+    def search_categories(self, restaurant, query, limit=5):
+        return list(
+            Category.objects.filter(name__icontains=query, restaurant=restaurant)
+            .exclude(name__icontains='인트로')[:limit]
+        )
+
+    def search_menu_items(self, restaurant, query, limit=5, available_only=True):
+        qs = MenuItem.objects.filter(
+            Q(name__icontains=query) |
+            Q(name_en__icontains=query) |
+            Q(description__icontains=query),
+            restaurant=restaurant,
+        ).select_related('category')
+        if available_only:
+            qs = qs.filter(is_available=True)
+        return list(qs[:limit])
+
+
+class MemorySearchBackend(IcontainsSearchBackend):
+    """프로세스 메모리 인덱스 (판매 가능한 메뉴만 인덱싱되어 있음)"""
+
+    def search_categories(self, restaurant, query, limit=5):
+        index, _ = get_search_index(restaurant)
+        return [obj for _, _, obj in index.search(query, limit=limit, kind='category')]
+
+    def search_menu_items(self, restaurant, query, limit=5, available_only=True):
+        if not available_only:
+            return super().search_menu_items(restaurant, query, limit, available_only)
+        index, _ = get_search_index(restaurant)
+        return [obj for _, _, obj in index.search(query, limit=limit, kind='menu')]
+
+
+class PostgresSearchBackend(IcontainsSearchBackend):
+    """
+    PostgreSQL: ILIKE 는 gin_trgm_ops 인덱스로 처리되고,
+    오타는 trigram 유사도(%), 단어 검색은 search_vector 로 찾아 순위를 매김
+    """
+    MENU_SQL = """
+        SELECT id FROM menu_menuitem
+        WHERE restaurant_id = %(restaurant)s
+          {available}
+          AND (
+            name ILIKE %(like)s OR name_en ILIKE %(like)s OR description ILIKE %(like)s
+            OR name %% %(query)s
+            OR search_vector @@ plainto_tsquery('simple', %(query)s)
+          )
+        ORDER BY
+          (CASE WHEN name ILIKE %(prefix)s THEN 1 ELSE 0 END) DESC,
+          (ts_rank(search_vector, plainto_tsquery('simple', %(query)s))
+           + GREATEST(similarity(name, %(query)s), similarity(COALESCE(name_en, ''), %(query)s))) DESC,
+          priority, name
+        LIMIT %(limit)s
+    """
+
+    CATEGORY_SQL = """
+        SELECT id FROM menu_category
+        WHERE restaurant_id = %(restaurant)s
+          AND name ILIKE %(like)s
+          AND name NOT LIKE '%%인트로%%'
+        ORDER BY similarity(name, %(query)s) DESC, priority, name
+        LIMIT %(limit)s
+    """
+
+    @staticmethod
+    def _params(restaurant, query, limit):
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return {
+            'restaurant': restaurant.pk,
+            'query': query,
+            'like': f'%{escaped}%',
+            'prefix': f'{escaped}%',
+            'limit': limit,
+        }
+
+    def search_categories(self, restaurant, query, limit=5):
+        with connection.cursor() as cursor:
+            cursor.execute(self.CATEGORY_SQL, self._params(restaurant, query, limit))
+            ids = [row[0] for row in cursor.fetchall()]
+        return _in_order(Category.objects.all(), ids)
+
+    def search_menu_items(self, restaurant, query, limit=5, available_only=True):
+        sql = self.MENU_SQL.format(available='AND is_available' if available_only else '')
+        with connection.cursor() as cursor:
+            cursor.execute(sql, self._params(restaurant, query, limit))
+            ids = [row[0] for row in cursor.fetchall()]
+        return _in_order(MenuItem.objects.select_related('category'), ids)
+
+
+class SqliteFtsSearchBackend(IcontainsSearchBackend):
+    """
+    SQLite: FTS5 trigram 가상 테이블 + bm25 순위 (메뉴명 > 영문명 > 설명)
+    trigram 은 3글자 이상부터 검색 가능하므로 짧은 검색어는 icontains 로 처리
+    """
+    MENU_SQL = f"""
+        SELECT m.id FROM {FTS_TABLE} f
+        JOIN menu_menuitem m ON m.id = f.rowid
+        WHERE {FTS_TABLE} MATCH %s AND m.restaurant_id = %s {{available}}
+        ORDER BY bm25({FTS_TABLE}, 10.0, 5.0, 1.0), m.priority, m.name
+        LIMIT %s
+    """
+
+    def search_menu_items(self, restaurant, query, limit=5, available_only=True):
+        if len(query) < 3:
+            return super().search_menu_items(restaurant, query, limit, available_only)
+
+        match = '"{}"'.format(query.replace('"', '""'))
+        sql = self.MENU_SQL.format(available='AND m.is_available' if available_only else '')
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [match, restaurant.pk, limit])
+                ids = [row[0] for row in cursor.fetchall()]
+        except DatabaseError:
+            # FTS5 를 지원하지 않는 SQLite 빌드 (마이그레이션에서 테이블이 생성되지 않음)
+            return super().search_menu_items(restaurant, query, limit, available_only)
+        return _in_order(MenuItem.objects.select_related('category'), ids)
+
+
+BACKENDS = {
+    'memory': MemorySearchBackend,
+    'icontains': IcontainsSearchBackend,
+    'postgres': PostgresSearchBackend,
+    'sqlite_fts': SqliteFtsSearchBackend,
+}
+
+
+def get_search_backend(name=None):
+    name = name or getattr(settings, 'MENU_SEARCH_BACKEND', 'memory')
+    if name == 'database':
+        name = {'postgresql': 'postgres', 'sqlite': 'sqlite_fts'}.get(connection.vendor, 'icontains')
+    return BACKENDS[name]()
@@ -0,0 +1,311 @@
+"""
+레스토랑별 메모리 검색 인덱스 (search_api 타이핑 검색용)
+
+- 메뉴 스냅샷(snapshot.py)에서 만들어지므로 메뉴가 바뀌면 스냅샷과 함께 다시 생성
+- 문자 2-gram 역색인 + 한글 초성 역색인 (예: "ㅇㅅㅋ" -> "위스키")
+- 필드(메뉴명 > 영문명 > 설명)와 일치 위치(앞부분일수록 높음)로 순위 결정
+- 결과가 부족하면 메뉴명에 대해 제한된 편집 거리(오타 허용) 검색
+"""
+import heapq
+import unicodedata
+from collections import Counter
+from itertools import chain
+
+from .snapshot import get_snapshot
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+# 필드별 가중치
+FIELD_WEIGHTS = {
+    'name': 30,
+    'name_en': 20,
+    'description': 5,
+}
+
+# 오타 허용 검색 대상 필드 (설명은 제외)
+FUZZY_FIELDS = ('name', 'name_en')
+
+# 오타 허용 검색에서 편집 거리를 계산할 최대 문서 수
+MAX_FUZZY_CANDIDATES = 50
+
+# 인덱스별로 기억해 둘 최근 검색 결과 수 (타이핑 검색은 같은 접두어가 반복됨)
+MAX_CACHED_QUERIES = 512
+
+# 레스토랑 id -> (스냅샷, 인덱스)
+_indexes = {}
+
+
+def normalize(text):
+    """소문자 + 공백 제거 (NFC 정규화)"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFC', str(text)).lower()
+    return ''.join(text.split())
+
+
+def to_chosung(text):
+    """한글 음절을 초성으로 변환 (그 외 문자는 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSUNG[(code - HANGUL_BASE) // 588])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+def has_jamo(text):
+    return any(ch in CHOSUNG for ch in text)
+
+
+def bigrams(text):
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def pattern_masks(query):
+    """문자 -> query 에서 그 문자가 나오는 위치의 비트마스크"""
+    masks = {}
+    for i, ch in enumerate(query):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def substring_distance(query, text, limit, masks=None):
+    """
+    text 의 어떤 부분 문자열과 query 사이의 최소 편집 거리
+    (limit 를 넘으면 limit + 1 반환)
+
+    Myers 비트 병렬 알고리즘: 편집 거리 표의 한 열을 정수 비트로 표현하여
+    text 의 문자마다 몇 번의 정수 연산으로 처리 (같은 query 는 masks 재사용)
+    """
+    length = len(query)
+    if not length:
+        return 0
+    if masks is None:
+        masks = pattern_masks(query)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    # 첫 행이 0 (text 의 어느 위치에서든 매칭 시작 가능) 이므로 가로 방향 값은 위로 전파하지 않음
+    plus, minus = full, 0
+    score = best = length
+    for ch in text:
+        eq = masks.get(ch, 0)
+        xv = eq | minus
+        xh = (((eq & plus) + plus) ^ plus) | eq
+        h_plus = minus | (~(xh | plus) & full)
+        h_minus = plus & xh
+        if h_plus & last:
+            score += 1
+        elif h_minus & last:
+            score -= 1
+            if score < best:
+                best = score
+        h_plus = (h_plus << 1) & full
+        h_minus = (h_minus << 1) & full
+        plus = h_minus | (~(xv | h_plus) & full)
+        minus = h_plus & xv
+    return min(best, limit + 1)
+
+
+class Document:
+    __slots__ = ('kind', 'obj', 'fields', 'chosung')
+
+    def __init__(self, kind, obj, fields):
+        self.kind = kind
+        self.obj = obj
+        # [(필드명, 정규화된 텍스트)]
+        self.fields = fields
+        self.chosung = to_chosung(fields[0][1]) if fields else ''
+
+
+class SearchIndex:
+    """
+    한 레스토랑의 카테고리/메뉴 역색인
+    """
+
+    def __init__(self, categories, items):
+        self.documents = []
+        self.grams = {}
+        self.chosung_grams = {}
+        # 오타 허용 검색용 (메뉴명/영문명만): 2-gram, 문자
+        self.fuzzy_grams = {}
+        self.fuzzy_chars = {}
+        self.kinds = {'category': set(), 'menu': set()}
+        self.all_ids = set()
+        self._results = {}
+
+        for category in categories:
+            # 인트로 카테고리는 검색에서 제외
+            if '인트로' in (category.name or ''):
+                continue
+            self._add(Document('category', category, [('name', normalize(category.name))]))
+
+        for item in items:
+            fields = [
+                (field, normalize(getattr(item, field)))
+                for field in ('name', 'name_en', 'description')
+            ]
+            self._add(Document('menu', item, [f for f in fields if f[1]]))
+
+    def _add(self, document):
+        if not document.fields:
+            return
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        self.kinds[document.kind].add(doc_id)
+        self.all_ids.add(doc_id)
+        for field, text in document.fields:
+            for gram in bigrams(text):
+                self.grams.setdefault(gram, set()).add(doc_id)
+            if field in FUZZY_FIELDS:
+                for gram in bigrams(text):
+                    self.fuzzy_grams.setdefault(gram, set()).add(doc_id)
+                for ch in text:
+                    self.fuzzy_chars.setdefault(ch, set()).add(doc_id)
+        for gram in bigrams(document.chosung):
+            self.chosung_grams.setdefault(gram, set()).add(doc_id)
+
+    def _candidates(self, grams, index):
+        postings = [index.get(gram) for gram in grams]
+        if not postings or any(p is None for p in postings):
+            return set()
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def _position_bonus(position):
+        if position == 0:
+            return 10
+        return max(0, 5 - position // 4)
+
+    def _score(self, document, query):
+        best = 0
+        for field, text in document.fields:
+            position = text.find(query)
+            if position < 0:
+                continue
+            score = FIELD_WEIGHTS[field] + self._position_bonus(position)
+            if text == query:
+                score += 20
+            best = max(best, score)
+        return best
+
+    def _score_chosung(self, document, query):
+        position = document.chosung.find(query)
+        if position < 0:
+            return 0
+        return FIELD_WEIGHTS['name'] + self._position_bonus(position)
+
+    def _fuzzy_shared(self, query, limit):
+        """
+        편집 limit 회 이내로 query 와 일치할 수 있는 문서 -> 공유하는 2-gram/문자 수
+        (None 이면 걸러낼 수 없음: 모든 문서가 후보)
+
+        - 편집 1회는 2-gram 을 최대 2개, 문자를 최대 1개 깨뜨림
+        - "맥켈란"(2-gram 2개)처럼 짧은 query 는 2-gram 이 모두 깨질 수 있으므로 문자로 거름
+        """
+        keys = bigrams(query)
+        index = self.fuzzy_grams
+        required = len(keys) - 2 * limit
+        if required < 1:
+            keys = set(query)
+            index = self.fuzzy_chars
+            required = len(keys) - limit
+            if required < 1:
+                return None, 0
+        shared = Counter(chain.from_iterable(index.get(key, ()) for key in keys))
+        return shared, required
+
+    def _fuzzy(self, query, candidates_of_kind, exclude):
+        """메뉴명/영문명에서 오타 허용 검색 (길이 3 이상)"""
+        limit = 1 if len(query) <= 4 else 2
+        shared, required = self._fuzzy_shared(query, limit)
+        if shared is None:
+            candidates = sorted(candidates_of_kind - exclude)[:MAX_FUZZY_CANDIDATES]
+        else:
+            candidates = [
+                doc_id for doc_id, count in shared.items()
+                if count >= required and doc_id not in exclude and doc_id in candidates_of_kind
+            ]
+            candidates = heapq.nlargest(MAX_FUZZY_CANDIDATES, candidates, key=lambda doc_id: shared[doc_id])
+
+        masks = pattern_masks(query)
+        scored = []
+        for doc_id in candidates:
+            for field, text in self.documents[doc_id].fields:
+                if field not in FUZZY_FIELDS:
+                    continue
+                distance = substring_distance(query, text, limit, masks)
+                if distance <= limit:
+                    scored.append((FIELD_WEIGHTS[field] - 10 * distance, doc_id))
+                    break
+        return scored
+
+    def search(self, query, limit=None, kind=None):
+        """
+        [(점수, 종류, 객체)] 를 점수 순으로 반환
+        kind 를 주면 'category' 또는 'menu' 만 검색
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        key = (query, limit, kind)
+        cached = self._results.get(key)
+        if cached is None:
+            cached = tuple(self._search(query, limit, kind))
+            if len(self._results) >= MAX_CACHED_QUERIES:
+                self._results.clear()
+            self._results[key] = cached
+        return cached
+
+    def _search(self, query, limit, kind):
+        of_kind = self.kinds[kind] if kind else self.all_ids
+        scored = []
+        if has_jamo(query):
+            query = to_chosung(query)
+            for doc_id in self._candidates(bigrams(query), self.chosung_grams) & of_kind:
+                score = self._score_chosung(self.documents[doc_id], query)
+                if score:
+                    scored.append((score, doc_id))
+        else:
+            for doc_id in self._candidates(bigrams(query), self.grams) & of_kind:
+                score = self._score(self.documents[doc_id], query)
+                if score:
+                    scored.append((score, doc_id))
+
+            # 일치 결과가 부족할 때만 오타 허용 검색
+            if len(query) >= 3 and len(scored) < (limit or 5):
+                scored.extend(self._fuzzy(query, of_kind, {doc_id for _, doc_id in scored}))
+
+        # 점수 내림차순, 같은 점수는 원래(우선순위) 순서
+        def order(pair):
+            return (-pair[0], pair[1])
+
+        if limit is not None:
+            scored = heapq.nsmallest(limit, scored, key=order)
+        else:
+            scored.sort(key=order)
+        return [(score, self.documents[doc_id].kind, self.documents[doc_id].obj) for score, doc_id in scored]
+
+
+def get_search_index(restaurant):
+    """레스토랑 검색 인덱스 (스냅샷이 바뀔 때만 다시 생성)"""
+    snapshot = get_snapshot(restaurant)
+    cached = _indexes.get(snapshot.restaurant_id)
+    if cached is not None and cached[0] is snapshot:
+        return cached[1], snapshot
+
+    index = SearchIndex(snapshot.categories, snapshot.available_items)
+    _indexes[snapshot.restaurant_id] = (snapshot, index)
+    return index, snapshot
@@ -0,0 +1,83 @@
+"""
+클라이언트 검색용 매니페스트 (menu-common.js 의 로컬 타이핑 검색)
+
+- 레스토랑의 검색 대상 카테고리/메뉴를 압축된 JSON 하나로 만들어 브라우저가 한 번만 받음
+- 검색 키(정규화된 메뉴명/영문명/설명, 초성)는 서버 인덱스(search_index.py)와 같은 규칙으로 미리 계산
+- 내용 해시를 버전으로 URL 에 넣어 immutable 캐시, 스냅샷이 바뀌면 다시 생성
+"""
+import hashlib
+import json
+
+from .search_index import normalize, to_chosung
+from .snapshot import get_snapshot
+
+# 매니페스트 형식 버전 (필드 구성이 바뀌면 올려서 기존 브라우저 캐시를 무효화)
+FORMAT = 1
+
+# 레스토랑 id -> (스냅샷, SearchManifest)
+_manifests = {}
+
+
+class SearchManifest:
+    __slots__ = ('version', 'body')
+
+    def __init__(self, version, body):
+        self.version = version
+        self.body = body
+
+
+def format_price(price):
+    """숫자 가격은 ₩ 를 붙이고, '시가' 같은 문자열은 그대로"""
+    price_raw = str(price)
+    if price_raw.replace(',', '').replace('.', '', 1).isdigit():
+        return f"₩{price_raw}"
+    return price_raw
+
+
+def build_manifest(snapshot):
+    """
+    스냅샷 -> 매니페스트 JSON
+    c: [id, 이름, 검색 키, 초성, 검색 대상 여부(인트로 제외)]
+    m: [id, 이름, 카테고리 id, 가격, 이름 키, 영문명 키, 설명 키, 초성]
+    """
+    categories = []
+    for category in snapshot.categories:
+        key = normalize(category.name)
+        categories.append([
+            category.id,
+            category.name,
+            key,
+            to_chosung(key),
+            0 if '인트로' in (category.name or '') else 1,
+        ])
+
+    items = []
+    for item in snapshot.available_items:
+        key = normalize(item.name)
+        items.append([
+            item.id,
+            item.name,
+            item.category_id,
+            format_price(item.price),
+            key,
+            normalize(item.name_en),
+            normalize(item.description),
+            to_chosung(key),
+        ])
+
+    data = {'f': FORMAT, 'c': categories, 'm': items}
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    version = hashlib.sha256(body).hexdigest()[:16]
+    return SearchManifest(version, body)
+
+
+def get_search_manifest(restaurant):
+    """레스토랑 검색 매니페스트 (스냅샷이 바뀔 때만 다시 생성)"""
+    snapshot = get_snapshot(restaurant)
+    cached = _manifests.get(snapshot.restaurant_id)
+    if cached is not None and cached[0] is snapshot:
+        return cached[1]
+
+    manifest = build_manifest(snapshot)
+    _manifests[snapshot.restaurant_id] = (snapshot, manifest)
+    return manifest
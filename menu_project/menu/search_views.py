@@ -1,9 +1,10 @@
-from django.http import JsonResponse
-from django.db.models import Q
-from .models import Category, MenuItem
+from django.http import JsonResponse, HttpResponse, HttpResponseNotModified
+from .models import MenuItem
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.contrib import messages
+from .search_backends import get_search_backend
+from .search_manifest import format_price, get_search_manifest
 
 def search_redirect_view(request, restaurant_slug=None):
     query = request.GET.get('q', '').strip()
@@ -14,9 +15,10 @@ def search_redirect_view(request, restaurant_slug=None):
     # First, try to find an exact match (case-insensitive) in current restaurant
     menu_item = MenuItem.objects.filter(name__iexact=query, restaurant=request.restaurant).first()
 
-    # If no exact match, try a contains match
+    # If no exact match, take the best match from the search backend
     if not menu_item:
-        menu_item = MenuItem.objects.filter(name__icontains=query, restaurant=request.restaurant).first()
+        matches = get_search_backend().search_menu_items(request.restaurant, query, limit=1, available_only=False)
+        menu_item = matches[0] if matches else None
 
     if menu_item:
         # If the item has a category, redirect to the category list page
@@ -45,14 +47,13 @@ def search_api(request, restaurant_slug=None):
             # 프로필이 있는 유저라면 본인 가게로 강제 고정
             target_restaurant = request.user.profile.restaurant
 
+    # 검색 백엔드 (settings.MENU_SEARCH_BACKEND, 메뉴의 카테고리는 미리 로드되어 있음)
+    backend = get_search_backend()
+    categories = backend.search_categories(target_restaurant, query, limit=5)
+    menu_items = backend.search_menu_items(target_restaurant, query, limit=5)
+
     results = []
-    
-    # 카테고리 검색 (현재 레스토랑, 중복 방지, 인트로 카테고리 제외)
-    categories = Category.objects.filter(
-        Q(name__icontains=query),
-        restaurant=target_restaurant
-    ).exclude(name__icontains='인트로').distinct()[:5]
-    
+
     for category in categories:
         results.append({
             'type': 'category',
@@ -61,22 +62,8 @@ def search_api(request, restaurant_slug=None):
             'url': f'/{target_restaurant.slug}/category/{category.id}/'
         })
     
-    # 메뉴 검색 (현재 레스토랑, 중복 방지)
-    menu_items = MenuItem.objects.filter(
-        Q(name__icontains=query) | 
-        Q(name_en__icontains=query) | 
-        Q(description__icontains=query),
-        is_available=True,
-        restaurant=target_restaurant
-    ).distinct()[:5]
-    
     for item in menu_items:
-        price_raw = str(item.price)
-        cleaned_price_for_check = price_raw.replace(',', '')
-        if cleaned_price_for_check.replace('.', '', 1).isdigit():
-            price_formatted = f"₩{price_raw}"
-        else:
-            price_formatted = price_raw
+        price_formatted = format_price(item.price)
 
         results.append({
             'type': 'menu',
@@ -85,4 +72,25 @@ def search_api(request, restaurant_slug=None):
             'url': f'/{target_restaurant.slug}/category/{item.category.id}/#menu-{item.id}' if item.category else f'/{target_restaurant.slug}/#menu-{item.id}'
         })
     
-    return JsonResponse({'results': results[:8]})
\ No newline at end of file
+    return JsonResponse({'results': results[:8]})
+
+
+def search_manifest(request, version, restaurant_slug=None):
+    """
+    클라이언트 검색 매니페스트 (/<slug>/api/search/manifest/<version>.json)
+    - 버전이 현재 내용과 같으면 1년 immutable 캐시 + 강한 ETag
+    - 오래된 HTML 이 예전 버전을 요청하면 현재 매니페스트를 캐시 없이 반환
+    """
+    manifest = get_search_manifest(request.restaurant)
+    etag = f'"{manifest.version}"'
+
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(manifest.body, content_type='application/json; charset=utf-8')
+    response['ETag'] = etag
+    if version == manifest.version:
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,70 @@
+from django.db import connections
+from django.db.models.signals import post_init, post_save, post_delete, post_migrate
+from django.dispatch import receiver
+
+from . import fonts, media_refs, snapshot, tenants
+from .search_backends import ensure_sqlite_fts
+
+
+# 메뉴 스냅샷 무효화
+# (queryset.update / bulk_* 는 시그널이 발생하지 않으므로 호출하는 쪽에서 직접 invalidate 필요)
+@receiver(post_save, sender='menu.Category')
+@receiver(post_delete, sender='menu.Category')
+@receiver(post_save, sender='menu.MenuItem')
+@receiver(post_delete, sender='menu.MenuItem')
+@receiver(post_save, sender='menu.SiteSettings')
+@receiver(post_delete, sender='menu.SiteSettings')
+def invalidate_menu_snapshot(sender, instance, **kwargs):
+    snapshot.invalidate(instance.restaurant_id)
+
+
+# 테넌트(slug -> Restaurant/SiteSettings) 캐시 무효화
+@receiver(post_save, sender='menu.SiteSettings')
+@receiver(post_delete, sender='menu.SiteSettings')
+def invalidate_tenant_settings(sender, instance, **kwargs):
+    tenants.invalidate(restaurant_id=instance.restaurant_id)
+
+
+@receiver(post_save, sender='menu.Restaurant')
+@receiver(post_delete, sender='menu.Restaurant')
+def invalidate_restaurant_snapshot(sender, instance, **kwargs):
+    snapshot.invalidate(instance.pk)
+    # slug 변경 / 새로 생성된 slug 의 negative 캐시도 함께 제거
+    tenants.invalidate(restaurant_id=instance.pk, slug=instance.slug)
+
+
+# SQLite 는 ALTER 마이그레이션 시 테이블을 다시 만들어 FTS 트리거가 사라지므로 매번 복구
+@receiver(post_migrate)
+def restore_sqlite_fts(sender, using='default', **kwargs):
+    if sender.name == 'menu':
+        ensure_sqlite_fts(connections[using])
+
+
+# 내용 주소 미디어 파일 참조 수 (media_refs.py)
+@receiver(post_init, sender='menu.Category')
+@receiver(post_init, sender='menu.MenuItem')
+@receiver(post_init, sender='menu.SiteSettings')
+def remember_media_names(sender, instance, **kwargs):
+    media_refs.remember(instance)
+
+
+@receiver(post_save, sender='menu.Category')
+@receiver(post_save, sender='menu.MenuItem')
+@receiver(post_save, sender='menu.SiteSettings')
+def update_media_references(sender, instance, created, update_fields=None, **kwargs):
+    media_refs.update_references(instance, created, update_fields)
+
+
+@receiver(post_delete, sender='menu.Category')
+@receiver(post_delete, sender='menu.MenuItem')
+@receiver(post_delete, sender='menu.SiteSettings')
+def release_media_references(sender, instance, **kwargs):
+    media_refs.release_all(instance)
+
+
+# 메뉴 텍스트에 폰트 서브셋에 없는 글자가 생기면 서브셋 재생성 예약 (fonts.py)
+@receiver(post_save, sender='menu.Category')
+@receiver(post_save, sender='menu.MenuItem')
+def schedule_font_subsets(sender, instance, **kwargs):
+    fonts.schedule_for_text(instance)
+
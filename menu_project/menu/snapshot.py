@@ -0,0 +1,187 @@
+"""
+레스토랑별 메뉴 스냅샷 캐시
+
+- 카테고리 트리, 카테고리별 메뉴, 사이트 설정, 순환 네비게이션 순서를
+  한 번에 읽어서 불변(immutable) 객체로 보관
+- 관리자가 데이터를 수정하면 signals.py 의 post_save/post_delete 핸들러가 무효화
+- 같은 레스토랑에 대한 동시 캐시 미스는 하나의 빌드만 수행 (single-flight)
+"""
+import threading
+import time
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category, MenuItem, SiteSettings
+
+# 워커 프로세스 간 무효화 전파를 위해 버전 번호는 Django 캐시에 저장
+# (CACHES 가 공유 백엔드면 즉시, LocMem 이면 TTL 만료 시 반영)
+VERSION_KEY = 'menu:snapshot-version:{}'
+
+_snapshots = {}
+_build_locks = {}
+_registry_lock = threading.Lock()
+
+
+class MenuSnapshot:
+    """
+    한 레스토랑의 메뉴 데이터 묶음 (읽기 전용)
+    """
+    __slots__ = (
+        'restaurant_id', 'version', 'built_at', 'site_settings',
+        'categories', 'categories_by_id', 'top_categories', 'children',
+        'side_menu', 'items', 'available_items', 'nav_order', 'neighbours',
+    )
+
+    def __init__(self, restaurant_id, version, site_settings, categories, items):
+        set_ = object.__setattr__
+        set_(self, 'restaurant_id', restaurant_id)
+        set_(self, 'version', version)
+        set_(self, 'built_at', time.monotonic())
+        set_(self, 'site_settings', site_settings)
+
+        # 카테고리는 이미 (priority, name) 순으로 정렬되어 들어옴
+        children = {}
+        for cat in categories:
+            children.setdefault(cat.parent_id, []).append(cat)
+
+        categories_by_id = {cat.id: cat for cat in categories}
+        items_by_category = {}
+        for item in items:
+            if item.category_id is not None:
+                items_by_category.setdefault(item.category_id, []).append(item)
+                # item.category 접근 시 추가 쿼리가 없도록 미리 연결
+                if item.category_id in categories_by_id:
+                    item.category = categories_by_id[item.category_id]
+
+        set_(self, 'categories', tuple(categories))
+        set_(self, 'categories_by_id', MappingProxyType(categories_by_id))
+        set_(self, 'top_categories', tuple(children.get(None, ())))
+        set_(self, 'children', MappingProxyType({k: tuple(v) for k, v in children.items() if k is not None}))
+        set_(self, 'items', MappingProxyType({k: tuple(v) for k, v in items_by_category.items()}))
+        # 카테고리 없는 메뉴 포함, 판매 가능한 전체 메뉴 (우선순위 순)
+        set_(self, 'available_items', tuple(items))
+
+        # 사이드 메뉴: (최상위 카테고리, 하위 카테고리들) 목록
+        set_(self, 'side_menu', tuple(
+            (cat, self.children.get(cat.id, ())) for cat in self.top_categories
+        ))
+
+        # 순환 네비게이션: 판매 가능한 메뉴가 있는 최하위 카테고리 (카테고리 정렬 순서 유지)
+        # 하위 카테고리가 있는 카테고리는 메뉴 페이지가 아니므로 제외
+        nav_order = tuple(
+            cat.id for cat in categories
+            if cat.id in items_by_category and cat.id not in children
+        )
+        set_(self, 'nav_order', nav_order)
+
+        # 카테고리 id -> (이전 id, 다음 id) 를 미리 계산해 두어 조회는 O(1)
+        neighbours = {}
+        if len(nav_order) > 1:
+            for index, cat_id in enumerate(nav_order):
+                neighbours[cat_id] = (nav_order[index - 1], nav_order[(index + 1) % len(nav_order)])
+        set_(self, 'neighbours', MappingProxyType(neighbours))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('MenuSnapshot is immutable')
+
+    def get_category(self, category_id):
+        return self.categories_by_id.get(category_id)
+
+    def get_children(self, category_id):
+        return self.children.get(category_id, ())
+
+    def get_items(self, category_id):
+        return self.items.get(category_id, ())
+
+    def get_breadcrumb_path(self, category):
+        """카테고리의 전체 경로 (최상위 -> 현재), materialized path(Category.ancestor_ids) 기준"""
+        if category.path:
+            ancestors = [self.categories_by_id.get(pk) for pk in category.ancestor_ids]
+            if None not in ancestors:
+                return ancestors + [category]
+        # 경로가 아직 계산되지 않은 카테고리 (rebuild_tree 전) 는 parent 를 따라감
+        path = []
+        current = category
+        while current is not None:
+            path.insert(0, current)
+            current = self.categories_by_id.get(current.parent_id)
+        return path
+
+    def get_neighbours(self, category_id):
+        """순환 리스트 기준 (이전, 다음) 카테고리. 목록에 없거나 혼자면 (None, None)"""
+        pair = self.neighbours.get(category_id)
+        if pair is None:
+            return None, None
+        return self.categories_by_id[pair[0]], self.categories_by_id[pair[1]]
+
+
+def _current_version(restaurant_id):
+    return cache.get(VERSION_KEY.format(restaurant_id), 0)
+
+
+def _build(restaurant_id, version):
+    site_settings = SiteSettings.objects.filter(restaurant_id=restaurant_id).first()
+    # 0032 마이그레이션 이전부터 있던 행은 theme_hash 가 비어 있음 -> 첫 렌더링 시 계산
+    # (signals 를 거치지 않도록 update 로 저장: 스냅샷 무효화 불필요)
+    if site_settings is not None and not site_settings.theme_hash and site_settings.refresh_theme_hash():
+        SiteSettings.objects.filter(pk=site_settings.pk).update(theme_hash=site_settings.theme_hash)
+    categories = list(
+        Category.objects.filter(restaurant_id=restaurant_id).order_by('priority', 'name')
+    )
+    items = list(
+        MenuItem.objects.filter(
+            restaurant_id=restaurant_id,
+            is_available=True,
+        ).order_by('priority', 'name')
+    )
+    return MenuSnapshot(restaurant_id, version, site_settings, categories, items)
+
+
+def _is_fresh(snapshot, version):
+    if snapshot is None or snapshot.version != version:
+        return False
+    ttl = getattr(settings, 'MENU_SNAPSHOT_TTL', 60)
+    return ttl is None or time.monotonic() - snapshot.built_at < ttl
+
+
+def get_snapshot(restaurant):
+    """
+    레스토랑의 메뉴 스냅샷 반환 (캐시가 따뜻하면 DB 쿼리 없음)
+    """
+    restaurant_id = restaurant.pk if hasattr(restaurant, 'pk') else restaurant
+    version = _current_version(restaurant_id)
+
+    snapshot = _snapshots.get(restaurant_id)
+    if _is_fresh(snapshot, version):
+        return snapshot
+
+    with _registry_lock:
+        lock = _build_locks.setdefault(restaurant_id, threading.Lock())
+
+    with lock:
+        # 대기하는 동안 다른 스레드가 이미 만들었을 수 있음
+        version = _current_version(restaurant_id)
+        snapshot = _snapshots.get(restaurant_id)
+        if _is_fresh(snapshot, version):
+            return snapshot
+
+        snapshot = _build(restaurant_id, version)
+        # 빌드 중에 무효화가 일어났다면 저장하지 않음 (다음 요청에서 다시 빌드)
+        if _current_version(restaurant_id) == version:
+            _snapshots[restaurant_id] = snapshot
+        return snapshot
+
+
+def invalidate(restaurant_id):
+    """레스토랑 스냅샷 무효화 (버전 증가)"""
+    if restaurant_id is None:
+        return
+    key = VERSION_KEY.format(restaurant_id)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+    _snapshots.pop(restaurant_id, None)
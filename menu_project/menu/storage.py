@@ -0,0 +1,78 @@
+"""
+내용 주소(content-addressed) 미디어 저장소
+
+- 업로드 파일 이름을 내용의 SHA-256 으로 정함: fonts/<sha256>.ttf, menu_images/<sha256>.png
+- 같은 파일을 여러 레스토랑에서 올리거나 다시 올려도 한 번만 저장 (중복 제거)
+- 이름이 내용과 함께 바뀌므로 URL 을 브라우저에서 영구 캐시 가능 (is_content_addressed)
+- 파일 삭제는 참조 수(MediaBlob, media_refs.py)를 보고 manage.py media_gc 가 처리
+"""
+import os
+import posixpath
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+from .utils import file_sha256
+
+CONTENT_NAME_RE = re.compile(r'(^|/)[0-9a-f]{64}(\.[A-Za-z0-9]+)?$')
+
+
+def is_content_addressed(name):
+    """내용 해시로 저장된 파일 이름인지 (기존 업로드 파일은 False)"""
+    return bool(name) and bool(CONTENT_NAME_RE.search(name))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # 최종 이름은 _save 에서 내용 해시로 결정하므로 무작위 접미사를 붙이지 않음
+        return name
+
+    def _save(self, name, content):
+        """
+        임시 파일에 쓴 뒤 해시 이름으로 하드 링크 (지원하지 않으면 rename)
+        이미 있으면 (다른 프로세스가 같은 내용을 동시에 저장한 경우 포함) 기존 파일을 그대로 사용
+        (FileSystemStorage._save 는 FileExistsError 시 get_available_name 으로 다시 시도하므로 쓰지 않음)
+        """
+        digest = file_sha256(content)
+        ext = posixpath.splitext(name)[1].lower()
+        name = posixpath.join(posixpath.dirname(name), f'{digest}{ext}')
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            return name
+
+        directory = os.path.dirname(full_path)
+        if self.directory_permissions_mode is not None:
+            # makedirs 의 mode 는 umask 영향을 받으므로 잠시 해제 (FileSystemStorage 와 동일)
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                content.seek(0)
+                for chunk in content.chunks():
+                    f.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp_path, self.file_permissions_mode)
+            try:
+                os.link(tmp_path, full_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                # 하드 링크를 지원하지 않는 파일시스템 (EPERM/ENOTSUP: 일부 네트워크/FUSE 마운트 등)
+                # 임시 파일이 같은 디렉터리에 있으므로 rename 으로 원자적으로 교체
+                # (이름이 같으면 내용도 같으므로 동시에 저장된 파일을 덮어써도 무방)
+                os.replace(tmp_path, full_path)
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+        return name
@@ -0,0 +1,112 @@
+from django import template
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from ..search_manifest import get_search_manifest
+from ..snapshot import get_snapshot
+from ..utils import VARIANT_FORMATS
+
+register = template.Library()
+
+# 레스토랑 id -> (스냅샷, 렌더링된 사이드 메뉴 HTML)
+# 스냅샷이 새로 만들어지면 (카테고리 변경 등) 자동으로 다시 렌더링됨
+_side_menu_cache = {}
+
+
+@register.simple_tag(takes_context=True)
+def side_menu(context):
+    """
+    사이드 메뉴 HTML 조각 (레스토랑 스냅샷 버전당 한 번만 렌더링)
+    현재 카테고리 강조(current 클래스)만 요청마다 문자열 치환으로 적용
+    """
+    request = context['request']
+    restaurant = request.restaurant
+    snapshot = get_snapshot(restaurant)
+
+    cached = _side_menu_cache.get(restaurant.pk)
+    if cached is not None and cached[0] is snapshot:
+        html = cached[1]
+    else:
+        html = render_to_string('menu/_side_menu.html', {
+            'restaurant': restaurant,
+            'side_menu': snapshot.side_menu,
+        })
+        _side_menu_cache[restaurant.pk] = (snapshot, html)
+
+    category = context.get('category')
+    if category is not None:
+        marker = f'data-category-id="{category.id}"'
+        html = html.replace(marker, f'{marker} class="current"', 1)
+    return mark_safe(html)
+
+
+@register.simple_tag(takes_context=True)
+def search_manifest_url(context):
+    """현재 버전의 검색 매니페스트 URL (menu-common.js 가 한 번만 받아 로컬에서 검색)"""
+    restaurant = context['request'].restaurant
+    manifest = get_search_manifest(restaurant)
+    return reverse('menu:search_manifest', args=[restaurant.slug, manifest.version])
+
+
+@register.simple_tag
+def responsive_image(obj, field_name, sizes='100vw', alt='', loading='lazy', **attrs):
+    """
+    이미지 필드를 <picture> (AVIF/WebP srcset + 원본 포맷 <img>) 로 출력
+    {% responsive_image item 'menu_image' sizes='100vw' alt=item.name class='menu-only-image' %}
+    파생본이 아직 없으면 (최적화 대기 중, 기존 데이터) 일반 <img>
+    """
+    field_file = getattr(obj, field_name, None)
+    if not field_file:
+        return ''
+    storage = field_file.storage
+    entry = (getattr(obj, 'image_variants', None) or {}).get(field_name)
+    extra = format_html_join('', ' {}="{}"', sorted(attrs.items()))
+
+    if not entry or entry.get('src') != field_file.name:
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async"{}>',
+            field_file.url, alt, loading, extra,
+        )
+
+    def srcset(items):
+        return ', '.join(f'{storage.url(name)} {width}w' for width, name in items)
+
+    sets = entry['sets']
+    fallback = next(key for key in ('jpeg', 'png') if key in sets)
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (VARIANT_FORMATS[key][1], srcset(sets[key]), sizes)
+            for key in ('avif', 'webp') if key in sets
+        ),
+    )
+    return format_html(
+        '<picture class="responsive-picture">{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" '
+        'alt="{}" loading="{}" decoding="async"{}></picture>',
+        sources, field_file.url, srcset(sets[fallback]), sizes, entry['w'], entry['h'],
+        alt, loading, extra,
+    )
+
+
+
+@register.simple_tag
+def thumbnail_url(obj, field_name, width=80):
+    """
+    목록용 작은 썸네일 URL: width 이상인 가장 작은 파생본 (WebP > 원본 포맷 순)
+    파생본이 아직 없으면 원본 URL
+    """
+    field_file = getattr(obj, field_name, None)
+    if not field_file:
+        return ''
+    entry = (getattr(obj, 'image_variants', None) or {}).get(field_name)
+    if not entry or entry.get('src') != field_file.name:
+        return field_file.url
+    sets = entry['sets']
+    key = next((key for key in ('webp', 'jpeg', 'png') if key in sets), None)
+    if key is None:
+        return field_file.url
+    items = sorted(sets[key])
+    _, name = next((item for item in items if item[0] >= width), items[-1])
+    return field_file.storage.url(name)
@@ -0,0 +1,458 @@
+"""
+레스토랑 단위 내보내기/가져오기 (manage.py export_restaurant / import_restaurant)
+
+- dumpdata/loaddata 대신 한 레스토랑의 Restaurant, SiteSettings, Category 트리, MenuItem 만 이동
+- tar 아카이브 (.tar.gz / .tgz 면 gzip), 순서대로 스트리밍으로 쓰고 읽음
+    manifest.json   형식 버전, 레스토랑 slug/이름
+    media/<경로>     참조하는 미디어 파일, 내용 해시 이름으로 한 번씩만 (예: media/menu_images/<sha256>.jpg)
+    records.jsonl   한 줄에 객체 하나 {"model", "pk", "fields", "media": {원래 파일 이름: 아카이브 안 경로}}
+                    (부모 카테고리가 자식보다 먼저 나오도록 depth, path 순)
+- 가져오기는 BATCH_SIZE 건씩 bulk_create 하고 pk/외래 키는 새 pk 로 재매핑 (메모리는 pk 매핑 크기만큼)
+- bulk_create 는 시그널이 없으므로 트리 필드, 미디어 참조 수, 테마 해시는 적재 후 직접 계산
+- 관리자 계정(UserProfile)과 작업 큐 등 설치 환경에 속한 데이터는 옮기지 않음
+- clone_restaurant: 같은 레코드 흐름으로 DB 안에서 바로 복제 (미디어는 복사하지 않고 같은 파일 참조)
+  기존(내용 해시가 아닌) 이름의 파일은 먼저 내용 해시 이름으로 하드 링크하고 원본/복제본 모두 그 이름을 참조
+  (기존 이름 파일은 최적화 교체 시 바로 삭제되므로 공유하면 안 됨, media_refs.discard)
+"""
+import io
+import json
+import os
+import posixpath
+import shutil
+import tarfile
+import tempfile
+import time
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import validate_slug
+from django.db import transaction
+from django.db.models import FileField
+from django.utils import timezone
+
+from . import media_refs, snapshot, tenants
+from .storage import is_content_addressed
+from .theme import compile_theme, theme_hash
+from .utils import file_sha256
+
+FORMAT_VERSION = 1
+BATCH_SIZE = 500
+
+# 적재 순서 (앞의 모델이 뒤의 모델의 외래 키 대상)
+MODELS = ('menu.restaurant', 'menu.sitesettings', 'menu.category', 'menu.menuitem')
+
+MEDIA_PREFIX = 'media/'
+
+
+def _querysets(restaurant):
+    Restaurant = apps.get_model('menu', 'Restaurant')
+    SiteSettings = apps.get_model('menu', 'SiteSettings')
+    Category = apps.get_model('menu', 'Category')
+    MenuItem = apps.get_model('menu', 'MenuItem')
+    return [
+        Restaurant.objects.filter(pk=restaurant.pk),
+        SiteSettings.objects.filter(restaurant=restaurant).order_by('pk'),
+        Category.objects.filter(restaurant=restaurant).order_by('depth', 'path', 'pk'),
+        MenuItem.objects.filter(restaurant=restaurant).order_by('pk'),
+    ]
+
+
+def media_names(instance):
+    """인스턴스가 참조하는 미디어 파일 이름 (파일 필드 + image_variants/font_subsets)"""
+    names = set()
+    for field in media_refs.file_fields(type(instance)):
+        name = getattr(instance, field.attname).name
+        if name:
+            names.add(name)
+    for field, extract in media_refs.JSON_REFERENCES.items():
+        if hasattr(instance, field):
+            names.update(extract(getattr(instance, field)))
+    return names
+
+
+def serialize(instance):
+    """인스턴스 -> 레코드 (트리 필드처럼 가져올 때 다시 계산하는 값은 제외)"""
+    skip = getattr(type(instance), 'TREE_FIELDS', ())
+    fields = {}
+    for field in instance._meta.concrete_fields:
+        if field.primary_key or field.name in skip:
+            continue
+        value = field.value_from_object(instance)
+        if isinstance(field, FileField):
+            value = value.name or ''
+        fields[field.attname] = value
+    return {
+        'model': instance._meta.label_lower,
+        'pk': instance.pk,
+        'fields': fields,
+        'media': sorted(media_names(instance)),
+    }
+
+
+def iter_records(restaurant):
+    """레스토랑의 모든 레코드를 적재 순서대로 (BATCH_SIZE 건씩 읽음)"""
+    for queryset in _querysets(restaurant):
+        for instance in queryset.iterator(chunk_size=BATCH_SIZE):
+            yield serialize(instance)
+
+
+def content_name(storage, name):
+    """
+    파일의 내용 해시 이름 (예: menu_images/<sha256>.jpg)
+    이미 내용 주소 이름이면 그대로, 기존 업로드 파일은 내용을 읽어 계산
+    """
+    if is_content_addressed(name):
+        return name
+    with storage.open(name, 'rb') as f:
+        digest = file_sha256(f)
+    return posixpath.join(posixpath.dirname(name), f'{digest}{posixpath.splitext(name)[1].lower()}')
+
+
+def _add_bytes(tar, arcname, data):
+    info = tarfile.TarInfo(arcname)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(data))
+
+
+def export_restaurant(restaurant, path, include_media=True, storage=default_storage):
+    """
+    레스토랑을 tar 아카이브로 내보내기
+    반환: {'counts': {모델: 건수}, 'media_files', 'media_bytes', 'missing': [없는 파일 이름]}
+    """
+    mode = 'w|gz' if path.endswith(('.gz', '.tgz')) else 'w|'
+    counts = dict.fromkeys(MODELS, 0)
+    stats = {'counts': counts, 'media_files': 0, 'media_bytes': 0, 'missing': []}
+    targets = {}
+    written = set()
+
+    with tarfile.open(path, mode) as tar, tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as records:
+        manifest = {
+            'format': FORMAT_VERSION,
+            'restaurant': {'slug': restaurant.slug, 'name': restaurant.name},
+            'exported_at': timezone.now().isoformat(),
+            'media': include_media,
+        }
+        _add_bytes(tar, 'manifest.json', json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+
+        # 레코드는 임시 파일에 모으고 (tar 멤버는 크기를 먼저 알아야 함) 미디어는 만나는 대로 기록
+        for record in iter_records(restaurant):
+            counts[record['model']] += 1
+            mapped = {}
+            for name in record['media']:
+                target = targets.get(name)
+                if target is None:
+                    try:
+                        target = content_name(storage, name)
+                        size = storage.size(name)
+                    except OSError:
+                        stats['missing'].append(name)
+                        continue
+                    targets[name] = target
+                    if include_media and target not in written:
+                        info = tarfile.TarInfo(MEDIA_PREFIX + target)
+                        info.size = size
+                        info.mtime = int(time.time())
+                        with storage.open(name, 'rb') as f:
+                            tar.addfile(info, f)
+                        written.add(target)
+                        stats['media_files'] += 1
+                        stats['media_bytes'] += size
+                mapped[name] = target
+            record['media'] = mapped
+            records.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8'))
+            records.write(b'\n')
+
+        info = tarfile.TarInfo('records.jsonl')
+        info.size = records.tell()
+        info.mtime = int(time.time())
+        records.seek(0)
+        tar.addfile(info, records)
+    return stats
+
+
+def _remap_names(value, names):
+    """JSON 값 안의 파일 이름을 새 이름으로 (image_variants, font_subsets)"""
+    if isinstance(value, str):
+        return names.get(value, value)
+    if isinstance(value, list):
+        return [_remap_names(v, names) for v in value]
+    if isinstance(value, dict):
+        return {k: _remap_names(v, names) for k, v in value.items()}
+    return value
+
+
+def _refresh_theme_hash(restaurant):
+    SiteSettings = apps.get_model('menu', 'SiteSettings')
+    for site_settings in SiteSettings.objects.filter(restaurant=restaurant):
+        new_hash = theme_hash(compile_theme(site_settings))
+        if new_hash != site_settings.theme_hash:
+            SiteSettings.objects.filter(pk=site_settings.pk).update(theme_hash=new_hash)
+
+
+class Loader:
+    """
+    레코드를 순서대로 받아 모델별 BATCH_SIZE 건씩 bulk_create
+    - 외래 키(restaurant, parent, category)는 이미 적재한 객체의 새 pk 로 재매핑 (대상이 없으면 None)
+    - 파일 이름은 names 매핑으로 바꿈 (같은 저장소로 복제할 때는 그대로)
+    - 호출자의 트랜잭션 안에서 사용하고 마지막에 finish() 호출
+    """
+
+    def __init__(self, slug=None, name=None):
+        self.overrides = {key: value for key, value in (('slug', slug), ('name', name)) if value}
+        self.pk_maps = {label: {} for label in MODELS}
+        self.counts = dict.fromkeys(MODELS, 0)
+        self.media_counts = {}
+        self.restaurant = None
+        self._label = None
+        self._pending = []
+        self._pending_pks = set()
+
+    def add(self, record, names=None):
+        label = record['model']
+        if label not in self.pk_maps:
+            raise ValueError(f"알 수 없는 모델입니다: {label}")
+        Model = apps.get_model(label)
+        fields = dict(record['fields'])
+
+        parent_pk = fields.get('parent_id')
+        if label != self._label or len(self._pending) >= BATCH_SIZE or parent_pk in self._pending_pks:
+            # 같은 배치 안의 부모는 아직 pk 가 없으므로 먼저 저장
+            self.flush()
+        self._label = label
+
+        values = {}
+        for field in Model._meta.concrete_fields:
+            if field.primary_key or field.attname not in fields:
+                continue
+            value = fields[field.attname]
+            if field.is_relation:
+                related = field.related_model._meta.label_lower
+                value = self.pk_maps[related].get(value) if related in self.pk_maps else None
+            elif isinstance(field, FileField):
+                value = (names or {}).get(value, value)
+            elif names and field.name in media_refs.JSON_REFERENCES:
+                value = _remap_names(value, names)
+            values[field.attname] = value
+        if label == 'menu.restaurant':
+            values.update(self.overrides)
+
+        self._pending.append((record['pk'], Model(**values)))
+        self._pending_pks.add(record['pk'])
+
+    def flush(self):
+        if not self._pending:
+            return
+        Model = apps.get_model(self._label)
+        instances = [instance for _, instance in self._pending]
+        # Restaurant.post_save 의 SiteSettings 자동 생성도 거치지 않음 (SiteSettings 는 레코드로 옴)
+        Model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+        pk_map = self.pk_maps[self._label]
+        for old_pk, instance in self._pending:
+            pk_map[old_pk] = instance.pk
+            for name in media_names(instance):
+                self.media_counts[name] = self.media_counts.get(name, 0) + 1
+        self.counts[self._label] += len(instances)
+        if self._label == 'menu.restaurant':
+            self.restaurant = instances[0]
+        self._pending = []
+        self._pending_pks = set()
+
+    def finish(self):
+        """남은 배치 저장 + 트리/미디어 참조 수/테마 해시 계산 -> 새 Restaurant"""
+        self.flush()
+        if self.restaurant is None:
+            raise ValueError("레스토랑 레코드가 없습니다.")
+
+        apps.get_model('menu', 'Category').rebuild_tree(self.restaurant)
+        media_refs.retain_counts(self.media_counts)
+
+        # 파일 이름(URL)이 바뀌었을 수 있으므로 테마 해시 다시 계산
+        _refresh_theme_hash(self.restaurant)
+
+        # 새 slug 의 negative 캐시 제거 (Restaurant.post_save 시그널을 거치지 않았으므로)
+        restaurant = self.restaurant
+        transaction.on_commit(lambda: tenants.invalidate(restaurant_id=restaurant.pk, slug=restaurant.slug))
+        return restaurant
+
+
+def read_manifest(path):
+    """아카이브의 manifest.json (첫 멤버)"""
+    with tarfile.open(path, 'r|*') as tar:
+        member = tar.next()
+        if member is None or member.name != 'manifest.json':
+            raise ValueError("manifest.json 이 없는 아카이브입니다.")
+        manifest = json.load(tar.extractfile(member))
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 아카이브 형식입니다: {manifest.get('format')}")
+    return manifest
+
+
+def _media_target(member_name):
+    target = posixpath.normpath(member_name[len(MEDIA_PREFIX):])
+    if target.startswith(('..', '/')) or target == '.':
+        raise ValueError(f"잘못된 미디어 경로입니다: {member_name}")
+    return target
+
+
+def check_new_slug(slug):
+    """
+    새 레스토랑 slug 검사 (형식, Restaurant.slug 길이, 중복) - 잘못되면 ValueError
+    bulk_create 는 필드 검증을 하지 않으므로 파일/레코드를 만들기 전에 호출
+    """
+    Restaurant = apps.get_model('menu', 'Restaurant')
+    try:
+        validate_slug(slug)
+    except ValidationError:
+        raise ValueError(f"서브도메인 ID 는 영문, 숫자, 밑줄, 하이픈만 쓸 수 있습니다: {slug!r}")
+    max_length = Restaurant._meta.get_field('slug').max_length
+    if len(slug) > max_length:
+        raise ValueError(f"서브도메인 ID 는 {max_length}자 이하여야 합니다: {slug}")
+    if Restaurant.objects.filter(slug=slug).exists():
+        raise ValueError(f"이미 있는 서브도메인 ID 입니다: {slug}")
+
+
+def import_restaurant(path, slug=None, name=None, storage=default_storage):
+    """
+    아카이브를 새 레스토랑으로 가져오기 (slug/name 을 주면 바꿔서)
+    반환: (Restaurant, {'counts': {모델: 건수}, 'media_files', 'media_bytes'})
+    """
+    manifest = read_manifest(path)
+    slug = slug or manifest['restaurant']['slug']
+    check_new_slug(slug)
+
+    saved = {}
+    stats = {'media_files': 0, 'media_bytes': 0}
+    restaurant = None
+    with tarfile.open(path, 'r|*') as tar:
+        for member in tar:
+            if member.isfile() and member.name.startswith(MEDIA_PREFIX):
+                target = _media_target(member.name)
+                # 스트림은 되감을 수 없으므로 (저장소가 해시를 계산하며 되감음) 임시 파일로 복사
+                with tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024) as tmp:
+                    shutil.copyfileobj(tar.extractfile(member), tmp)
+                    tmp.seek(0)
+                    stored = storage.save(target, File(tmp, name=posixpath.basename(target)))
+                if is_content_addressed(target) and is_content_addressed(stored) and stored != target:
+                    raise ValueError(f"미디어 파일 내용이 해시와 다릅니다: {member.name}")
+                if is_content_addressed(stored):
+                    # 가져오기가 실패해도 media_gc 가 정리할 수 있도록 참조 0 으로 기록
+                    media_refs.discard(storage, stored)
+                saved[target] = stored
+                stats['media_files'] += 1
+                stats['media_bytes'] += member.size
+            elif member.name == 'records.jsonl':
+                with transaction.atomic():
+                    loader = Loader(slug=slug, name=name)
+                    for line in tar.extractfile(member):
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        names = {
+                            old: saved.get(target, target)
+                            for old, target in record.get('media', {}).items()
+                            if old != saved.get(target, target)
+                        }
+                        loader.add(record, names)
+                    restaurant = loader.finish()
+                stats['counts'] = loader.counts
+
+    if restaurant is None:
+        raise ValueError("records.jsonl 이 없는 아카이브입니다.")
+    return restaurant, stats
+
+
+def _legacy_media(restaurant):
+    """레스토랑의 파일 필드가 참조하는 기존(내용 해시가 아닌) 파일 이름"""
+    names = set()
+    for queryset in _querysets(restaurant):
+        for field in media_refs.file_fields(queryset.model):
+            values = queryset.exclude(**{field.attname: ''}).values_list(field.attname, flat=True).distinct()
+            names.update(name for name in values if name and not is_content_addressed(name))
+    return names
+
+
+def link_content_name(storage, name):
+    """
+    기존 이름의 파일을 내용 해시 이름으로도 저장 (가능하면 하드 링크, 아니면 복사) -> 새 이름
+    DB 에 반영되기 전에 실패해도 media_gc 가 정리할 수 있도록 참조 0 으로 기록
+    """
+    target = content_name(storage, name)
+    if not storage.exists(target):
+        try:
+            path = storage.path(target)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.link(storage.path(name), path)
+        except FileExistsError:
+            pass
+        except (NotImplementedError, OSError):
+            # 경로가 없는 저장소 / 다른 파일 시스템
+            with storage.open(name, 'rb') as f:
+                target = storage.save(target, File(f, name=posixpath.basename(target)))
+    media_refs.discard(storage, target)
+    return target
+
+
+def _rename_media(restaurant, renames):
+    """
+    레스토랑의 파일 필드를 새 이름으로 (queryset.update) -> {새 이름: 참조 수}
+    대기 중인 최적화 작업의 원본 이름도 함께 바꿈 (그렇지 않으면 '원본 변경'으로 건너뜀)
+    """
+    ImageOptimizationJob = apps.get_model('menu', 'ImageOptimizationJob')
+    pending = [ImageOptimizationJob.PENDING, ImageOptimizationJob.RUNNING]
+    counts = {}
+    for queryset in _querysets(restaurant):
+        for field in media_refs.file_fields(queryset.model):
+            for old, new in renames.items():
+                rows = queryset.filter(**{field.attname: old})
+                ImageOptimizationJob.objects.filter(
+                    model=queryset.model._meta.label_lower, field_name=field.name, source_name=old,
+                    status__in=pending, object_id__in=rows.values('pk'),
+                ).update(source_name=new)
+                updated = rows.update(**{field.attname: new})
+                if updated:
+                    counts[new] = counts.get(new, 0) + updated
+    return counts
+
+
+def _invalidate(restaurant_id):
+    snapshot.invalidate(restaurant_id)
+    tenants.invalidate(restaurant_id=restaurant_id)
+
+
+def clone_restaurant(source, slug, name=None, storage=default_storage):
+    """
+    레스토랑 복제 (템플릿 가게로 새 가게 온보딩)
+    SiteSettings, 카테고리 트리, 메뉴를 bulk_create 로 복사하고
+    미디어 파일은 복사하지 않고 같은 파일을 참조 (내용 주소 파일은 참조 수만 증가)
+    기존 이름의 파일은 원본 레스토랑도 함께 내용 해시 이름으로 옮긴 뒤 공유
+    반환: (새 Restaurant, {모델: 건수})
+    """
+    check_new_slug(slug)
+
+    renames = {}
+    for old in _legacy_media(source):
+        try:
+            renames[old] = link_content_name(storage, old)
+        except OSError:
+            # 파일이 없음: 공유해도 지워질 파일이 없으므로 그대로 둠
+            continue
+
+    with transaction.atomic():
+        if renames:
+            media_refs.retain_counts(_rename_media(source, renames))
+            _refresh_theme_hash(source)
+            transaction.on_commit(lambda: _invalidate(source.pk))
+        loader = Loader(slug=slug, name=name)
+        for record in iter_records(source):
+            loader.add(record)
+        restaurant = loader.finish()
+
+    # 기존 이름은 더 이상 참조하지 않으면 삭제 (내용 해시 이름의 하드 링크/복사본이 남음)
+    for old in renames:
+        if not media_refs.is_referenced(old):
+            storage.delete(old)
+    return restaurant, loader.counts
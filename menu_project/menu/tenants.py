@@ -0,0 +1,85 @@
+"""
+레스토랑(테넌트) 조회 캐시
+
+- slug -> (Restaurant, SiteSettings) 를 프로세스 메모리에 보관
+- 존재하지 않는 slug (봇의 /wp-admin/ 스캔 등)도 짧은 시간 동안 캐시 (negative caching)
+- Restaurant/SiteSettings 저장·삭제 시 signals.py 에서 무효화
+- 다른 워커의 수정 사항은 레스토랑별 버전 키(Django 캐시)로 감지
+  (메뉴 스냅샷과 별도의 키: 메뉴/카테고리 수정으로 테넌트 항목이 비워지지 않음)
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Restaurant, SiteSettings
+
+VERSION_KEY = 'menu:tenant-version:{}'
+
+# 무작위 slug 요청으로 메모리가 계속 늘어나지 않도록 제한
+MAX_NEGATIVE_ENTRIES = 10000
+
+_tenants = {}
+_missing = {}
+
+
+class Tenant:
+    __slots__ = ('restaurant', 'site_settings', 'version', 'expires_at')
+
+    def __init__(self, restaurant, site_settings, version, expires_at):
+        self.restaurant = restaurant
+        self.site_settings = site_settings
+        self.version = version
+        self.expires_at = expires_at
+
+
+def _version(restaurant_id):
+    return cache.get(VERSION_KEY.format(restaurant_id), 0)
+
+
+def get_tenant(slug):
+    """
+    slug 에 해당하는 Tenant 반환, 없으면 None
+    """
+    now = time.monotonic()
+
+    if _missing.get(slug, 0) > now:
+        return None
+
+    tenant = _tenants.get(slug)
+    if tenant is not None and tenant.expires_at > now and tenant.version == _version(tenant.restaurant.pk):
+        return tenant
+
+    restaurant = Restaurant.objects.filter(slug=slug).first()
+    if restaurant is None:
+        if len(_missing) >= MAX_NEGATIVE_ENTRIES:
+            _missing.clear()
+        _missing[slug] = now + getattr(settings, 'TENANT_NEGATIVE_TTL', 30)
+        _tenants.pop(slug, None)
+        return None
+
+    version = _version(restaurant.pk)
+    site_settings = SiteSettings.objects.filter(restaurant=restaurant).first()
+    tenant = Tenant(restaurant, site_settings, version, now + getattr(settings, 'TENANT_CACHE_TTL', 300))
+    _tenants[slug] = tenant
+    return tenant
+
+
+def invalidate(restaurant_id=None, slug=None):
+    """
+    해당 레스토랑(또는 slug)의 캐시 항목 제거
+    restaurant_id 를 주면 버전을 올려 다른 워커의 항목도 무효화 (slug 의 negative 캐시는 이 프로세스만)
+    """
+    if slug is not None:
+        _missing.pop(slug, None)
+        _tenants.pop(slug, None)
+    if restaurant_id is not None:
+        key = VERSION_KEY.format(restaurant_id)
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+        for key, tenant in list(_tenants.items()):
+            if tenant.restaurant.pk == restaurant_id:
+                _tenants.pop(key, None)
@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.test import TestCase, override_settings
+from PIL import Image
+
+
+def png(color='red', size=(40, 30)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class MediaTestCase(TestCase):
+    """MEDIA_ROOT 를 임시 디렉터리로 (이미지 최적화는 테스트 안에서 직접 실행)"""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root, IMAGE_OPTIMIZATION_MODE='queue')
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def write_legacy(self, name, data):
+        """내용 해시가 아닌 이름의 기존 업로드 파일 (ContentAddressedStorage 이전)"""
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return name
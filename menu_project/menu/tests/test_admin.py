@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
+
+from menu.models import MenuItem
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    def paginator(self, **params):
+        request = RequestFactory().get('/admin/menu/menuitem/', params)
+        model_admin = admin.site._registry[MenuItem]
+        return model_admin.get_paginator(request, MenuItem.objects.all(), 100)
+
+    def test_estimate_only_for_unfiltered_changelist(self):
+        self.assertTrue(self.paginator().use_estimate)
+        self.assertTrue(self.paginator(p='3', o='1').use_estimate)
+        self.assertFalse(self.paginator(q='라거').use_estimate)
+        self.assertFalse(self.paginator(is_available__exact='1').use_estimate)
@@ -0,0 +1,89 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils.http import urlsafe_base64_encode
+
+from menu.models import Category, MenuItem, Restaurant
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+@mock.patch('menu.admin_views.DASHBOARD_PAGE_SIZE', 2)
+class AdminDashboardTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='dash')
+        self.whisky = Category.objects.create(restaurant=self.restaurant, name='위스키', priority=1)
+        self.single_malt = Category.objects.create(
+            restaurant=self.restaurant, name='싱글몰트', parent=self.whisky, priority=2,
+        )
+        self.beer = Category.objects.create(restaurant=self.restaurant, name='맥주', priority=3)
+        self.items = [
+            self.item('조니워커', self.whisky),
+            self.item('글렌', self.single_malt),
+            # 같은 우선순위/이름은 id 로 구분
+            self.item('맥캘란', self.single_malt),
+            self.item('맥캘란', self.single_malt),
+            self.item('라거', self.beer),
+            self.item('미분류', None),
+        ]
+        self.client.force_login(User.objects.create_superuser('admin', password='pw'))
+
+    def item(self, name, category):
+        return MenuItem.objects.create(restaurant=self.restaurant, category=category, name=name, price='1000')
+
+    def get(self, query=''):
+        response = self.client.get(f'/dash/admin/dashboard/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def walk(self, query=''):
+        """next_query 를 따라 모든 페이지의 메뉴 id"""
+        ids = []
+        while True:
+            response = self.get(query)
+            ids.extend(item.pk for item in response.context['menu_items'])
+            query = response.context['next_query']
+            if query is None:
+                return ids, response.context['menu_total']
+
+    def test_cursor_paging_visits_every_item_once(self):
+        ids, total = self.walk()
+        self.assertEqual(total, 6)
+        # 카테고리 우선순위 -> 이름 -> id 순, 미분류는 맨 뒤
+        self.assertEqual(ids, [item.pk for item in self.items])
+
+        second = self.get(self.get().context['next_query'])
+        self.assertEqual(second.context['first_query'], '')
+
+    def test_category_filter_includes_subtree(self):
+        ids, total = self.walk(f'category={self.whisky.pk}')
+        self.assertEqual(total, 4)
+        self.assertEqual(sorted(ids), sorted(item.pk for item in self.items[:4]))
+
+        ids, total = self.walk(f'category={self.single_malt.pk}')
+        self.assertEqual(sorted(ids), sorted(item.pk for item in self.items[1:4]))
+
+        ids, _ = self.walk('category=none')
+        self.assertEqual(ids, [self.items[5].pk])
+
+    def test_filters_are_kept_across_pages(self):
+        ids, total = self.walk(f'category={self.whisky.pk}&q=맥캘란')
+        self.assertEqual(total, 2)
+        self.assertEqual(ids, [self.items[2].pk, self.items[3].pk])
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        first_page = [item.pk for item in self.get().context['menu_items']]
+
+        def encode(value):
+            return urlsafe_base64_encode(value.encode('utf-8'))
+
+        for after in (
+            'garbage', '%%%', encode('not json'), encode('[1, 2]'), encode('{"a": 1, "b": 2, "c": 3, "d": 4}'),
+            encode('[[1], 0, "x", 1]'), encode('[1e400, 0, "x", 1]'), encode('[0, 0, "x", 1e400]'),
+            encode('[0, 0, "x", 99999999999999999999999]'), encode('["nan", 0, "x", 1]'),
+        ):
+            with self.subTest(after=after):
+                response = self.get(f'after={after}')
+                self.assertEqual([item.pk for item in response.context['menu_items']], first_page)
@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from menu.models import Category, Restaurant
+from menu.snapshot import get_snapshot
+
+
+class CategoryTreeTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='tree')
+        self.drinks = Category.objects.create(restaurant=self.restaurant, name='음료')
+        self.coffee = Category.objects.create(restaurant=self.restaurant, name='커피', parent=self.drinks)
+        self.iced = Category.objects.create(restaurant=self.restaurant, name='아이스', parent=self.coffee)
+
+    def test_path_depth_and_child_count(self):
+        self.iced.refresh_from_db()
+        self.drinks.refresh_from_db()
+        self.assertEqual(self.iced.path, f"{self.drinks.pk}/{self.coffee.pk}/{self.iced.pk}/")
+        self.assertEqual(self.iced.depth, 2)
+        self.assertEqual(self.drinks.child_count, 1)
+
+    def test_move_updates_subtree(self):
+        tea = Category.objects.create(restaurant=self.restaurant, name='차')
+        self.coffee.parent = tea
+        self.coffee.save()
+        self.iced.refresh_from_db()
+        self.drinks.refresh_from_db()
+        self.assertEqual(self.iced.path, f"{tea.pk}/{self.coffee.pk}/{self.iced.pk}/")
+        self.assertEqual(self.drinks.child_count, 0)
+
+    def test_snapshot_breadcrumb_uses_path(self):
+        snapshot = get_snapshot(self.restaurant)
+        iced = snapshot.get_category(self.iced.pk)
+        with self.assertNumQueries(0):
+            path = snapshot.get_breadcrumb_path(iced)
+        self.assertEqual([c.pk for c in path], [self.drinks.pk, self.coffee.pk, self.iced.pk])
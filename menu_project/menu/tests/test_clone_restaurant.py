@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from menu import media_refs
+from menu.image_jobs import optimize_file, swap_optimized
+from menu.models import Category, MediaBlob, MenuItem, Restaurant
+from menu.storage import is_content_addressed
+from menu.tenant_archive import clone_restaurant
+
+from .base import MediaTestCase, png
+
+
+class CloneRestaurantTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.source = Restaurant.objects.create(name='원본', slug='t1')
+        self.category = Category.objects.create(restaurant=self.source, name='맥주')
+        legacy = self.write_legacy('menu_images/legacy.jpg', png())
+        self.item = MenuItem.objects.create(restaurant=self.source, category=self.category, name='라거', price='5000')
+        MenuItem.objects.filter(pk=self.item.pk).update(menu_image=legacy)
+
+    def test_legacy_media_moves_to_content_name_for_both_tenants(self):
+        clone, counts = clone_restaurant(self.source, 't2')
+        self.assertEqual(counts['menu.menuitem'], 1)
+
+        source_name = MenuItem.objects.get(pk=self.item.pk).menu_image.name
+        clone_name = MenuItem.objects.get(restaurant=clone).menu_image.name
+        self.assertTrue(is_content_addressed(source_name))
+        self.assertEqual(source_name, clone_name)
+        self.assertEqual(MediaBlob.objects.get(name=source_name).refcount, 2)
+        self.assertFalse(default_storage.exists('menu_images/legacy.jpg'))
+
+    def test_reoptimizing_source_keeps_clone_file(self):
+        clone, _ = clone_restaurant(self.source, 't2')
+        item = MenuItem.objects.get(pk=self.item.pk)
+        result = optimize_file(default_storage, item.menu_image.name, 20, 80)
+        self.assertTrue(swap_optimized(MenuItem, item, 'menu_image', item.menu_image.name, result, default_storage))
+
+        clone_name = MenuItem.objects.get(restaurant=clone).menu_image.name
+        self.assertTrue(default_storage.exists(clone_name))
+        self.assertEqual(MediaBlob.objects.get(name=clone_name).refcount, 1)
+        self.assertFalse(media_refs.is_referenced('menu_images/legacy.jpg'))
+
+    def test_invalid_slug_is_rejected_before_media_is_touched(self):
+        for slug in ('새 가게', 'a.b', 'x' * 51):
+            with self.subTest(slug=slug), self.assertRaises(ValueError):
+                clone_restaurant(self.source, slug)
+        self.assertEqual(Restaurant.objects.count(), 1)
+        # 기존 이름 파일을 내용 해시 이름으로 옮기지도 않음
+        self.assertEqual(MenuItem.objects.get(pk=self.item.pk).menu_image.name, 'menu_images/legacy.jpg')
+        self.assertTrue(default_storage.exists('menu_images/legacy.jpg'))
+
+    def test_command_reports_invalid_slug(self):
+        with self.assertRaisesMessage(CommandError, '영문, 숫자'):
+            call_command('clone_restaurant', 't1', '새 가게', stdout=StringIO())
+        with self.assertRaisesMessage(CommandError, '이미 있는'):
+            call_command('clone_restaurant', 't1', 't1', stdout=StringIO())
@@ -0,0 +1,61 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from menu import qr
+from menu.management.commands.generate_table_qr import parse_tables
+from menu.models import Restaurant
+
+
+class GenerateTableQrTests(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.output = os.path.join(self.tmp, 'out')
+        qr._images.clear()
+        Restaurant.objects.create(name='가게', slug='bar')
+
+    def generate(self, *args):
+        call_command(
+            'generate_table_qr', '--base-url', 'https://menu.example.com', '--output', self.output,
+            '--workers', '1', *args, stdout=StringIO(),
+        )
+
+    def test_parse_tables(self):
+        self.assertEqual(parse_tables('1-3, 5,3'), [1, 2, 3, 5])
+        with self.assertRaises(CommandError):
+            parse_tables('a-b')
+        with self.assertRaises(CommandError):
+            parse_tables('0-2')
+
+    def test_png_output_and_manifest(self):
+        cache_dir = os.path.join(self.tmp, 'qr-cache')
+        with override_settings(QR_CACHE_DIR=cache_dir):
+            self.generate('--tables', '1-2', '--format', 'png')
+
+        with open(os.path.join(self.output, 'bar', 'table-001.png'), 'rb') as f:
+            self.assertTrue(f.read().startswith(b'\x89PNG'))
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'bar', 'sheet-01.png')))
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+        with open(os.path.join(self.output, 'qr-manifest.json'), encoding='utf-8') as f:
+            self.assertEqual(set(json.load(f)), {'bar/table-001.png', 'bar/table-002.png', 'bar/sheet-01.png'})
+
+    def test_unwritable_cache_dir(self):
+        # 디스크 캐시를 만들 수 없어도 (읽기 전용 파일시스템 등) 렌더링한 bytes 로 출력
+        blocker = os.path.join(self.tmp, 'not-a-dir')
+        open(blocker, 'w').close()
+        with override_settings(QR_CACHE_DIR=os.path.join(blocker, 'qr')):
+            self.generate('--tables', '1-2', '--format', 'zip')
+
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'bar.zip')))
+
+    def test_unknown_restaurant(self):
+        with self.assertRaisesMessage(CommandError, 'Unknown restaurant slug(s): nope'):
+            self.generate('--restaurant', 'nope')
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import override_settings
+
+from menu import image_jobs
+from menu.models import ImageOptimizationJob, MenuItem, Restaurant
+
+from .base import MediaTestCase, png
+
+
+class UnchangedImageTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        sync = override_settings(IMAGE_OPTIMIZATION_MODE='sync')
+        sync.enable()
+        self.addCleanup(sync.disable)
+        self.restaurant = Restaurant.objects.create(name='가게', slug='hashes')
+        self.image = png(size=(1600, 100))
+        self.item = MenuItem.objects.create(
+            restaurant=self.restaurant, name='하나', price='5000',
+            menu_image=ContentFile(self.image, name='upload.png'),
+        )
+        self.optimized = self.item.menu_image.name
+        self.assertEqual(ImageOptimizationJob.objects.get().result_name, self.optimized)
+
+    def test_reupload_of_same_image_skips_job(self):
+        self.item.menu_image = ContentFile(self.image, name='again.png')
+        with mock.patch.object(image_jobs, 'optimize_file', wraps=image_jobs.optimize_file) as optimize:
+            self.item.save()
+
+        optimize.assert_not_called()
+        self.assertEqual(ImageOptimizationJob.objects.filter(object_id=self.item.pk).count(), 1)
+        self.assertEqual(MenuItem.objects.get(pk=self.item.pk).menu_image.name, self.optimized)
+
+    def test_save_without_image_change_skips_job(self):
+        self.item.price = '6000'
+        with mock.patch.object(image_jobs, 'optimize_file', wraps=image_jobs.optimize_file) as optimize:
+            self.item.save()
+
+        optimize.assert_not_called()
+        self.assertEqual(ImageOptimizationJob.objects.filter(object_id=self.item.pk).count(), 1)
+
+    def test_changed_upload_enqueues_job(self):
+        self.item.menu_image = ContentFile(png('blue', size=(1600, 100)), name='other.png')
+        with mock.patch.object(image_jobs, 'optimize_file', wraps=image_jobs.optimize_file) as optimize:
+            self.item.save()
+
+        optimize.assert_called_once()
+        self.assertEqual(ImageOptimizationJob.objects.filter(object_id=self.item.pk).count(), 2)
+        self.assertNotEqual(MenuItem.objects.get(pk=self.item.pk).menu_image.name, self.optimized)
@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+
+from menu.models import ImageOptimizationJob, MenuItem, Restaurant
+
+from .base import MediaTestCase, png
+
+
+class ImageOptimizationJobTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.restaurant = Restaurant.objects.create(name='가게', slug='jobs')
+
+    def create_item(self, image):
+        return MenuItem.objects.create(
+            restaurant=self.restaurant, name='하나', price='5000',
+            menu_image=ContentFile(image, name='upload.png'),
+        )
+
+    def test_save_queues_job_and_worker_swaps_file(self):
+        item = self.create_item(png(size=(1600, 100)))
+        job = ImageOptimizationJob.objects.get(object_id=item.pk)
+        self.assertEqual(job.status, ImageOptimizationJob.PENDING)
+        # save() 는 원본을 그대로 저장하고 바로 반환
+        self.assertEqual(MenuItem.objects.get(pk=item.pk).menu_image.name, job.source_name)
+
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageOptimizationJob.DONE)
+        self.assertEqual(MenuItem.objects.get(pk=item.pk).menu_image.name, job.result_name)
+        self.assertNotEqual(job.result_name, job.source_name)
+
+    @override_settings(IMAGE_OPTIMIZATION_MODE='sync')
+    def test_sync_mode_optimizes_during_save(self):
+        item = self.create_item(png(size=(1600, 100)))
+        job = ImageOptimizationJob.objects.get(object_id=item.pk)
+
+        self.assertEqual(job.status, ImageOptimizationJob.DONE)
+        self.assertEqual(item.menu_image.name, job.result_name)
+
+    def test_new_upload_supersedes_pending_job(self):
+        item = self.create_item(png('red'))
+        item.menu_image = ContentFile(png('blue'), name='other.png')
+        item.save()
+
+        jobs = ImageOptimizationJob.objects.filter(object_id=item.pk)
+        self.assertEqual(jobs.count(), 1)
+        self.assertEqual(jobs.get().source_name, item.menu_image.name)
+
+    def test_failed_job_is_retried_later(self):
+        item = self.create_item(b'not an image')
+        call_command('process_image_jobs', '--once', stdout=StringIO())
+
+        job = ImageOptimizationJob.objects.get(object_id=item.pk)
+        self.assertEqual(job.status, ImageOptimizationJob.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertTrue(job.last_error)
+        self.assertGreater(job.run_after, job.updated_at)
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from menu.models import MenuItem, Restaurant
+
+
+class ImportCsvTests(TestCase):
+    HEADER = '대분류,소분류,영문명,한글명,가격,설명\n'
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='csv')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'menu.csv')
+
+    def run_import(self, rows, *args):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(self.HEADER + ''.join(f'{row}\n' for row in rows))
+        out = StringIO()
+        call_command('import_csv', self.path, '--restaurant', 'csv', *args, stdout=out)
+        return out.getvalue()
+
+    def items(self):
+        return {
+            item.name: item
+            for item in MenuItem.objects.filter(restaurant=self.restaurant).select_related('category__parent')
+        }
+
+    def test_import_replaces_items_under_parent(self):
+        self.run_import(['위스키,싱글몰트,Glen,글렌,15000,', '위스키,싱글몰트,Glen,글렌,16000,'])
+        items = self.items()
+        self.assertEqual(list(items), ['글렌'])
+        self.assertEqual(items['글렌'].price, '16000')
+        self.assertEqual(items['글렌'].category.parent.name, '위스키')
+
+        old_pk = items['글렌'].pk
+        self.run_import(['위스키,싱글몰트,Glen,글렌,17000,'])
+        self.assertNotEqual(self.items()['글렌'].pk, old_pk)
+
+    def test_other_parents_are_kept(self):
+        self.run_import(['위스키,싱글몰트,,글렌,15000,', '맥주,라거,,카스,5000,'])
+        self.run_import(['위스키,싱글몰트,,맥캘란,20000,'])
+        self.assertEqual(sorted(self.items()), ['맥캘란', '카스'])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def count(rows):
+            with CaptureQueriesContext(connection) as queries:
+                self.run_import(rows)
+            return len(queries)
+
+        # 둘 다 새 대분류/소분류를 만드는 경우로 비교
+        few = count([f'위스키,싱글몰트,,메뉴{i},1000,' for i in range(3)])
+        many = count([f'맥주,라거,,메뉴{i},1000,' for i in range(60)])
+        self.assertEqual(many, few)
+
+    def test_sync_applies_only_differences(self):
+        self.run_import(['위스키,싱글몰트,,글렌,15000,', '위스키,싱글몰트,,맥캘란,20000,', '위스키,버번,,메이커스,12000,'])
+        before = self.items()
+
+        output = self.run_import(
+            ['위스키,싱글몰트,,글렌,15000,', '위스키,싱글몰트,,맥캘란,21000,', '위스키,버번,,버팔로,11000,'],
+            '--sync',
+        )
+        self.assertIn('Inserted: 1, updated: 1, deactivated: 1', output)
+        after = self.items()
+        self.assertEqual(after['글렌'].pk, before['글렌'].pk)
+        self.assertEqual(after['글렌'].updated_at, before['글렌'].updated_at)
+        self.assertEqual(after['맥캘란'].pk, before['맥캘란'].pk)
+        self.assertEqual(after['맥캘란'].price, '21000')
+        self.assertFalse(after['메이커스'].is_available)
+        self.assertTrue(after['버팔로'].is_available)
+
+    def test_sync_reactivates_and_dry_run_changes_nothing(self):
+        self.run_import(['위스키,싱글몰트,,글렌,15000,'])
+        self.run_import(['위스키,싱글몰트,,맥캘란,20000,'], '--sync')
+        self.assertFalse(self.items()['글렌'].is_available)
+
+        output = self.run_import(['위스키,싱글몰트,,글렌,15000,'], '--sync', '--dry-run')
+        self.assertIn('Would insert 0, update 1, deactivate 1', output)
+        self.assertFalse(self.items()['글렌'].is_available)
+
+        self.run_import(['위스키,싱글몰트,,글렌,15000,'], '--sync')
+        self.assertTrue(self.items()['글렌'].is_available)
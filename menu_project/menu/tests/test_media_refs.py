@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+
+from menu import media_refs
+from menu.models import ImageOptimizationJob, MediaBlob, MenuItem, Restaurant
+from menu.storage import is_content_addressed
+
+from .base import MediaTestCase, png
+
+
+class MediaReferenceTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.restaurant = Restaurant.objects.create(name='가게', slug='media')
+
+    def create_item(self, name, image=None):
+        return MenuItem.objects.create(
+            restaurant=self.restaurant, name=name, price='5000',
+            menu_image=ContentFile(image or png(), name='upload.png'),
+        )
+
+    def test_identical_uploads_share_one_counted_file(self):
+        first = self.create_item('하나')
+        second = self.create_item('둘')
+        self.assertEqual(first.menu_image.name, second.menu_image.name)
+        blob = MediaBlob.objects.get(name=first.menu_image.name)
+        self.assertEqual(blob.refcount, 2)
+
+        first.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.refcount, 1)
+
+        second.menu_image = ContentFile(png('blue'), name='other.png')
+        second.save()
+        blob.refresh_from_db()
+        self.assertEqual(blob.refcount, 0)
+        self.assertEqual(MediaBlob.objects.get(name=second.menu_image.name).refcount, 1)
+
+    def test_collect_removes_only_unreferenced_files(self):
+        kept = self.create_item('하나')
+        dropped = self.create_item('둘', png('blue'))
+        dropped_name = dropped.menu_image.name
+        dropped.delete()
+
+        self.assertEqual(media_refs.collect(timedelta(hours=1)), (0, 0))
+        removed, _ = media_refs.collect(timedelta(0))
+        self.assertEqual(removed, 1)
+        self.assertFalse(default_storage.exists(dropped_name))
+        self.assertTrue(default_storage.exists(kept.menu_image.name))
+
+    def test_rebuild_recounts_references(self):
+        item = self.create_item('하나')
+        MediaBlob.objects.filter(name=item.menu_image.name).update(refcount=7)
+        self.assertEqual(media_refs.rebuild(), {item.menu_image.name: 1})
+        self.assertEqual(MediaBlob.objects.get(name=item.menu_image.name).refcount, 1)
+
+    @override_settings(IMAGE_OPTIMIZATION_MODE='sync')
+    def test_optimization_moves_reference_to_new_file(self):
+        item = self.create_item('하나', png(size=(1600, 100)))
+        original = ImageOptimizationJob.objects.get(object_id=item.pk).source_name
+
+        self.assertNotEqual(item.menu_image.name, original)
+        self.assertTrue(is_content_addressed(item.menu_image.name))
+        self.assertEqual(MediaBlob.objects.get(name=original).refcount, 0)
+        self.assertEqual(MediaBlob.objects.get(name=item.menu_image.name).refcount, 1)
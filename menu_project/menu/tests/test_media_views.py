@@ -0,0 +1,28 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+
+from .base import MediaTestCase
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, MEDIA_ACCEL_MODE='')
+class MediaServingTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.svg = b'<svg xmlns="http://www.w3.org/2000/svg">' + b'<rect width="1" height="1"/>' * 200 + b'</svg>'
+        self.name = default_storage.save('menu_images/icon.svg', ContentFile(self.svg))
+
+    def test_range_capable_response_is_not_gzipped(self):
+        response = self.client.get(f'/media/{self.name}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), self.svg)
+
+    def test_range_request_uses_same_etag(self):
+        full = self.client.get(f'/media/{self.name}', HTTP_ACCEPT_ENCODING='gzip')
+        partial = self.client.get(f'/media/{self.name}', HTTP_RANGE='bytes=0-9', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial['ETag'], full['ETag'])
+        self.assertEqual(b''.join(partial.streaming_content), self.svg[:10])
@@ -0,0 +1,101 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from menu.menu_batch import PRIORITY_EPSILON, apply_operations
+from menu.models import Category, MenuItem, Restaurant, UserProfile
+
+
+class MenuBatchTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='batch')
+        self.category = Category.objects.create(restaurant=self.restaurant, name='맥주')
+        self.items = [
+            MenuItem.objects.create(
+                restaurant=self.restaurant, category=self.category, name=name, price='5000', priority=priority,
+            )
+            for name, priority in (('가', 1.0), ('나', 2.0), ('다', 3.0))
+        ]
+
+    def order(self):
+        return list(
+            MenuItem.objects.filter(category=self.category).order_by('priority', 'name').values_list('pk', flat=True)
+        )
+
+    def test_reorder_updates_only_moved_item(self):
+        first, second, third = self.items
+        result = apply_operations(self.restaurant, [{'op': 'reorder', 'id': third.pk, 'before': second.pk}])
+        self.assertEqual(result, {'updated': 1, 'rebalanced': 0})
+        self.assertEqual(self.order(), [first.pk, third.pk, second.pk])
+        self.assertEqual(MenuItem.objects.get(pk=third.pk).priority, 1.5)
+
+    def test_reorder_rebalances_when_gap_is_exhausted(self):
+        first, second, third = self.items
+        MenuItem.objects.filter(pk=second.pk).update(priority=1.0 + PRIORITY_EPSILON / 2)
+        result = apply_operations(self.restaurant, [{'op': 'reorder', 'id': third.pk, 'after': first.pk}])
+        self.assertEqual(result['rebalanced'], 1)
+        self.assertEqual(self.order(), [first.pk, third.pk, second.pk])
+        priorities = list(MenuItem.objects.filter(category=self.category).order_by('priority').values_list('priority', flat=True))
+        self.assertEqual(priorities, [1.0, 1.5, 2.0])
+
+    def test_invalid_operation_rolls_back_batch(self):
+        first, second, _ = self.items
+        with self.assertRaises(ValueError):
+            apply_operations(self.restaurant, [
+                {'op': 'price', 'id': first.pk, 'price': '9000'},
+                {'op': 'category', 'id': second.pk, 'category': 999999},
+            ])
+        self.assertEqual(MenuItem.objects.get(pk=first.pk).price, '5000')
+
+    def test_other_restaurant_items_are_rejected(self):
+        other = Restaurant.objects.create(name='다른 가게', slug='other')
+        with self.assertRaises(ValueError):
+            apply_operations(other, [{'op': 'available', 'id': self.items[0].pk}])
+        self.assertTrue(MenuItem.objects.get(pk=self.items[0].pk).is_available)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MenuBatchViewTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='batch')
+        self.other = Restaurant.objects.create(name='다른 가게', slug='other')
+        category = Category.objects.create(restaurant=self.restaurant, name='맥주')
+        self.items = [
+            MenuItem.objects.create(
+                restaurant=self.restaurant, category=category, name=name, price='5000', priority=priority,
+            )
+            for name, priority in (('가', 1.0), ('나', 2.0))
+        ]
+        manager = User.objects.create_user('manager', password='pw', is_staff=True)
+        UserProfile.objects.create(user=manager, restaurant=self.restaurant)
+        self.client.force_login(manager)
+
+    def post(self, slug, body):
+        return self.client.post(f'/{slug}/admin/menu/batch/', body, content_type='application/json')
+
+    def test_reorder(self):
+        first, second = self.items
+        response = self.post('batch', json.dumps({'operations': [{'op': 'reorder', 'id': second.pk, 'before': first.pk}]}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'updated': 1, 'rebalanced': 0})
+        self.assertLess(MenuItem.objects.get(pk=second.pk).priority, MenuItem.objects.get(pk=first.pk).priority)
+
+    def test_foreign_restaurant_is_forbidden(self):
+        response = self.post('other', json.dumps({'operations': [{'op': 'available', 'id': self.items[0].pk}]}))
+
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(MenuItem.objects.get(pk=self.items[0].pk).is_available)
+
+    def test_bad_payload(self):
+        for body in ('{not json', '[]', '"operations"', json.dumps({'operations': 'reorder'})):
+            with self.subTest(body=body):
+                response = self.post('batch', body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+    def test_get_is_not_allowed(self):
+        self.assertEqual(self.client.get('/batch/admin/menu/batch/').status_code, 405)
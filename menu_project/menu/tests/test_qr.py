@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from menu import qr
+from menu.models import Restaurant
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class QrImageViewTests(TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        cache_dir = override_settings(QR_CACHE_DIR=self.cache_dir)
+        cache_dir.enable()
+        self.addCleanup(cache_dir.disable)
+        qr._images.clear()
+
+        Restaurant.objects.create(name='가게', slug='qr-test')
+        self.key = qr.qr_key('http://testserver/qr-test/')
+
+    def test_default_cache_dir_is_not_public(self):
+        self.assertFalse(settings.QR_CACHE_DIR.startswith(str(settings.MEDIA_ROOT)))
+
+    def test_page_links_current_key(self):
+        self.assertContains(self.client.get('/qr-test/qr/'), f'/qr-test/qr/{self.key}.png')
+
+    def test_png_and_svg(self):
+        png = self.client.get(f'/qr-test/qr/{self.key}.png')
+        self.assertEqual(png.status_code, 200)
+        self.assertEqual(png['Content-Type'], 'image/png')
+        self.assertTrue(png.content.startswith(b'\x89PNG'))
+        self.assertEqual(png['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, f'{self.key}.png')))
+
+        svg = self.client.get(f'/qr-test/qr/{self.key}.svg')
+        self.assertEqual(svg['Content-Type'], 'image/svg+xml')
+        self.assertIn(b'<svg', svg.content)
+        self.assertNotEqual(png['ETag'], svg['ETag'])
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get(f'/qr-test/qr/{self.key}.gif').status_code, 404)
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(f'/qr-test/qr/{self.key}.png')['ETag']
+        response = self.client.get(f'/qr-test/qr/{self.key}.png', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_stale_key_is_not_cached(self):
+        response = self.client.get('/qr-test/qr/0000000000000000.png')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertEqual(response['ETag'], f'"{self.key}-png"')
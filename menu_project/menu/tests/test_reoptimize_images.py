@@ -0,0 +1,69 @@
+import os
+from io import StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from menu.management.commands.reoptimize_images import Command
+from menu.models import MediaBlob, MenuItem, Restaurant
+
+from .base import MediaTestCase, png
+
+
+class ReoptimizeImagesTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.restaurant = Restaurant.objects.create(name='가게', slug='reoptimize')
+        self.checkpoint = os.path.join(self.media_root, 'checkpoint.json')
+
+    def reoptimize(self, *args):
+        call_command('reoptimize_images', '--workers', '1', '--checkpoint', self.checkpoint, *args, stdout=StringIO())
+
+    def create_item(self, name, color='red'):
+        return MenuItem.objects.create(
+            restaurant=self.restaurant, name=name, price='5000',
+            menu_image=ContentFile(png(color, size=(1600, 100)), name='upload.png'),
+        )
+
+    def test_reoptimize_images_command(self):
+        item = self.create_item('하나')
+        source = item.menu_image.name
+
+        self.reoptimize()
+        item.refresh_from_db()
+        self.assertNotEqual(item.menu_image.name, source)
+        self.assertEqual(item.image_hashes['menu_image']['preset'], list(MenuItem.IMAGE_PRESETS['menu_image']))
+        self.assertEqual(MediaBlob.objects.get(name=source).refcount, 0)
+
+        # 이미 최적화된 이미지는 다시 처리하지 않음
+        self.reoptimize('--restart')
+        self.assertEqual(MenuItem.objects.get(pk=item.pk).menu_image.name, item.menu_image.name)
+
+    def test_resume_after_interrupt(self):
+        first = self.create_item('하나')
+        second = self.create_item('둘', 'blue')
+        sources = {first.pk: first.menu_image.name, second.pk: second.menu_image.name}
+
+        run_batch = Command._run_batch
+        batches = []
+
+        def interrupt_at_second_item(command, Model, batch, *args):
+            if Model is MenuItem:
+                batches.append([instance.pk for instance in batch])
+                if batch[0].pk == second.pk and len(batches) == 2:
+                    raise KeyboardInterrupt
+            return run_batch(command, Model, batch, *args)
+
+        with mock.patch.object(Command, '_run_batch', interrupt_at_second_item):
+            self.reoptimize('--batch', '1')
+            self.assertTrue(os.path.exists(self.checkpoint))
+            self.assertEqual(MenuItem.objects.get(pk=second.pk).menu_image.name, sources[second.pk])
+
+            # 체크포인트 이후 (두 번째 메뉴) 부터 다시 시작, 완료되면 체크포인트 삭제
+            self.reoptimize('--batch', '1')
+        self.assertEqual(batches, [[first.pk], [second.pk], [second.pk]])
+        self.assertFalse(os.path.exists(self.checkpoint))
+        for pk, source in sources.items():
+            self.assertNotEqual(MenuItem.objects.get(pk=pk).menu_image.name, source)
@@ -0,0 +1,67 @@
+import re
+
+from django.core.files.base import ContentFile
+from django.test import override_settings
+
+from menu import media_refs
+from menu.models import MediaBlob, MenuItem, Restaurant
+from menu.templatetags.menu_tags import responsive_image, thumbnail_url
+
+from .base import MediaTestCase, png
+
+
+class ResponsiveImageTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.restaurant = Restaurant.objects.create(name='가게', slug='responsive')
+
+    def create_item(self):
+        return MenuItem.objects.create(
+            restaurant=self.restaurant, name='하나', price='5000',
+            menu_image=ContentFile(png(size=(64, 32)), name='upload.png'),
+        )
+
+    def test_without_variants_falls_back_to_img(self):
+        item = self.create_item()
+        self.assertEqual(item.image_variants.get('menu_image'), None)
+
+        html = responsive_image(item, 'menu_image', alt='하나', **{'class': 'menu-only-image'})
+        self.assertHTMLEqual(
+            html,
+            f'<img src="{item.menu_image.url}" alt="하나" loading="lazy" decoding="async" class="menu-only-image">',
+        )
+        self.assertEqual(thumbnail_url(item, 'menu_image'), item.menu_image.url)
+
+    def test_variants_for_another_file_are_ignored(self):
+        item = self.create_item()
+        item.image_variants = {'menu_image': {'src': 'menu_images/old.png', 'w': 64, 'h': 32, 'sets': {'webp': [[16, 'x.webp']]}}}
+
+        self.assertNotIn('<picture', responsive_image(item, 'menu_image'))
+        self.assertEqual(thumbnail_url(item, 'menu_image'), item.menu_image.url)
+
+    @override_settings(IMAGE_OPTIMIZATION_MODE='sync', IMAGE_VARIANT_WIDTHS=(16, 32), IMAGE_VARIANT_FORMATS=('webp',))
+    def test_srcset_from_variants(self):
+        item = self.create_item()
+        entry = item.image_variants['menu_image']
+        self.assertEqual(entry['src'], item.menu_image.name)
+        self.assertEqual([width for width, _ in entry['sets']['webp']], [16, 32, 64])
+
+        html = responsive_image(item, 'menu_image', sizes='50vw')
+        self.assertTrue(html.startswith('<picture class="responsive-picture">'))
+        webp = re.search(r'<source type="image/webp" srcset="([^"]+)" sizes="50vw">', html)
+        self.assertEqual(
+            [part.rsplit(' ', 1)[1] for part in webp.group(1).split(', ')],
+            ['16w', '32w', '64w'],
+        )
+        self.assertIn(f'src="{item.menu_image.url}"', html)
+        self.assertIn('width="64" height="32"', html)
+
+        # width 이상인 가장 작은 WebP 파생본
+        webp_names = dict(entry['sets']['webp'])
+        self.assertEqual(thumbnail_url(item, 'menu_image', 20), item.menu_image.storage.url(webp_names[32]))
+        self.assertEqual(thumbnail_url(item, 'menu_image', 500), item.menu_image.storage.url(webp_names[64]))
+
+        # 파생본도 참조 수 계산 대상
+        for name in media_refs.variant_names(item.image_variants):
+            self.assertEqual(MediaBlob.objects.get(name=name).refcount, 1)
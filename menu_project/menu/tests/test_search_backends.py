@@ -0,0 +1,47 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from menu.models import Category, MenuItem, Restaurant
+from menu.search_backends import FTS_TABLE, get_search_backend
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5')
+class SqliteFtsTriggerTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='fts')
+        self.category = Category.objects.create(restaurant=self.restaurant, name='위스키')
+        self.backend = get_search_backend('sqlite_fts')
+
+    def indexed(self, query):
+        """FTS 테이블에서 직접 찾은 rowid (icontains 대체 경로를 거치지 않음)"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                ['"{}"'.format(query)],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_insert_update_delete_keep_index_in_sync(self):
+        item = MenuItem.objects.create(
+            restaurant=self.restaurant, category=self.category, name='맥캘란 12년', price='10000',
+            name_en='Macallan', description='셰리 캐스크',
+        )
+        self.assertEqual(self.indexed('맥캘란'), [item.pk])
+        self.assertEqual(self.indexed('셰리 캐'), [item.pk])
+        self.assertEqual(self.backend.search_menu_items(self.restaurant, 'macallan'), [item])
+
+        item.name = '글렌피딕 15년'
+        item.save()
+        self.assertEqual(self.indexed('맥캘란'), [])
+        self.assertEqual(self.indexed('글렌피딕'), [item.pk])
+
+        # 검색 대상이 아닌 열만 바뀌면 트리거가 실행되지 않아도 색인은 그대로
+        MenuItem.objects.filter(pk=item.pk).update(price='12000')
+        self.assertEqual(self.indexed('글렌피딕'), [item.pk])
+
+        item.delete()
+        self.assertEqual(self.indexed('글렌피딕'), [])
+        self.assertEqual(self.indexed('셰리 캐'), [])
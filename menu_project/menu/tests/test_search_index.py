@@ -0,0 +1,50 @@
+from django.test import TestCase
+
+from menu.models import Category, MenuItem, Restaurant
+from menu.search_index import get_search_index, substring_distance
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='search')
+        self.whisky = Category.objects.create(restaurant=self.restaurant, name='위스키')
+        self.macallan = self.item('맥캘란 12년', name_en='Macallan 12')
+        self.glenfiddich = self.item('글렌피딕', name_en='Glenfiddich', description='맥캘란과 비슷한 스페이사이드')
+        self.highball = self.item('맥캘란 하이볼')
+
+    def item(self, name, **fields):
+        return MenuItem.objects.create(
+            restaurant=self.restaurant, category=self.whisky, name=name, price='10000', **fields
+        )
+
+    def search(self, query, **kwargs):
+        index, _ = get_search_index(self.restaurant)
+        return [obj for _, _, obj in index.search(query, **kwargs)]
+
+    def test_chosung_query(self):
+        self.assertEqual(self.search('ㅇㅅㅋ'), [self.whisky])
+        self.assertEqual(self.search('ㄱㄹㅍ'), [self.glenfiddich])
+
+    def test_short_korean_typo(self):
+        # 3글자 query 는 편집 1회로 2-gram 이 모두 깨짐 ("맥켈" "켈란" vs "맥캘" "캘란")
+        self.assertEqual(self.search('맥켈란', kind='menu'), [self.macallan, self.highball])
+
+    def test_english_typo(self):
+        self.assertEqual(self.search('glenfidich'), [self.glenfiddich])
+
+    def test_exact_match_ranks_above_typo_and_description(self):
+        results = self.search('맥캘란', kind='menu')
+        # 메뉴명 앞부분 일치 > 설명 일치
+        self.assertEqual(results, [self.macallan, self.highball, self.glenfiddich])
+
+        # 일치 결과가 있으면 오타 결과보다 먼저
+        self.item('맥켈란 토닉')
+        results = self.search('맥켈란', kind='menu', limit=5)
+        self.assertEqual(results[0].name, '맥켈란 토닉')
+
+    def test_substring_distance(self):
+        self.assertEqual(substring_distance('맥켈란', '맥캘란12년', 2), 1)
+        self.assertEqual(substring_distance('macalan', 'themacallan', 2), 1)
+        self.assertEqual(substring_distance('abc', 'xyz', 1), 2)
+        self.assertEqual(substring_distance('abc', '', 2), 3)
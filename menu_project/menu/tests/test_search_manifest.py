@@ -0,0 +1,60 @@
+import json
+
+from django.test import TestCase, override_settings
+
+from menu.models import Category, MenuItem, Restaurant
+from menu.search_manifest import get_search_manifest
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class SearchManifestViewTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='manifest')
+        self.category = Category.objects.create(restaurant=self.restaurant, name='위스키')
+        self.item = MenuItem.objects.create(
+            restaurant=self.restaurant, category=self.category, name='맥캘란', price='10000',
+        )
+
+    def url(self, version):
+        return f'/manifest/api/search/manifest/{version}.json'
+
+    def test_page_links_current_version(self):
+        version = get_search_manifest(self.restaurant).version
+        self.assertContains(self.client.get('/manifest/'), self.url(version))
+
+        # 메뉴가 바뀌면 새 버전 URL
+        self.item.name = '글렌피딕'
+        self.item.save()
+        new_version = get_search_manifest(self.restaurant).version
+        self.assertNotEqual(new_version, version)
+        self.assertContains(self.client.get('/manifest/'), self.url(new_version))
+
+    def test_current_version_is_immutable(self):
+        version = get_search_manifest(self.restaurant).version
+        response = self.client.get(self.url(version))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['ETag'], f'"{version}"')
+        data = json.loads(response.content)
+        self.assertEqual([row[1] for row in data['m']], ['맥캘란'])
+
+    def test_etag_revalidation(self):
+        version = get_search_manifest(self.restaurant).version
+        response = self.client.get(self.url(version), HTTP_IF_NONE_MATCH=f'"{version}"')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_stale_version_gets_current_manifest_uncached(self):
+        old_version = get_search_manifest(self.restaurant).version
+        self.item.name = '글렌피딕'
+        self.item.save()
+
+        response = self.client.get(self.url(old_version), HTTP_IF_NONE_MATCH=f'"{old_version}"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertEqual(response['ETag'], f'"{get_search_manifest(self.restaurant).version}"')
+        self.assertEqual([row[1] for row in json.loads(response.content)['m']], ['글렌피딕'])
@@ -0,0 +1,38 @@
+from unittest import mock
+
+from django.template.loader import render_to_string as real_render_to_string
+from django.test import TestCase, override_settings
+
+from menu.models import Category, Restaurant
+from menu.templatetags import menu_tags
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class SideMenuFragmentTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='side')
+        self.beer = Category.objects.create(restaurant=self.restaurant, name='맥주')
+        self.wine = Category.objects.create(restaurant=self.restaurant, name='와인')
+
+    def fragment_renders(self, url):
+        with mock.patch.object(menu_tags, 'render_to_string', wraps=real_render_to_string) as render:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, [c for c in render.call_args_list if c.args[0] == 'menu/_side_menu.html']
+
+    def test_rendered_once_per_snapshot(self):
+        _, calls = self.fragment_renders('/side/')
+        self.assertEqual(len(calls), 1)
+        response, calls = self.fragment_renders(f'/side/category/{self.beer.pk}/')
+        self.assertEqual(calls, [])
+        # 현재 카테고리 강조는 캐시된 조각에 요청마다 적용
+        self.assertContains(response, f'data-category-id="{self.beer.pk}" class="current"')
+        self.assertNotContains(response, f'data-category-id="{self.wine.pk}" class="current"')
+
+    def test_rerendered_after_category_change(self):
+        self.fragment_renders('/side/')
+        Category.objects.create(restaurant=self.restaurant, name='위스키')
+        response, calls = self.fragment_renders('/side/')
+        self.assertEqual(len(calls), 1)
+        self.assertContains(response, '위스키')
@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from menu import snapshot
+from menu.models import Category, MenuItem, Restaurant
+from menu.snapshot import MenuSnapshot, get_snapshot
+
+
+class MenuSnapshotTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='snap')
+        self.category = Category.objects.create(restaurant=self.restaurant, name='맥주')
+        self.item = MenuItem.objects.create(restaurant=self.restaurant, category=self.category, name='라거', price='5000')
+
+    def test_warm_snapshot_needs_no_queries(self):
+        warm = get_snapshot(self.restaurant)
+        with self.assertNumQueries(0):
+            self.assertIs(get_snapshot(self.restaurant), warm)
+        self.assertEqual([item.pk for item in warm.get_items(self.category.pk)], [self.item.pk])
+
+    def test_save_and_delete_invalidate(self):
+        before = get_snapshot(self.restaurant)
+        ale = MenuItem.objects.create(restaurant=self.restaurant, category=self.category, name='에일', price='6000')
+        after = get_snapshot(self.restaurant)
+        self.assertIsNot(after, before)
+        self.assertEqual({item.pk for item in after.get_items(self.category.pk)}, {self.item.pk, ale.pk})
+
+        ale.delete()
+        self.assertEqual([item.pk for item in get_snapshot(self.restaurant).get_items(self.category.pk)], [self.item.pk])
+
+    def test_queryset_update_needs_explicit_invalidate(self):
+        before = get_snapshot(self.restaurant)
+        MenuItem.objects.filter(pk=self.item.pk).update(is_available=False)
+        self.assertIs(get_snapshot(self.restaurant), before)
+        snapshot.invalidate(self.restaurant.pk)
+        self.assertEqual(get_snapshot(self.restaurant).get_items(self.category.pk), ())
+
+    def test_other_restaurant_is_not_invalidated(self):
+        other = Restaurant.objects.create(name='다른 가게', slug='other')
+        before = get_snapshot(other)
+        MenuItem.objects.create(restaurant=self.restaurant, category=self.category, name='에일', price='6000')
+        self.assertIs(get_snapshot(other), before)
+
+    def test_invalidate_bumps_shared_version_key(self):
+        key = snapshot.VERSION_KEY.format(self.restaurant.pk)
+        before = get_snapshot(self.restaurant)
+        version = cache.get(key, 0)
+        snapshot.invalidate(self.restaurant.pk)
+        self.assertEqual(cache.get(key), version + 1)
+
+        # 다른 워커가 버전을 올린 경우: 이 프로세스의 스냅샷도 다시 만듦
+        snapshot._snapshots[self.restaurant.pk] = before
+        self.assertIsNot(get_snapshot(self.restaurant), before)
+        self.assertEqual(get_snapshot(self.restaurant).version, version + 1)
+
+    def test_concurrent_misses_build_once(self):
+        snapshot.invalidate(self.restaurant.pk)
+        calls = []
+
+        def slow_build(restaurant_id, version):
+            calls.append(restaurant_id)
+            time.sleep(0.05)
+            return MenuSnapshot(restaurant_id, version, None, [], [])
+
+        results = []
+        with mock.patch('menu.snapshot._build', side_effect=slow_build):
+            threads = [
+                threading.Thread(target=lambda: results.append(get_snapshot(self.restaurant.pk)))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MenuPageQueryTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='pages')
+        self.parent = Category.objects.create(restaurant=self.restaurant, name='주류')
+        self.category = Category.objects.create(restaurant=self.restaurant, name='맥주', parent=self.parent)
+        MenuItem.objects.create(restaurant=self.restaurant, category=self.category, name='라거', price='5000')
+
+    def test_warm_pages_need_no_queries(self):
+        for url in ('/pages/', f'/pages/category/{self.parent.pk}/', f'/pages/category/{self.category.pk}/'):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '라거')
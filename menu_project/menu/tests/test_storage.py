@@ -0,0 +1,40 @@
+import errno
+import os
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from menu.storage import ContentAddressedStorage, is_content_addressed
+
+from .base import MediaTestCase, png
+
+
+class ContentAddressedStorageTests(MediaTestCase):
+
+    def test_same_content_is_stored_once(self):
+        first = default_storage.save('menu_images/a.png', ContentFile(png()))
+        second = default_storage.save('menu_images/b.PNG', ContentFile(png()))
+        self.assertEqual(first, second)
+        self.assertTrue(is_content_addressed(first))
+        self.assertTrue(first.endswith('.png'))
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'menu_images')), [os.path.basename(first)])
+
+    def test_concurrent_save_of_same_content_reuses_file(self):
+        storage = ContentAddressedStorage()
+        name = storage.save('menu_images/a.png', ContentFile(png()))
+        # 다른 프로세스가 존재 확인과 링크 사이에 같은 파일을 만든 상황
+        with mock.patch('menu.storage.os.path.exists', return_value=False):
+            self.assertEqual(storage.save('menu_images/a.png', ContentFile(png())), name)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'menu_images')), [os.path.basename(name)])
+
+    def test_filesystem_without_hard_links(self):
+        storage = ContentAddressedStorage()
+        with mock.patch('menu.storage.os.link', side_effect=OSError(errno.EPERM, 'Operation not permitted')):
+            name = storage.save('menu_images/a.png', ContentFile(png()))
+
+        self.assertTrue(is_content_addressed(name))
+        with storage.open(name, 'rb') as f:
+            self.assertEqual(f.read(), png())
+        # 임시 파일이 남지 않음
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'menu_images')), [os.path.basename(name)])
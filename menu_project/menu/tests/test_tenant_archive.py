@@ -0,0 +1,77 @@
+import os
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from menu.models import Category, MediaBlob, MenuItem, Restaurant
+from menu.tenant_archive import export_restaurant, import_restaurant
+
+from .base import MediaTestCase, png
+
+
+class RestaurantArchiveTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.source = Restaurant.objects.create(name='원본', slug='src')
+        site_settings = self.source.site_settings.get()
+        site_settings.background_color = '#101010'
+        site_settings.save()
+        self.parent = Category.objects.create(restaurant=self.source, name='음료')
+        self.child = Category.objects.create(restaurant=self.source, name='커피', parent=self.parent)
+        self.item = MenuItem.objects.create(
+            restaurant=self.source, category=self.child, name='라떼', price='5000',
+            menu_image=ContentFile(png(), name='latte.png'),
+        )
+        self.image = MenuItem.objects.get(pk=self.item.pk).menu_image.name
+        self.archive = os.path.join(self.media_root, 'src.tar.gz')
+
+    def test_round_trip_into_new_restaurant(self):
+        stats = export_restaurant(self.source, self.archive)
+        self.assertEqual(stats['counts']['menu.menuitem'], 1)
+        self.assertEqual(stats['media_files'], 1)
+
+        restaurant, stats = import_restaurant(self.archive, slug='dst', name='사본')
+        self.assertEqual(restaurant.name, '사본')
+        self.assertEqual(stats['counts'], {
+            'menu.restaurant': 1, 'menu.sitesettings': 1, 'menu.category': 2, 'menu.menuitem': 1,
+        })
+        self.assertEqual(restaurant.site_settings.get().background_color, '#101010')
+
+        item = MenuItem.objects.select_related('category__parent').get(restaurant=restaurant)
+        self.assertEqual(item.category.name, '커피')
+        self.assertEqual(item.category.restaurant_id, restaurant.pk)
+        self.assertEqual(item.category.parent.name, '음료')
+        self.assertEqual(item.category.path, f"{item.category.parent_id}/{item.category_id}/")
+        self.assertEqual(item.menu_image.name, self.image)
+        self.assertEqual(MediaBlob.objects.get(name=self.image).refcount, 2)
+
+    def test_import_restores_missing_media(self):
+        export_restaurant(self.source, self.archive)
+        os.remove(os.path.join(self.media_root, self.image))
+        restaurant, _ = import_restaurant(self.archive, slug='dst')
+        self.assertTrue(default_storage.exists(MenuItem.objects.get(restaurant=restaurant).menu_image.name))
+
+    def test_existing_slug_is_rejected(self):
+        export_restaurant(self.source, self.archive)
+        with self.assertRaises(ValueError):
+            import_restaurant(self.archive)
+
+    def test_invalid_slug_is_rejected_before_anything_is_written(self):
+        export_restaurant(self.source, self.archive)
+        os.remove(os.path.join(self.media_root, self.image))
+
+        for slug in ('새 가게', 'a/b', 'x' * 51):
+            with self.subTest(slug=slug), self.assertRaises(ValueError):
+                import_restaurant(self.archive, slug=slug)
+        self.assertEqual(Restaurant.objects.count(), 1)
+        # 미디어 파일도 저장하지 않음
+        self.assertFalse(default_storage.exists(self.image))
+
+    def test_command_reports_invalid_slug(self):
+        export_restaurant(self.source, self.archive)
+        with self.assertRaisesMessage(CommandError, '50자 이하'):
+            call_command('import_restaurant', self.archive, '--slug', 'x' * 51, stdout=StringIO())
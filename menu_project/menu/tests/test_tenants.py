@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from menu import tenants
+from menu.models import Category, MenuItem, Restaurant
+
+
+class TenantCacheTests(TestCase):
+
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name='가게', slug='tenant')
+
+    def test_hit_needs_no_queries(self):
+        tenant = tenants.get_tenant('tenant')
+        self.assertEqual(tenant.restaurant.pk, self.restaurant.pk)
+        self.assertEqual(tenant.site_settings.restaurant_id, self.restaurant.pk)
+        with self.assertNumQueries(0):
+            self.assertIs(tenants.get_tenant('tenant'), tenant)
+
+    def test_unknown_slug_is_cached(self):
+        self.assertIsNone(tenants.get_tenant('nope'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(tenants.get_tenant('nope'))
+
+        # 새로 만든 매장은 negative 캐시를 지움
+        Restaurant.objects.create(name='새 가게', slug='nope')
+        self.assertEqual(tenants.get_tenant('nope').restaurant.slug, 'nope')
+
+    @override_settings(TENANT_NEGATIVE_TTL=0)
+    def test_negative_entry_expires(self):
+        self.assertIsNone(tenants.get_tenant('gone'))
+        with self.assertNumQueries(1):
+            self.assertIsNone(tenants.get_tenant('gone'))
+
+    def test_restaurant_and_settings_save_invalidate(self):
+        tenant = tenants.get_tenant('tenant')
+        self.restaurant.name = '바뀐 가게'
+        self.restaurant.save()
+        tenant = tenants.get_tenant('tenant')
+        self.assertEqual(tenant.restaurant.name, '바뀐 가게')
+
+        site_settings = tenant.site_settings
+        site_settings.background_color = '#000000'
+        site_settings.save()
+        self.assertEqual(tenants.get_tenant('tenant').site_settings.background_color, '#000000')
+
+    def test_other_worker_invalidation_is_seen_through_version_key(self):
+        tenant = tenants.get_tenant('tenant')
+        cache.incr(tenants.VERSION_KEY.format(self.restaurant.pk))
+        self.assertIsNot(tenants.get_tenant('tenant'), tenant)
+
+    def test_menu_changes_keep_tenant_entry(self):
+        tenant = tenants.get_tenant('tenant')
+        category = Category.objects.create(restaurant=self.restaurant, name='맥주')
+        MenuItem.objects.create(restaurant=self.restaurant, category=category, name='라거', price='5000')
+        self.assertIs(tenants.get_tenant('tenant'), tenant)
@@ -0,0 +1,43 @@
+from django.test import TestCase, override_settings
+
+from menu import snapshot
+from menu.models import Restaurant, SiteSettings
+from menu.theme import compile_theme, theme_hash
+
+
+class ThemeTests(TestCase):
+
+    def setUp(self):
+        self.site_settings = Restaurant.objects.create(name='가게', slug='theme').site_settings.get()
+        self.site_settings.menu_name_font.name = 'fonts/' + 'a' * 64 + '.ttf'
+
+    def test_uploaded_font_is_applied(self):
+        css = compile_theme(self.site_settings)
+        self.assertIn("@font-face{font-family:'MenuNameFont'", css)
+        self.assertIn(".menu-name-ko{font-family:'MenuNameFont',sans-serif!important}", css)
+
+    def test_subset_font_is_applied(self):
+        subset = 'fonts/subsets/' + 'b' * 64 + '.woff2'
+        self.site_settings.font_subsets = {
+            'menu_name': {'src': self.site_settings.menu_name_font.name, 'name': subset, 'chars': '라거'},
+        }
+        css = compile_theme(self.site_settings)
+        self.assertIn(f"{subset}') format('woff2')", css)
+        self.assertIn(".menu-name-ko{font-family:'MenuNameFont',sans-serif!important}", css)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class LazyThemeHashTests(TestCase):
+
+    def test_blank_hash_is_filled_on_first_render(self):
+        restaurant = Restaurant.objects.create(name='가게', slug='lazy-theme')
+        # 0032 마이그레이션 이전부터 있던 행 (theme_hash 비어 있음)
+        SiteSettings.objects.filter(restaurant=restaurant).update(theme_hash='')
+        snapshot.invalidate(restaurant.pk)
+
+        response = self.client.get('/lazy-theme/')
+
+        site_settings = SiteSettings.objects.get(restaurant=restaurant)
+        expected = theme_hash(compile_theme(site_settings))
+        self.assertEqual(site_settings.theme_hash, expected)
+        self.assertContains(response, f'/lazy-theme/theme/{expected}.css')
@@ -0,0 +1,98 @@
+"""
+SiteSettings -> 레스토랑 테마 스타일시트 컴파일러
+
+- 템플릿마다 수십 개의 <style> 블록을 찍던 것을 하나의 압축된 CSS로 생성
+- 내용 해시(theme_hash)를 파일명으로 사용하여 브라우저에서 영구 캐시 (immutable)
+- SiteSettings.save() 시 해시가 다시 계산됨
+- 폰트는 서브셋(WOFF2, menu/fonts.py)이 준비되어 있으면 서브셋을 사용
+"""
+import hashlib
+
+from .fonts import current_subset
+
+# (설정 필드 접두사, font-family 이름, 적용 셀렉터)
+TEXT_ROLES = (
+    ('category_name', 'CategoryNameFont', '.category-name-ko,.manual-card h3'),
+    ('category_name_en', 'CategoryNameEnFont', '.category-name-en'),
+    ('menu_name', 'MenuNameFont', '.menu-name-ko'),
+    ('menu_name_en', 'MenuNameEnFont', '.menu-name-en'),
+    ('menu_price', 'MenuPriceFont', '.menu-price'),
+    ('menu_description', 'MenuDescFont', '.menu-description'),
+    ('menu_notes', 'MenuNotesFont', '.menu-notes'),
+)
+
+# (색상 필드, 적용 셀렉터)
+CARD_COLORS = (
+    ('category_card_color', '.category-card'),
+    ('menu_card_color', '.menu-item'),
+)
+
+
+def _clean(value):
+    """CSS 선언을 깨뜨릴 수 있는 문자 제거"""
+    return ''.join(ch for ch in str(value) if ch not in ';{}<>\'"\\\n\r')
+
+
+def _file_url(field_file):
+    if field_file and field_file.name:
+        return _clean(field_file.url)
+    return None
+
+
+def font_face(family, url, fmt=None):
+    # font-display:swap - 폰트를 받는 동안 기본 글꼴로 먼저 표시
+    src = f"url('{url}') format('{fmt}')" if fmt else f"url('{url}')"
+    return f"@font-face{{font-family:'{family}';src:{src};font-display:swap}}"
+
+
+def compile_theme(site_settings):
+    """
+    SiteSettings 한 행을 압축된 CSS 문자열로 변환
+    """
+    rules = []
+
+    side_image_url = _file_url(site_settings.side_image)
+    if side_image_url:
+        rules.append(
+            f"body.has-side-image{{background-image:url('{side_image_url}');"
+            "background-size:cover;background-position:center;background-attachment:fixed}"
+        )
+
+    for prefix, family, selector in TEXT_ROLES:
+        declarations = []
+
+        font_file = getattr(site_settings, f'{prefix}_font')
+        subset = current_subset(site_settings, prefix)
+        font_url = _file_url(font_file)
+        if subset is not None:
+            rules.append(font_face(family, _clean(font_file.storage.url(subset['name'])), 'woff2'))
+        elif font_url:
+            rules.append(font_face(family, font_url))
+        if subset is not None or font_url:
+            declarations.append(f"font-family:'{family}',sans-serif!important")
+
+        color = getattr(site_settings, f'{prefix}_color')
+        if color:
+            declarations.append(f"color:{_clean(color)}!important")
+        size = getattr(site_settings, f'{prefix}_size')
+        if size:
+            declarations.append(f"font-size:{int(size)}px!important")
+        if getattr(site_settings, f'{prefix}_bold'):
+            declarations.append("font-weight:bold!important")
+        if getattr(site_settings, f'{prefix}_italic'):
+            declarations.append("font-style:italic!important")
+
+        if declarations:
+            rules.append(f"{selector}{{{';'.join(declarations)}}}")
+
+    for field, selector in CARD_COLORS:
+        color = getattr(site_settings, field)
+        if color:
+            color = _clean(color)
+            rules.append(f"{selector}{{background-color:{color}!important;border-color:{color}!important}}")
+
+    return '\n'.join(rules)
+
+
+def theme_hash(css):
+    return hashlib.sha256(css.encode('utf-8')).hexdigest()[:16]
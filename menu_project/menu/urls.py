@@ -9,15 +9,18 @@ app_name = 'menu'
 urlpatterns = [
     path('', views.menu_main, name='menu_main'),
     path('category/<int:category_id>/', views.menu_list, name='menu_list'),
+    path('theme/<str:theme_hash>.css', views.theme_css, name='theme_css'),
     
     # API for AJAX search (will be removed from templates but kept for now)
     path('api/search/', search_views.search_api, name='search_api'),
+    path('api/search/manifest/<str:version>.json', search_views.search_manifest, name='search_manifest'),
     
     # New server-side search
     path('search/', search_views.search_redirect_view, name='search_redirect'),
     
     # QR Code
     path('qr/', qr_views.generate_qr_code, name='qr_code'),
+    path('qr/<str:key>.<str:fmt>', qr_views.qr_image, name='qr_image'),
     
     # Admin Views
     path('admin/login/', admin_views.admin_login, name='admin_login'),
@@ -29,4 +32,5 @@ urlpatterns = [
     path('admin/menu/add/', admin_views.add_menu, name='add_menu'),
     path('admin/menu/edit/<int:menu_id>/', admin_views.edit_menu, name='edit_menu'),
     path('admin/menu/delete/<int:menu_id>/', admin_views.delete_menu, name='delete_menu'),
+    path('admin/menu/batch/', admin_views.menu_batch, name='menu_batch'),
 ]
\ No newline at end of file
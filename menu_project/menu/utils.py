@@ -1,73 +1,159 @@
 from PIL import Image
 from io import BytesIO
 from django.core.files.uploadedfile import InMemoryUploadedFile
+import hashlib
 import os
+import re
 
-def optimize_image(image_field, max_width=1200, quality=85):
-    """이미지 최적화: 리사이즈 및 압축 (원본 포맷 유지)"""
-    if not image_field:
-        return image_field
-    
-    try:
-        # Context Manager를 사용하여 파일 핸들 자동 닫기
-        with Image.open(image_field) as img:
-            original_format = img.format or 'JPEG'
-            file_ext = os.path.splitext(image_field.name)[1].lower()
+# Django 가 이름 충돌 시 붙이는 '_xxxxxxx' (7자) 접미사
+RANDOM_SUFFIX_RE = re.compile(r'(_[a-zA-Z0-9]{7})+$')
+
+
+def file_sha256(f):
+    """파일(업로드 파일/FieldFile) 내용의 SHA-256 (읽은 뒤 처음 위치로 되돌림)"""
+    digest = hashlib.sha256()
+    f.seek(0)
+    for chunk in f.chunks():
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def strip_random_suffix(name):
+    """
+    'side_PuzMYKm_YLzxm31.png' -> 'side.png'
+    다시 저장할 때마다 접미사가 하나씩 늘어나는 것을 방지
+    """
+    root, ext = os.path.splitext(name)
+    directory, base = os.path.split(root)
+    base = RANDOM_SUFFIX_RE.sub('', base) or base
+    return os.path.join(directory, base + ext)
+
+def downscale(img, max_width):
+    """
+    max_width 로 축소 (더 작으면 그대로)
+    큰 이미지는 reduce() 로 정수배 축소한 뒤 LANCZOS 로 마무리 (전체 해상도에서 리샘플링하지 않음)
+    """
+    if img.width <= max_width:
+        return img
+    new_height = int(img.height * max_width / img.width)
+    factor = img.width // (max_width * 2)
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+
+
+def encode_optimized(image_field, max_width=1200, quality=85):
+    """
+    이미지 리사이즈 및 압축 (원본 포맷 유지, 실패 시 예외 발생)
+    이미지 최적화 작업(image_jobs.py)은 예외로 재시도 여부를 판단
+    """
+    # Context Manager를 사용하여 파일 핸들 자동 닫기
+    with Image.open(image_field) as img:
+        original_format = img.format or 'JPEG'
+        if original_format == 'JPEG' and img.width > max_width * 2:
+            # JPEG 는 디코딩 단계에서 1/2~1/8 로 축소 (최종 크기의 2배 이상은 유지)
+            img.draft(None, (max_width * 2, img.height * max_width * 2 // img.width))
+        file_ext = os.path.splitext(image_field.name)[1].lower()
+        
+        # 원본 파일명 유지
+        original_name = image_field.name
+        
+        # PNG 또는 투명도가 있는 이미지는 그대로 유지
+        if original_format == 'PNG' or img.mode in ('RGBA', 'LA', 'P'):
+            if img.mode == 'P':
+                img = img.convert('RGBA')
             
-            # 원본 파일명 유지
-            original_name = image_field.name
+            # 리사이즈
+            img = downscale(img, max_width)
             
-            # PNG 또는 투명도가 있는 이미지는 그대로 유지
-            if original_format == 'PNG' or img.mode in ('RGBA', 'LA', 'P'):
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                
-                # 리사이즈
-                if img.width > max_width:
-                    ratio = max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-                
-                # PNG로 저장
-                output = BytesIO()
-                img.save(output, format='PNG', optimize=True)
-                output.seek(0)
-                
-                return InMemoryUploadedFile(
-                    output, 'ImageField',
-                    original_name,
-                    'image/png',
-                    output.getbuffer().nbytes, None
-                )
+            # PNG로 저장
+            output = BytesIO()
+            img.save(output, format='PNG', optimize=True)
+            output.seek(0)
             
-            # JPEG 또는 기타 포맷
-            else:
-                # RGB로 변환
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # 리사이즈
-                if img.width > max_width:
-                    ratio = max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-                
-                # JPEG로 저장
+            return InMemoryUploadedFile(
+                output, 'ImageField',
+                original_name,
+                'image/png',
+                output.getbuffer().nbytes, None
+            )
+        
+        # JPEG 또는 기타 포맷
+        else:
+            # RGB로 변환
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            # 리사이즈
+            img = downscale(img, max_width)
+            
+            # JPEG로 저장
+            output = BytesIO()
+            img.save(output, format='JPEG', quality=quality, optimize=True)
+            output.seek(0)
+            
+            # 확장자가 jpg/jpeg가 아니면 .jpg로 변경
+            if file_ext not in ['.jpg', '.jpeg']:
+                original_name = f"{os.path.splitext(original_name)[0]}.jpg"
+            
+            return InMemoryUploadedFile(
+                output, 'ImageField',
+                original_name,
+                'image/jpeg',
+                output.getbuffer().nbytes, None
+            )
+
+
+# 반응형 파생본 포맷: 키 -> (Pillow 포맷, MIME 타입, 확장자)
+VARIANT_FORMATS = {
+    'avif': ('AVIF', 'image/avif', '.avif'),
+    'webp': ('WEBP', 'image/webp', '.webp'),
+    'png': ('PNG', 'image/png', '.png'),
+    'jpeg': ('JPEG', 'image/jpeg', '.jpg'),
+}
+
+
+def variant_widths(width, ladder):
+    """원본보다 작은 단계 + 원본 너비: (160, 320, 640, 1200), 800 -> [160, 320, 640, 800]"""
+    return sorted({w for w in ladder if w < width} | {width})
+
+
+def encode_variants(image_field, ladder, quality=80, formats=('avif', 'webp')):
+    """
+    최적화된 이미지를 너비 단계별로 줄여 formats + 원본 포맷으로 인코딩
+    반환: (너비, 높이, 원본 포맷 키, [(포맷 키, 너비, 파일), ...])
+    원본 포맷의 원본 너비는 image_field 자신이므로 만들지 않음
+    """
+    image_field.seek(0)
+    with Image.open(image_field) as img:
+        source_format = 'png' if img.format == 'PNG' else 'jpeg'
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        has_alpha = img.mode in ('RGBA', 'LA')
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+        width, height = img.size
+
+        root = os.path.splitext(image_field.name)[0]
+        variants = []
+        for w in variant_widths(width, ladder):
+            resized = img if w == width else img.resize((w, max(1, round(height * w / width))), Image.Resampling.LANCZOS)
+            for key in (*formats, source_format):
+                if key == source_format and w == width:
+                    continue
+                pil_format, content_type, ext = VARIANT_FORMATS[key]
+                frame = resized.convert('RGB') if key == 'jpeg' else resized
                 output = BytesIO()
-                img.save(output, format='JPEG', quality=quality, optimize=True)
+                if key == 'png':
+                    frame.save(output, format=pil_format, optimize=True)
+                else:
+                    frame.save(output, format=pil_format, quality=quality)
                 output.seek(0)
-                
-                # 확장자가 jpg/jpeg가 아니면 .jpg로 변경
-                if file_ext not in ['.jpg', '.jpeg']:
-                    original_name = f"{os.path.splitext(original_name)[0]}.jpg"
-                
-                return InMemoryUploadedFile(
+                variants.append((key, w, InMemoryUploadedFile(
                     output, 'ImageField',
-                    original_name,
-                    'image/jpeg',
+                    f"{root}_{w}w{ext}",
+                    content_type,
                     output.getbuffer().nbytes, None
-                )
-    except Exception as e:
-        # 최적화 실패 시 원본 반환
-        print(f"Image optimization failed: {e}")
-        return image_field
+                )))
+    image_field.seek(0)
+    return width, height, source_format, variants
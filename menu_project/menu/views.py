@@ -1,7 +1,11 @@
-from django.shortcuts import render, get_object_or_404
-from django.db.models import Case, When, IntegerField, Q
-from django.http import JsonResponse
-from .models import MenuItem, Category, SiteSettings, Restaurant
+from django.shortcuts import render
+from django.http import Http404, HttpResponse
+from .models import Restaurant
+from .snapshot import get_snapshot
+from .theme import compile_theme, theme_hash as compute_theme_hash
+
+# 레스토랑 id -> (테마 해시, CSS)
+_theme_cache = {}
 
 def index_view(request):
     """
@@ -10,122 +14,75 @@ def index_view(request):
     restaurants = Restaurant.objects.all().order_by('name')
     return render(request, 'menu/index.html', {'restaurants': restaurants})
 
-def get_breadcrumb_path(category):
-    """카테고리의 전체 경로를 생성"""
-    path = []
-    current = category
-    while current:
-        path.insert(0, current)
-        current = current.parent
-    return path
-
 def menu_main(request, restaurant_slug=None):
-    # 최상위 카테고리만 가져오기 (parent가 None인 카테고리)
-    # 현재 레스토랑 데이터만 필터링
-    top_categories = Category.objects.filter(
-        parent=None, 
-        restaurant=request.restaurant
-    ).distinct().order_by('priority', 'name')
-    
-    # 사이드 메뉴를 위해 모든 카테고리 가져오기
-    # N+1 문제 해결: 사이드 메뉴 렌더링 시 sub_categories 접근함
-    all_categories = Category.objects.filter(
-        restaurant=request.restaurant
-    ).prefetch_related('sub_categories').distinct().order_by('priority', 'name')
-    
-    # 사이트 설정에서 인트로 이미지 가져오기
-    site_settings = SiteSettings.objects.filter(restaurant=request.restaurant).first()
-    
+    # 레스토랑 메뉴 스냅샷 (캐시가 따뜻하면 DB 쿼리 없음)
+    snapshot = get_snapshot(request.restaurant)
+
     return render(request, 'menu/menu_main.html', {
-        'categories': top_categories,
-        'all_categories': all_categories,
-        'site_settings': site_settings
+        # 최상위 카테고리만 (parent가 None인 카테고리)
+        'categories': snapshot.top_categories,
+        'site_settings': snapshot.site_settings
     })
 
 def menu_list(request, category_id, restaurant_slug=None):
-    # 선택된 카테고리 (현재 레스토랑의 것인지 확인)
-    # N+1 문제 해결: 템플릿에서 sub_categories 접근 가능성 있음
-    category = get_object_or_404(
-        Category.objects.prefetch_related('sub_categories'),
-        id=category_id, 
-        restaurant=request.restaurant
-    )
-    
-    # 하위 카테고리 목록 (이미 prefetch 되었지만 명시적 쿼리셋이 필요할 경우를 위해 유지, 
-    # 하지만 category.sub_categories.all()은 DB 히트 없이 캐시된 결과 사용 가능할 수 있음.
-    # 단, .all()은 새로운 쿼리셋을 반환하므로 prefetch 결과를 쓰려면 .all() 대신 속성 접근 필요.
-    # 여기서는 명시적 쿼리가 정렬 등을 위해 안전함)
-    sub_categories = category.sub_categories.all().order_by('priority', 'name')
-    breadcrumb_path = get_breadcrumb_path(category)
-    
-    # 모든 카테고리 가져오기 (사이드 메뉴용)
-    all_categories = Category.objects.filter(
-        restaurant=request.restaurant
-    ).prefetch_related('sub_categories').distinct().order_by('priority', 'name')
-    
-    # 사이트 설정 가져오기
-    site_settings = SiteSettings.objects.filter(restaurant=request.restaurant).first()
-    
+    snapshot = get_snapshot(request.restaurant)
+
+    # 선택된 카테고리 (스냅샷은 현재 레스토랑 데이터만 포함)
+    category = snapshot.get_category(category_id)
+    if category is None:
+        raise Http404("카테고리를 찾을 수 없습니다.")
+
+    sub_categories = snapshot.get_children(category.id)
+    breadcrumb_path = snapshot.get_breadcrumb_path(category)
+
     # 하위 카테고리가 있으면 카테고리 페이지, 없으면 메뉴 페이지
-    if sub_categories.exists():
+    if sub_categories:
         # 하위 카테고리가 있는 경우 - 카테고리 선택 페이지
         return render(request, 'menu/category_list.html', {
             'category': category,
             'categories': sub_categories,
             'breadcrumb_path': breadcrumb_path,
-            'all_categories': all_categories,
-            'site_settings': site_settings
+            'site_settings': snapshot.site_settings
         })
     else:
-        # 최하위 카테고리인 경우 - 메뉴 표시 (우선순위 순으로 정렬)
-        # N+1 문제 해결: 메뉴 아이템 조회 시 필요한 관계가 있다면 select_related 추가
-        items = MenuItem.objects.filter(
-            category=category, 
-            is_available=True,
-            restaurant=request.restaurant
-        ).order_by('priority', 'name')
-        
-        # 순환 연결리스트: 모든 메뉴 아이템이 있는 카테고리를 하나의 리스트로 만들기
-        # 우선순위와 이름 순으로 정렬하여 일관된 순서 보장
-        all_menu_categories = Category.objects.filter(
-            menu_items__is_available=True,
-            restaurant=request.restaurant
-        ).distinct().order_by('priority', 'name')
-        
-        # 순환 리스트로 변환
-        menu_categories_list = list(all_menu_categories)
-        
-        # 현재 카테고리 인덱스 찾기
-        current_index = None
-        for i, cat in enumerate(menu_categories_list):
-            if cat.id == category.id:
-                current_index = i
-                break
-        
-        # 순환 연결리스트 방식으로 다음/이전 카테고리 찾기
-        prev_category = None
-        next_category = None
-        
-        if current_index is not None and len(menu_categories_list) > 0:
-            # 다음 카테고리: 현재 인덱스 + 1 (마지막이면 첫 번째로)
-            next_index = (current_index + 1) % len(menu_categories_list)
-            next_category = menu_categories_list[next_index]
-            
-            # 이전 카테고리: 현재 인덱스 - 1 (첫 번째이면 마지막으로)
-            prev_index = (current_index - 1 + len(menu_categories_list)) % len(menu_categories_list)
-            prev_category = menu_categories_list[prev_index]
-            
-            # 자기 자신만 있는 경우는 None 처리
-            if len(menu_categories_list) == 1:
-                prev_category = None
-                next_category = None
-        
+        # 최하위 카테고리인 경우 - 메뉴 표시 (우선순위 순으로 정렬된 판매 가능 메뉴)
+        items = snapshot.get_items(category.id)
+
+        # 순환 연결리스트: 판매 가능한 메뉴가 있는 카테고리들 중 이전/다음
+        # (자기 자신만 있는 경우는 None)
+        prev_category, next_category = snapshot.get_neighbours(category.id)
+
         return render(request, 'menu/menu_list.html', {
             'category': category,
             'items': items,
             'breadcrumb_path': breadcrumb_path,
-            'all_categories': all_categories,
-            'site_settings': site_settings,
+            'site_settings': snapshot.site_settings,
             'prev_category': prev_category,
             'next_category': next_category
-        })
\ No newline at end of file
+        })
+
+
+def theme_css(request, theme_hash, restaurant_slug=None):
+    """
+    레스토랑 테마 스타일시트 (/<slug>/theme/<hash>.css)
+    - 해시가 현재 설정과 같으면 1년 immutable 캐시
+    - 오래된 HTML 이 예전 해시를 요청하면 현재 CSS 를 캐시 없이 반환
+    """
+    site_settings = request.site_settings
+    if site_settings is None:
+        raise Http404("사이트 설정이 없습니다.")
+
+    cached = _theme_cache.get(site_settings.pk)
+    if cached is None or cached[0] != site_settings.theme_hash:
+        css = compile_theme(site_settings)
+        cached = (compute_theme_hash(css), css)
+        _theme_cache[site_settings.pk] = cached
+
+    current_hash, css = cached
+    response = HttpResponse(css, content_type='text/css; charset=utf-8')
+    if theme_hash == current_hash:
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        response['ETag'] = f'"{current_hash}"'
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
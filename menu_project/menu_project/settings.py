@@ -77,7 +77,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.middleware.gzip.GZipMiddleware',
+    'menu.middleware.SelectiveGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -179,7 +179,55 @@ if not DEBUG:
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 미디어 파일 서빙 (menu/media_views.py)
+# MEDIA_ACCEL_MODE: '' (Django 가 직접 전송) / 'nginx' (X-Accel-Redirect) / 'sendfile' (X-Sendfile)
+# nginx 예: location /protected-media/ { internal; alias /app/menu_project/media/; }
+MEDIA_ACCEL_MODE = os.environ.get('MEDIA_ACCEL_MODE', '')
+MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/protected-media/')
+# 내용 해시 이름이 아닌 (기존) 파일의 브라우저 캐시 시간(초)
+MEDIA_CACHE_MAX_AGE = int(os.environ.get('MEDIA_CACHE_MAX_AGE', '3600'))
+
+# 업로드 파일은 내용 해시(SHA-256)를 이름으로 저장하여 중복 제거 (menu/storage.py)
+# 참조 수가 0 이 된 파일 정리: python manage.py media_gc
+STORAGES = {
+    'default': {
+        'BACKEND': 'menu.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# 메뉴 스냅샷 캐시 유지 시간(초)
+# 다른 워커 프로세스의 수정 사항은 CACHES 가 공유 백엔드(Redis/Memcached)면 즉시,
+# 기본 LocMem 캐시면 이 시간이 지난 뒤 반영됨. 빈 값 또는 'none' 이면 None (만료 없음)
+MENU_SNAPSHOT_TTL = os.environ.get('MENU_SNAPSHOT_TTL', '60').strip()
+MENU_SNAPSHOT_TTL = None if MENU_SNAPSHOT_TTL.lower() in ('', 'none') else int(MENU_SNAPSHOT_TTL)
+
+# 테넌트(slug -> Restaurant/SiteSettings) 캐시 유지 시간(초)
+TENANT_CACHE_TTL = int(os.environ.get('TENANT_CACHE_TTL', '300'))
+# 존재하지 않는 slug 캐시 유지 시간(초) - 새로 만든 매장이 다른 워커에서 보이기까지의 최대 지연
+TENANT_NEGATIVE_TTL = int(os.environ.get('TENANT_NEGATIVE_TTL', '30'))
+
+# 메뉴 검색 백엔드 (menu/search_backends.py)
+# memory: 프로세스 메모리 인덱스 / database: PostgreSQL pg_trgm + tsvector 또는 SQLite FTS5 / icontains: 기존 방식
+MENU_SEARCH_BACKEND = os.environ.get('MENU_SEARCH_BACKEND', 'memory')
+
+# QR 코드 이미지 디스크 캐시 위치 (menu/qr.py)
+# MEDIA_ROOT 아래에 두면 /media/ 로 그대로 공개되므로 별도 디렉터리 사용
+QR_CACHE_DIR = os.environ.get('QR_CACHE_DIR', str(BASE_DIR / 'cache' / 'qr'))
+
+# 업로드 이미지 최적화 방식 (menu/image_jobs.py)
+# queue: 원본 저장 후 manage.py process_image_jobs 워커가 처리 (Procfile 의 worker, README 참고)
+# sync: 저장 직후 같은 프로세스에서 처리 (워커 없는 환경 / 테스트용)
+IMAGE_OPTIMIZATION_MODE = os.environ.get('IMAGE_OPTIMIZATION_MODE', 'queue')
+
+# 반응형 이미지 파생본 (srcset): 너비 단계와 추가 포맷 (원본 포맷은 항상 포함)
+# 각 단계는 필드의 최대 너비(IMAGE_PRESETS)와 원본 너비를 넘지 않음
+IMAGE_VARIANT_WIDTHS = (160, 320, 640, 1200)
+IMAGE_VARIANT_FORMATS = ('avif', 'webp')
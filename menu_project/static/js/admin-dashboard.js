@@ -0,0 +1,133 @@
+// 관리자 대시보드: 메뉴 드래그 앤 드롭 순서 변경 + 선택한 메뉴 일괄 변경 (menu_batch 엔드포인트)
+
+class DashboardBatch {
+    constructor(bar) {
+        this.bar = bar;
+        this.url = bar.dataset.url;
+        this.csrfToken = document.querySelector('meta[name="csrf-token"]').content;
+        this.rows = document.querySelectorAll('tr[data-menu-id]');
+        this.count = document.getElementById('batchCount');
+        this.selectAll = document.getElementById('batchSelectAll');
+        this.dragging = null;
+        this.bindEvents();
+    }
+
+    bindEvents() {
+        this.bar.querySelectorAll('[data-batch]').forEach(button => {
+            button.addEventListener('click', () => this.runBatch(button));
+        });
+        document.querySelectorAll('.batch-select').forEach(checkbox => {
+            checkbox.addEventListener('change', () => this.updateCount());
+        });
+        if (this.selectAll) {
+            this.selectAll.addEventListener('change', () => {
+                document.querySelectorAll('.batch-select').forEach(checkbox => {
+                    checkbox.checked = this.selectAll.checked;
+                });
+                this.updateCount();
+            });
+        }
+
+        this.rows.forEach(row => {
+            row.addEventListener('dragstart', (e) => {
+                this.dragging = row;
+                row.classList.add('dragging');
+                e.dataTransfer.effectAllowed = 'move';
+            });
+            row.addEventListener('dragend', () => {
+                row.classList.remove('dragging');
+                this.clearDropMarks();
+                this.dragging = null;
+            });
+            row.addEventListener('dragover', (e) => {
+                if (!this.dragging || this.dragging === row) return;
+                e.preventDefault();
+                this.clearDropMarks();
+                row.classList.add(this.isUpperHalf(row, e) ? 'drop-before' : 'drop-after');
+            });
+            row.addEventListener('drop', (e) => {
+                if (!this.dragging || this.dragging === row) return;
+                e.preventDefault();
+                const position = this.isUpperHalf(row, e) ? 'before' : 'after';
+                this.send([{
+                    op: 'reorder',
+                    id: Number(this.dragging.dataset.menuId),
+                    [position]: Number(row.dataset.menuId),
+                }]);
+            });
+        });
+    }
+
+    isUpperHalf(row, e) {
+        const rect = row.getBoundingClientRect();
+        return e.clientY < rect.top + rect.height / 2;
+    }
+
+    clearDropMarks() {
+        this.rows.forEach(row => row.classList.remove('drop-before', 'drop-after'));
+    }
+
+    selectedIds() {
+        return Array.from(document.querySelectorAll('.batch-select:checked')).map(checkbox => Number(checkbox.value));
+    }
+
+    updateCount() {
+        this.count.textContent = `${this.selectedIds().length}개 선택`;
+    }
+
+    runBatch(button) {
+        const ids = this.selectedIds();
+        if (!ids.length) {
+            alert('메뉴를 먼저 선택해주세요.');
+            return;
+        }
+
+        let operations;
+        switch (button.dataset.batch) {
+            case 'available':
+                operations = ids.map(id => ({op: 'available', id, value: button.dataset.value === 'true'}));
+                break;
+            case 'price': {
+                const price = prompt(`선택한 ${ids.length}개 메뉴의 새 가격`);
+                if (!price || !price.trim()) return;
+                operations = ids.map(id => ({op: 'price', id, price: price.trim()}));
+                break;
+            }
+            case 'category': {
+                const value = document.getElementById('batchCategory').value;
+                if (value === '') return;
+                operations = ids.map(id => ({op: 'category', id, category: value === 'none' ? null : Number(value)}));
+                break;
+            }
+            default:
+                return;
+        }
+        this.send(operations);
+    }
+
+    async send(operations) {
+        try {
+            const response = await fetch(this.url, {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json', 'X-CSRFToken': this.csrfToken},
+                body: JSON.stringify({operations}),
+            });
+            const result = await response.json();
+            if (!response.ok) {
+                alert(result.error || '변경하지 못했습니다.');
+                return;
+            }
+            // 정렬/필터는 서버 기준이므로 현재 페이지를 다시 불러옴
+            location.reload();
+        } catch (error) {
+            alert('변경하지 못했습니다.');
+        }
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    const bar = document.getElementById('batchBar');
+    if (bar) {
+        new DashboardBatch(bar);
+    }
+});
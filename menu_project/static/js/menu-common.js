@@ -3,6 +3,8 @@
 class MenuApp {
     constructor() {
         this.searchTimeout = null;
+        this.searchManifest = null;
+        this.searchManifestPromise = null;
         this.loadingScreen = null;
         this.loadingVideo = null;
         this.videoEnded = false;
@@ -273,6 +275,8 @@ class MenuApp {
             if (this.searchInput) {
                 this.searchInput.focus();
             }
+            // 검색창을 열 때 매니페스트를 한 번만 받아둠 (이후 타이핑은 서버 요청 없음)
+            this.loadSearchManifest();
         }
     }
 
@@ -307,12 +311,22 @@ class MenuApp {
 
     performSearch() {
         const query = this.searchInput.value.trim();
+        clearTimeout(this.searchTimeout);
         if (query.length < 2) {
             this.searchResults.innerHTML = '';
             return;
         }
 
-        clearTimeout(this.searchTimeout);
+        // 매니페스트가 있으면 브라우저에서 바로 검색
+        if (this.searchManifest) {
+            const results = this.searchLocal(query);
+            // 일치 결과가 없을 때만 서버의 오타 허용 검색 사용
+            if (results.length > 0 || query.length < 3) {
+                this.displaySearchResults(results);
+                return;
+            }
+        }
+
         this.searchTimeout = setTimeout(() => {
             const apiUrl = this.getApiUrl();
             fetch(`${apiUrl}?q=${encodeURIComponent(query)}`)
@@ -322,6 +336,110 @@ class MenuApp {
         }, 300);
     }
 
+    // ==========================================
+    // 로컬 검색 (search_manifest.py 의 매니페스트 사용)
+    // ==========================================
+    loadSearchManifest() {
+        if (!window.searchManifestUrl || this.searchManifestPromise) return;
+
+        // URL 에 내용 버전이 들어 있어 브라우저 HTTP 캐시에 영구 보관됨
+        this.searchManifestPromise = fetch(window.searchManifestUrl)
+            .then(response => {
+                if (!response.ok) throw new Error(`manifest ${response.status}`);
+                return response.json();
+            })
+            .then(data => {
+                this.searchManifest = this.prepareSearchManifest(data);
+                // 매니페스트를 기다리는 동안 입력한 검색어 반영
+                if (this.searchInput && this.searchInput.value.trim().length >= 2) {
+                    this.performSearch();
+                }
+            })
+            .catch(error => {
+                // 실패하면 기존 검색 API 를 그대로 사용
+                console.error(error);
+            });
+    }
+
+    prepareSearchManifest(data) {
+        const base = this.getApiUrl().replace(/api\/search\/$/, '');
+        const categoryNames = new Map();
+        const categories = [];
+
+        data.c.forEach(([id, name, key, chosung, searchable]) => {
+            categoryNames.set(id, name);
+            if (!searchable) return;
+            categories.push({
+                type: 'category',
+                title: name,
+                subtitle: '카테고리',
+                url: `${base}category/${id}/`,
+                fields: [['name', key]],
+                chosung: chosung,
+            });
+        });
+
+        const menus = data.m.map(([id, name, categoryId, price, key, keyEn, keyDesc, chosung]) => ({
+            type: 'menu',
+            title: name,
+            subtitle: `${categoryNames.get(categoryId) || '메뉴'} - ${price}`,
+            url: categoryId ? `${base}category/${categoryId}/#menu-${id}` : `${base}#menu-${id}`,
+            fields: [['name', key], ['name_en', keyEn], ['description', keyDesc]].filter(f => f[1]),
+            chosung: chosung,
+        }));
+
+        return { categories, menus };
+    }
+
+    normalizeSearchText(text) {
+        return (text || '').normalize('NFC').toLowerCase().replace(/\s+/g, '');
+    }
+
+    // 서버 검색(search_index.py)과 같은 점수 규칙
+    scoreSearchEntry(entry, query, chosungMode) {
+        const positionBonus = position => (position === 0 ? 10 : Math.max(0, 5 - Math.floor(position / 4)));
+        const weights = { name: 30, name_en: 20, description: 5 };
+
+        if (chosungMode) {
+            const position = entry.chosung.indexOf(query);
+            return position < 0 ? 0 : weights.name + positionBonus(position);
+        }
+
+        let best = 0;
+        entry.fields.forEach(([field, text]) => {
+            const position = text.indexOf(query);
+            if (position < 0) return;
+            let score = weights[field] + positionBonus(position);
+            if (text === query) score += 20;
+            best = Math.max(best, score);
+        });
+        return best;
+    }
+
+    searchLocal(rawQuery) {
+        const CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ';
+        let query = this.normalizeSearchText(rawQuery);
+        const chosungMode = [...query].some(ch => CHOSUNG.includes(ch));
+        if (chosungMode) {
+            query = [...query].map(ch => {
+                const code = ch.charCodeAt(0);
+                return code >= 0xAC00 && code <= 0xD7A3 ? CHOSUNG[Math.floor((code - 0xAC00) / 588)] : ch;
+            }).join('');
+        }
+
+        const top = (entries, limit) => entries
+            .map((entry, index) => ({ entry, index, score: this.scoreSearchEntry(entry, query, chosungMode) }))
+            .filter(hit => hit.score > 0)
+            .sort((a, b) => (b.score - a.score) || (a.index - b.index))
+            .slice(0, limit)
+            .map(hit => hit.entry);
+
+        // search_api 와 같이 카테고리 5개 + 메뉴 5개, 최대 8개
+        return top(this.searchManifest.categories, 5)
+            .concat(top(this.searchManifest.menus, 5))
+            .slice(0, 8);
+    }
+
     displaySearchResults(results) {
         if (results.length === 0) {
             this.searchResults.innerHTML = '<div class="search-no-results">검색 결과가 없습니다.</div>';